@@ -5,6 +5,13 @@ from .models import (
     AssessmentType,
     AssessmentTask,
     AssessmentTaskScore,
+    CourseScoreAccumulator,
+    CourseStatistics,
+    TaskStatistics,
+    StudentAcademicSummary,
+    StudentSemesterSummary,
+    StudentRanking,
+    StudentRiskFlag,
 )
 
 
@@ -133,9 +140,130 @@ class AssessmentTaskScoreAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(CourseScoreAccumulator)
+class CourseScoreAccumulatorAdmin(admin.ModelAdmin):
+    list_display = (
+        "student",
+        "course",
+        "semester",
+        "internal_raw",
+        "internal_max",
+        "external_raw",
+        "external_max",
+        "scores_entered",
+        "updated_at",
+    )
+
+    list_filter = ("semester",)
+    search_fields = ("student__username", "course__course_code")
+
+    # Maintained from the task scores; never edited by hand
+    readonly_fields = list_display
+
+
+@admin.register(CourseStatistics)
+class CourseStatisticsAdmin(admin.ModelAdmin):
+    list_display = (
+        "course",
+        "semester",
+        "count",
+        "mean",
+        "median",
+        "std_dev",
+        "pass_rate",
+        "updated_at",
+    )
+
+    list_filter = ("semester",)
+    search_fields = ("course__course_code", "course__title")
+
+
+@admin.register(TaskStatistics)
+class TaskStatisticsAdmin(admin.ModelAdmin):
+    list_display = (
+        "task",
+        "count",
+        "mean",
+        "median",
+        "std_dev",
+        "pass_rate",
+        "updated_at",
+    )
 
+    search_fields = ("task__title",)
 
 
+@admin.register(StudentAcademicSummary)
+class StudentAcademicSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "student",
+        "total_points",
+        "total_credits",
+        "cgpa",
+        "updated_at",
+    )
 
+    search_fields = ("student__username", "student__student_id")
+
+    # Maintained from the assessments; never edited by hand
+    readonly_fields = list_display
+
+
+@admin.register(StudentSemesterSummary)
+class StudentSemesterSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "student",
+        "semester",
+        "points",
+        "credits",
+        "gpa",
+        "cgpa",
+        "updated_at",
+    )
+
+    list_filter = ("semester",)
+    search_fields = ("student__username", "student__student_id")
+
+    readonly_fields = list_display + ("course_points",)
+
+
+@admin.register(StudentRanking)
+class StudentRankingAdmin(admin.ModelAdmin):
+    list_display = (
+        "student",
+        "program",
+        "semester",
+        "gpa",
+        "gpa_rank",
+        "cgpa",
+        "cgpa_rank",
+        "cohort_size",
+        "on_deans_list",
+        "ranked_at",
+    )
+
+    list_filter = ("semester", "program", "on_deans_list")
+    search_fields = ("student__username", "student__student_id")
+
+    # Written by the ranking engine; never edited by hand
+    readonly_fields = list_display + ("gpa_percentile", "cgpa_percentile", "credits")
+
+
+@admin.register(StudentRiskFlag)
+class StudentRiskFlagAdmin(admin.ModelAdmin):
+    list_display = (
+        "student",
+        "risk_level",
+        "risk_score",
+        "cgpa",
+        "gpa_change",
+        "failed_courses",
+        "outstanding_balance",
+        "computed_at",
+    )
 
+    list_filter = ("risk_level",)
+    search_fields = ("student__username", "student__student_id")
 
+    # Written by the nightly risk detection job; never edited by hand
+    readonly_fields = list_display + ("missing_internal_ratio", "task_trend", "reasons")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from academics.services.risk_detection import detect_at_risk_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Score every active student for academic risk (GPA trend, failed "
+        "courses, missing marks, task trend, unpaid fees) and rebuild the "
+        "risk flags read by the dean and lecturer dashboards. Meant to run "
+        "nightly, e.g. from cron."
+    )
+
+    def handle(self, *args, **options):
+        result = detect_at_risk_students()
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {result['students']} student(s): "
+            f"{result['high']} high risk, {result['medium']} medium risk."
+        ))
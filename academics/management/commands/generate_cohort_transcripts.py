@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from academics.models import AcademicYear, Program, ProgramLevel
+from academics.services.transcript_generation import generate_cohort_transcripts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate transcripts for a whole cohort (program, level and/or "
+        "academic year) and store them on the students' transcript requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--program", type=int, help="Program id")
+        parser.add_argument("--level", type=int, help="ProgramLevel id")
+        parser.add_argument("--academic-year", type=int, help="AcademicYear id (students registered in it)")
+        parser.add_argument(
+            "--create-missing",
+            action="store_true",
+            help="Create an approved transcript request for students without one.",
+        )
+        parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def _get(self, model, pk, label):
+        if pk is None:
+            return None
+        obj = model.objects.filter(id=pk).first()
+        if obj is None:
+            raise CommandError(f"{label} {pk} does not exist.")
+        return obj
+
+    def handle(self, *args, **options):
+        program = self._get(Program, options["program"], "Program")
+        level = self._get(ProgramLevel, options["level"], "ProgramLevel")
+        academic_year = self._get(AcademicYear, options["academic_year"], "AcademicYear")
+
+        if not (program or level or academic_year):
+            raise CommandError("Give at least one of --program, --level or --academic-year.")
+
+        def progress(done, total):
+            self.stdout.write(f"  {done}/{total} students")
+
+        result = generate_cohort_transcripts(
+            program=program,
+            level=level,
+            academic_year=academic_year,
+            create_missing=options["create_missing"],
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            progress=progress,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated transcripts for {result['students']} student(s): "
+            f"{result['updated']} request(s) updated, {result['created']} created."
+        ))
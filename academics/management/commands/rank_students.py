@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from academics.models import Program, Semester
+from academics.services.class_rankings import rank_semester
+
+
+class Command(BaseCommand):
+    help = (
+        "Rank students within their program cohort by semester GPA and CGPA "
+        "and flag the dean's list (all semesters with grades, or one semester)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--semester", type=int, help="Semester id (default: every semester with summaries)")
+        parser.add_argument("--program", type=int, help="Program id (default: every program)")
+
+    def handle(self, *args, **options):
+        if options["semester"] is not None:
+            semesters = Semester.objects.filter(id=options["semester"])
+            if not semesters.exists():
+                raise CommandError(f"Semester {options['semester']} does not exist.")
+        else:
+            semesters = Semester.objects.filter(student_summaries__isnull=False).distinct()
+
+        programs = None
+        if options["program"] is not None:
+            if not Program.objects.filter(id=options["program"]).exists():
+                raise CommandError(f"Program {options['program']} does not exist.")
+            programs = [options["program"]]
+
+        ranked = 0
+        for semester in semesters.order_by("start_date", "id"):
+            ranked += rank_semester(semester, programs=programs)
+
+        self.stdout.write(self.style.SUCCESS(f"Ranked {ranked} student semester(s)."))
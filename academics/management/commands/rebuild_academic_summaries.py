@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from academics.services.academic_summaries import rebuild_all_academic_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every student's academic summary (CGPA, credits) and "
+        "semester summaries from their assessments (e.g. after a bulk data fix)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_all_academic_summaries(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt academic summaries for {rebuilt} student(s).")
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from academics.models import ProgramCourse, Semester
+from academics.services.assessment_tasks import reconcile_task_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing assessment task score rows for registered students "
+        "(e.g. students who registered after a task was created)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            help="ProgramCourse id to reconcile (repeatable). Defaults to all courses.",
+        )
+        parser.add_argument(
+            "--semester",
+            type=int,
+            help="Only reconcile tasks of this Semester id.",
+        )
+
+    def handle(self, *args, **options):
+        course_ids = options["course"]
+        semester = None
+
+        if options["semester"] is not None:
+            semester = Semester.objects.filter(id=options["semester"]).first()
+            if semester is None:
+                raise CommandError(f"Semester {options['semester']} does not exist.")
+
+        if course_ids:
+            courses = list(ProgramCourse.objects.filter(id__in=course_ids))
+            missing = set(course_ids) - {c.id for c in courses}
+            if missing:
+                raise CommandError(
+                    f"ProgramCourse(s) not found: {', '.join(map(str, sorted(missing)))}"
+                )
+        else:
+            courses = [None]
+
+        created = 0
+        for course in courses:
+            created += reconcile_task_scores(course=course, semester=semester)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} missing task score row(s).")
+        )
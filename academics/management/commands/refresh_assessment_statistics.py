@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from academics.services.assessment_statistics import refresh_all_statistics
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the grade distribution and summary statistics of every "
+        "course/semester and assessment task (e.g. after grading rules change)."
+    )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_all_statistics()
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed statistics for {refreshed} course/semester pair(s).")
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:30
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def drop_duplicate_assessments(apps, schema_editor):
+    """
+    Keep only the newest Assessment per (student, course, semester)
+    so the unique constraint below can be created.
+    """
+    Assessment = apps.get_model('academics', 'Assessment')
+
+    duplicates = (
+        Assessment.objects
+        .values('student_id', 'course_id', 'semester_id')
+        .annotate(rows=Count('id'), keep_id=Max('id'))
+        .filter(rows__gt=1)
+    )
+
+    for dup in duplicates:
+        (
+            Assessment.objects
+            .filter(
+                student_id=dup['student_id'],
+                course_id=dup['course_id'],
+                semester_id=dup['semester_id'],
+            )
+            .exclude(id=dup['keep_id'])
+            .delete()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0004_seed_assessment_types'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_duplicate_assessments,
+            migrations.RunPython.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='assessment',
+            unique_together={('student', 'course', 'semester')},
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_accumulators(apps, schema_editor):
+    """Build the accumulators from the task scores already entered."""
+    AssessmentTaskScore = apps.get_model('academics', 'AssessmentTaskScore')
+    CourseScoreAccumulator = apps.get_model('academics', 'CourseScoreAccumulator')
+
+    totals = (
+        AssessmentTaskScore.objects
+        .filter(marks_obtained__isnull=False)
+        .values(
+            'student_id',
+            'task__course_id',
+            'task__semester_id',
+            'task__assessment_category__system_role',
+        )
+        .annotate(
+            raw=Sum('marks_obtained'),
+            max_score=Sum('task__total_marks'),
+            entered=Count('id'),
+        )
+        .order_by()
+    )
+
+    rows = {}
+    for row in totals.iterator():
+        key = (row['student_id'], row['task__course_id'], row['task__semester_id'])
+        acc = rows.get(key)
+        if acc is None:
+            acc = rows[key] = CourseScoreAccumulator(
+                student_id=key[0],
+                course_id=key[1],
+                semester_id=key[2],
+                internal_raw=0,
+                internal_max=0,
+                external_raw=0,
+                external_max=0,
+                scores_entered=0,
+            )
+
+        if row['task__assessment_category__system_role'] == 'INTERNAL':
+            acc.internal_raw += row['raw']
+            acc.internal_max += row['max_score']
+        else:
+            acc.external_raw += row['raw']
+            acc.external_max += row['max_score']
+        acc.scores_entered += row['entered']
+
+    CourseScoreAccumulator.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0005_assessment_unique_student_course_semester'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseScoreAccumulator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('internal_raw', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('internal_max', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('external_raw', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('external_max', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('scores_entered', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_accumulators', to='academics.programcourse')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_accumulators', to='academics.semester')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='score_accumulators', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Course Score Accumulator',
+                'verbose_name_plural': 'Course Score Accumulators',
+                'unique_together': {('student', 'course', 'semester')},
+            },
+        ),
+        migrations.RunPython(
+            backfill_accumulators,
+            migrations.RunPython.noop,
+        ),
+    ]
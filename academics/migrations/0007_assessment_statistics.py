@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0006_course_score_accumulator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(blank=True, null=True)),
+                ('median', models.FloatField(blank=True, null=True)),
+                ('std_dev', models.FloatField(blank=True, null=True)),
+                ('min_score', models.FloatField(blank=True, null=True)),
+                ('max_score', models.FloatField(blank=True, null=True)),
+                ('pass_rate', models.FloatField(blank=True, help_text='Percentage of marks with a passing grade', null=True)),
+                ('histogram', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='academics.assessmenttask')),
+            ],
+            options={
+                'verbose_name': 'Task Statistics',
+                'verbose_name_plural': 'Task Statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(blank=True, null=True)),
+                ('median', models.FloatField(blank=True, null=True)),
+                ('std_dev', models.FloatField(blank=True, null=True)),
+                ('min_score', models.FloatField(blank=True, null=True)),
+                ('max_score', models.FloatField(blank=True, null=True)),
+                ('pass_rate', models.FloatField(blank=True, help_text='Percentage of students with a passing grade', null=True)),
+                ('grade_histogram', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='academics.programcourse')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_statistics', to='academics.semester')),
+            ],
+            options={
+                'verbose_name': 'Course Statistics',
+                'verbose_name_plural': 'Course Statistics',
+                'unique_together': {('course', 'semester')},
+            },
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:11
+
+import django.db.models.deletion
+from decimal import Decimal, ROUND_HALF_UP
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The grade-point scale when this migration was written. The backfill uses
+# only historical models and this copy, never the live services.
+GRADE_POINTS = {
+    'A': Decimal('4.0'), 'A-': Decimal('3.7'),
+    'B+': Decimal('3.5'), 'B': Decimal('3.0'), 'B-': Decimal('2.7'),
+    'C+': Decimal('2.5'), 'C': Decimal('2.0'),
+    'D+': Decimal('1.5'), 'D': Decimal('1.0'),
+    'F': Decimal('0.0'),
+}
+
+
+def _gpa(points, credits):
+    if not credits:
+        return None
+    return (points / credits).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def backfill_summaries(apps, schema_editor):
+    """Build the summaries from the assessments already recorded."""
+    Assessment = apps.get_model('academics', 'Assessment')
+    StudentAcademicSummary = apps.get_model('academics', 'StudentAcademicSummary')
+    StudentSemesterSummary = apps.get_model('academics', 'StudentSemesterSummary')
+
+    # {student_id: {semester_id: {"points", "credits", "course_points"}}}, in semester order
+    by_student = {}
+    rows = (
+        Assessment.objects
+        .order_by('student_id', 'semester__start_date', 'semester_id')
+        .values('student_id', 'semester_id', 'grade', 'course__course_code', 'course__credit_hours')
+    )
+    for row in rows.iterator():
+        sem = by_student.setdefault(row['student_id'], {}).setdefault(row['semester_id'], {
+            'points': Decimal('0'),
+            'credits': 0,
+            'course_points': [],
+        })
+        credits = row['course__credit_hours'] or 0
+        grade_point = GRADE_POINTS.get((row['grade'] or '').upper(), Decimal('0'))
+
+        sem['points'] += grade_point * credits
+        sem['credits'] += credits
+        sem['course_points'].append([row['course__course_code'], float(grade_point)])
+
+    summaries = []
+    semester_summaries = []
+    for student_id, semesters in by_student.items():
+        total_points = Decimal('0')
+        total_credits = 0
+        for semester_id, sem in semesters.items():
+            total_points += sem['points']
+            total_credits += sem['credits']
+            semester_summaries.append(StudentSemesterSummary(
+                student_id=student_id,
+                semester_id=semester_id,
+                points=sem['points'],
+                credits=sem['credits'],
+                gpa=_gpa(sem['points'], sem['credits']),
+                cgpa=_gpa(total_points, total_credits),
+                course_points=sorted(sem['course_points'], key=lambda item: item[0] or ''),
+            ))
+        summaries.append(StudentAcademicSummary(
+            student_id=student_id,
+            total_points=total_points,
+            total_credits=total_credits,
+            cgpa=_gpa(total_points, total_credits),
+        ))
+
+    StudentAcademicSummary.objects.bulk_create(summaries, batch_size=1000)
+    StudentSemesterSummary.objects.bulk_create(semester_summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0008_assessment_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAcademicSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_points', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('total_credits', models.PositiveIntegerField(default=0)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='academic_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Academic Summary',
+                'verbose_name_plural': 'Student Academic Summaries',
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentSemesterSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('credits', models.PositiveIntegerField(default=0)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('course_points', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_summaries', to='academics.semester')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='semester_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Semester Summary',
+                'verbose_name_plural': 'Student Semester Summaries',
+                'unique_together': {('student', 'semester')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
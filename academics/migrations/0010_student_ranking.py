@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0009_student_academic_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('cgpa', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('credits', models.PositiveIntegerField(default=0)),
+                ('gpa_rank', models.PositiveIntegerField()),
+                ('cgpa_rank', models.PositiveIntegerField()),
+                ('gpa_percentile', models.FloatField()),
+                ('cgpa_percentile', models.FloatField()),
+                ('cohort_size', models.PositiveIntegerField()),
+                ('on_deans_list', models.BooleanField(default=False)),
+                ('ranked_at', models.DateTimeField()),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_rankings', to='academics.program')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_rankings', to='academics.semester')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Ranking',
+                'verbose_name_plural': 'Student Rankings',
+                'indexes': [models.Index(fields=['program', 'semester', 'gpa_rank'], name='academics_s_program_c6a40e_idx')],
+                'unique_together': {('student', 'semester')},
+            },
+        ),
+    ]
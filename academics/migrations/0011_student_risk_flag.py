@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 17:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0010_student_ranking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentRiskFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('risk_score', models.PositiveSmallIntegerField(default=0)),
+                ('risk_level', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], db_index=True, default='low', max_length=10)),
+                ('cgpa', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('gpa_change', models.DecimalField(blank=True, decimal_places=2, help_text='Latest semester GPA minus the previous one', max_digits=4, null=True)),
+                ('failed_courses', models.PositiveIntegerField(default=0)),
+                ('missing_internal_ratio', models.FloatField(default=0, help_text='Share of internal task marks not entered (active semesters)')),
+                ('task_trend', models.FloatField(blank=True, help_text='Slope of task marks (% per task) in the active semesters', null=True)),
+                ('outstanding_balance', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('reasons', models.JSONField(blank=True, default=list)),
+                ('computed_at', models.DateTimeField()),
+                ('student', models.OneToOneField(limit_choices_to={'role': 'student'}, on_delete=django.db.models.deletion.CASCADE, related_name='risk_flag', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Risk Flag',
+                'verbose_name_plural': 'Student Risk Flags',
+                'ordering': ['-risk_score'],
+            },
+        ),
+    ]
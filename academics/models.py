@@ -1,7 +1,9 @@
 from django.db import models
 from django.conf import settings  
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from portal.cache import bump_version
+from portal.config import invalidate_config
 import random
 import re
 
@@ -152,6 +154,7 @@ class Assessment(models.Model):
     )
 
     date_recorded = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     recorded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -164,6 +167,9 @@ class Assessment(models.Model):
 
     is_allowed = models.BooleanField(default=False)
 
+    class Meta:
+        unique_together = ('student', 'course', 'semester')
+
     def __str__(self):
         return f"{self.student} - {self.course.code} ({self.grade})"
 
@@ -337,6 +343,12 @@ class TranscriptSettings(models.Model):
         return "Transcript Settings"
 
 
+# allow_requests is read from the process cache (portal.config).
+@receiver([post_save, post_delete], sender=TranscriptSettings)
+def invalidate_transcript_settings(sender, **kwargs):
+    invalidate_config("transcript_settings")
+
+
 class TranscriptRequest(models.Model):
     STATUS_CHOICES = [
         ("pending", "Pending Approval"),
@@ -488,6 +500,24 @@ class AssessmentCategory(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.system_role})"
+
+
+# Grade and category edits change how every score is graded: invalidate the
+# cached GradingPolicy in all worker processes.
+@receiver([post_save, post_delete], sender=Grade)
+@receiver([post_save, post_delete], sender=AssessmentCategory)
+def invalidate_grading_policy(sender, **kwargs):
+    bump_version("grading_policy")
+
+
+# Course, semester, year and level names appear on every transcript:
+# invalidate the cached transcripts when they change.
+@receiver([post_save, post_delete], sender=ProgramCourse)
+@receiver([post_save, post_delete], sender=Semester)
+@receiver([post_save, post_delete], sender=AcademicYear)
+@receiver([post_save, post_delete], sender=ProgramLevel)
+def invalidate_transcript_catalog(sender, **kwargs):
+    bump_version("transcript_catalog")
     
 
 class AssessmentType(models.Model):
@@ -613,6 +643,388 @@ class AssessmentTaskScore(models.Model):
         return f"{self.student} - {self.task}"
 
 
+class CourseScoreAccumulator(models.Model):
+    """
+    Running raw/max mark totals of one student in one course/semester,
+    split by assessment category. Kept in step with AssessmentTaskScore
+    so final scores can be computed without re-reading every task score.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'student'},
+        related_name='score_accumulators'
+    )
+
+    course = models.ForeignKey(
+        'ProgramCourse',
+        on_delete=models.CASCADE,
+        related_name='score_accumulators'
+    )
+
+    semester = models.ForeignKey(
+        'Semester',
+        on_delete=models.CASCADE,
+        related_name='score_accumulators'
+    )
+
+    internal_raw = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    internal_max = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    external_raw = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    external_max = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    # Number of task scores with marks entered (0 = nothing to grade yet)
+    scores_entered = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Score Accumulator"
+        verbose_name_plural = "Course Score Accumulators"
+        unique_together = ('student', 'course', 'semester')
+
+    def __str__(self):
+        return f"{self.student} - {self.course} ({self.semester})"
+
+    def totals(self):
+        """{"INTERNAL": (raw, max), "EXTERNAL": (raw, max)}"""
+        return {
+            AssessmentCategory.INTERNAL: (self.internal_raw, self.internal_max),
+            AssessmentCategory.EXTERNAL: (self.external_raw, self.external_max),
+        }
+
+
+# Bulk score writes update the accumulators by delta in the same
+# transaction (academics.services.score_accumulators). Single-row saves
+# and deletes, and task edits, rebuild the affected totals from scratch.
+@receiver(post_save, sender=AssessmentTaskScore)
+def update_accumulator_on_score_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from academics.services.score_accumulators import rebuild_score_accumulators
+
+    rebuild_score_accumulators(
+        course=instance.task.course_id,
+        semester=instance.task.semester_id,
+        students=[instance.student_id],
+    )
+
+
+@receiver(post_delete, sender=AssessmentTaskScore)
+def update_accumulator_on_score_delete(sender, instance, origin=None, **kwargs):
+    # Task deletions cascade here once per score; the task receiver
+    # rebuilds the whole course instead.
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin_model is not AssessmentTaskScore:
+        return
+    from academics.services.score_accumulators import rebuild_score_accumulators
+
+    task = AssessmentTask.objects.filter(pk=instance.task_id).values("course_id", "semester_id").first()
+    if task:
+        rebuild_score_accumulators(
+            course=task["course_id"],
+            semester=task["semester_id"],
+            students=[instance.student_id],
+        )
+
+
+@receiver(post_save, sender=AssessmentTask)
+@receiver(post_delete, sender=AssessmentTask)
+def update_accumulators_on_task_change(sender, instance, created=False, raw=False, **kwargs):
+    # A new task has no marks yet; edits may change total_marks or category.
+    if created or raw:
+        return
+    from academics.services.score_accumulators import rebuild_score_accumulators
+
+    rebuild_score_accumulators(
+        course=instance.course_id,
+        semester=instance.semester_id,
+    )
+
+
+
+class CourseStatistics(models.Model):
+    """
+    Grade distribution and summary statistics of the final Assessment
+    scores of one course/semester. Refreshed whenever the course's
+    assessments are recalculated.
+    """
+    course = models.ForeignKey(
+        'ProgramCourse',
+        on_delete=models.CASCADE,
+        related_name='statistics'
+    )
+
+    semester = models.ForeignKey(
+        'Semester',
+        on_delete=models.CASCADE,
+        related_name='course_statistics'
+    )
+
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(null=True, blank=True)
+    median = models.FloatField(null=True, blank=True)
+    std_dev = models.FloatField(null=True, blank=True)
+    min_score = models.FloatField(null=True, blank=True)
+    max_score = models.FloatField(null=True, blank=True)
+    pass_rate = models.FloatField(null=True, blank=True, help_text="Percentage of students with a passing grade")
+
+    # {"A": 12, "B+": 9, ...}
+    grade_histogram = models.JSONField(default=dict, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Statistics"
+        verbose_name_plural = "Course Statistics"
+        unique_together = ('course', 'semester')
+
+    def __str__(self):
+        return f"{self.course} ({self.semester}) statistics"
+
+
+class TaskStatistics(models.Model):
+    """
+    Mark distribution of one AssessmentTask, as percentages of its total
+    marks. Refreshed together with the course statistics.
+    """
+    task = models.OneToOneField(
+        AssessmentTask,
+        on_delete=models.CASCADE,
+        related_name='statistics'
+    )
+
+    count = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(null=True, blank=True)
+    median = models.FloatField(null=True, blank=True)
+    std_dev = models.FloatField(null=True, blank=True)
+    min_score = models.FloatField(null=True, blank=True)
+    max_score = models.FloatField(null=True, blank=True)
+    pass_rate = models.FloatField(null=True, blank=True, help_text="Percentage of marks with a passing grade")
+
+    # Counts per 10% band: [0-10), [10-20), ..., [90-100]
+    histogram = models.JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Task Statistics"
+        verbose_name_plural = "Task Statistics"
+
+    def __str__(self):
+        return f"{self.task} statistics"
+
+
+class StudentAcademicSummary(models.Model):
+    """
+    All-time grade points, credits and CGPA of one student, kept in step
+    with their Assessment rows (academics.services.academic_summaries).
+    """
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'student'},
+        related_name='academic_summary'
+    )
+
+    total_points = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_credits = models.PositiveIntegerField(default=0)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student Academic Summary"
+        verbose_name_plural = "Student Academic Summaries"
+
+    def __str__(self):
+        return f"{self.student} - CGPA {self.cgpa}"
+
+
+class StudentSemesterSummary(models.Model):
+    """
+    Grade points, credits and GPA of one student in one semester, with the
+    per-course grade points used by the dashboard chart.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'student'},
+        related_name='semester_summaries'
+    )
+
+    semester = models.ForeignKey(
+        'Semester',
+        on_delete=models.CASCADE,
+        related_name='student_summaries'
+    )
+
+    points = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    credits = models.PositiveIntegerField(default=0)
+    gpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    # Cumulative GPA up to and including this semester
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    # [["CSC101", 4.0], ...] ordered by course code
+    course_points = models.JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Student Semester Summary"
+        verbose_name_plural = "Student Semester Summaries"
+        unique_together = ('student', 'semester')
+
+    def __str__(self):
+        return f"{self.student} - {self.semester} GPA {self.gpa}"
+
+
+class StudentRanking(models.Model):
+    """
+    Position of a student within their program cohort for one semester,
+    by semester GPA and by CGPA. Written for a whole cohort at once by
+    academics.services.class_rankings.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'student'},
+        related_name='rankings'
+    )
+
+    program = models.ForeignKey(
+        'Program',
+        on_delete=models.CASCADE,
+        related_name='student_rankings'
+    )
+
+    semester = models.ForeignKey(
+        'Semester',
+        on_delete=models.CASCADE,
+        related_name='student_rankings'
+    )
+
+    gpa = models.DecimalField(max_digits=4, decimal_places=2)
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2)
+    credits = models.PositiveIntegerField(default=0)
+
+    # Competition ranking (1, 2, 2, 4) and percentile rank (0-100]
+    gpa_rank = models.PositiveIntegerField()
+    cgpa_rank = models.PositiveIntegerField()
+    gpa_percentile = models.FloatField()
+    cgpa_percentile = models.FloatField()
+    cohort_size = models.PositiveIntegerField()
+
+    on_deans_list = models.BooleanField(default=False)
+
+    ranked_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Student Ranking"
+        verbose_name_plural = "Student Rankings"
+        unique_together = ('student', 'semester')
+        indexes = [
+            models.Index(fields=['program', 'semester', 'gpa_rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.semester} #{self.gpa_rank}/{self.cohort_size}"
+
+
+class StudentRiskFlag(models.Model):
+    """
+    Nightly at-risk assessment of one active student: the features it was
+    computed from, a 0-100 risk score and the reasons that fired.
+    Rebuilt for every student by the detect_at_risk_students command.
+    """
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+    LEVEL_CHOICES = [
+        (LOW, "Low"),
+        (MEDIUM, "Medium"),
+        (HIGH, "High"),
+    ]
+
+    REASON_LABELS = {
+        "falling_gpa": "Falling GPA",
+        "low_cgpa": "Low CGPA",
+        "failed_courses": "Failed courses",
+        "missing_internal": "Missing marks",
+        "declining_marks": "Declining marks",
+        "unpaid_balance": "Unpaid fees",
+    }
+
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        limit_choices_to={'role': 'student'},
+        related_name='risk_flag'
+    )
+
+    risk_score = models.PositiveSmallIntegerField(default=0)
+    risk_level = models.CharField(max_length=10, choices=LEVEL_CHOICES, default=LOW, db_index=True)
+
+    # Features
+    cgpa = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    gpa_change = models.DecimalField(
+        max_digits=4, decimal_places=2, null=True, blank=True,
+        help_text="Latest semester GPA minus the previous one"
+    )
+    failed_courses = models.PositiveIntegerField(default=0)
+    missing_internal_ratio = models.FloatField(
+        default=0,
+        help_text="Share of internal task marks not entered (active semesters)"
+    )
+    task_trend = models.FloatField(
+        null=True, blank=True,
+        help_text="Slope of task marks (% per task) in the active semesters"
+    )
+    outstanding_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    # ["falling_gpa", "failed_courses", ...]
+    reasons = models.JSONField(default=list, blank=True)
+
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Student Risk Flag"
+        verbose_name_plural = "Student Risk Flags"
+        ordering = ['-risk_score']
+
+    def __str__(self):
+        return f"{self.student} - {self.risk_level} ({self.risk_score})"
+
+    @property
+    def reason_labels(self):
+        return [self.REASON_LABELS.get(r, r) for r in self.reasons]
+
+
+# Bulk assessment writes refresh the summaries of the students they touch
+# (academics.services.assessment_aggregation). Single-row saves and
+# deletes (admin, shell) refresh the student here.
+@receiver(post_save, sender=Assessment)
+def update_academic_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from academics.services.academic_summaries import refresh_academic_summaries
+
+    refresh_academic_summaries([instance.student_id])
+
+
+@receiver(post_delete, sender=Assessment)
+def update_academic_summary_on_delete(sender, instance, origin=None, **kwargs):
+    # Deleting a student, course or semester cascades here once per row;
+    # the summaries go with the student or are rebuilt by the command.
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin_model is not Assessment:
+        return
+    from academics.services.academic_summaries import refresh_academic_summaries
+
+    refresh_academic_summaries([instance.student_id])
+
 class CourseAnnouncement(models.Model):
     # WHO posted it
     sender = models.ForeignKey(
@@ -647,4 +1059,33 @@ class CourseAnnouncement(models.Model):
         verbose_name_plural = "Course Announcements"
 
     def __str__(self):
-        return f"{self.course} - {self.title}"
\ No newline at end of file
+        return f"{self.course} - {self.title}"
+
+# The student sidebar (academics.services.student_sidebar) is cached per
+# student: drop it when the student's enrollment or the announcements of
+# their registered courses change.
+@receiver([post_save, post_delete], sender=Enrollment)
+def invalidate_sidebar_on_enrollment(sender, instance, **kwargs):
+    from academics.services.student_sidebar import invalidate_student_sidebars
+
+    invalidate_student_sidebars([instance.student_id])
+
+
+@receiver([post_save, post_delete], sender=CourseAnnouncement)
+def invalidate_sidebar_on_announcement(sender, instance, **kwargs):
+    from academics.services.student_sidebar import invalidate_student_sidebars
+
+    invalidate_student_sidebars(
+        instance.course.registered_students
+        .filter(semester__is_active=True)
+        .values_list("student_id", flat=True)
+    )
+
+
+# Year / semester activation (admin school page, program transition) must
+# reach every worker: invalidate the cached AcademicCalendar.
+@receiver([post_save, post_delete], sender=Semester)
+@receiver([post_save, post_delete], sender=AcademicYear)
+@receiver(post_delete, sender=ProgramLevel)
+def invalidate_academic_calendar(sender, **kwargs):
+    bump_version("academic_calendar")
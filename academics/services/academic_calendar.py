@@ -0,0 +1,75 @@
+import datetime
+from academics.models import AcademicYear, Semester
+from portal.cache import ProcessCache
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+class AcademicCalendar:
+    """
+    The active academic year and active semesters, resolved once.
+
+    Loaded once per process and reloaded when an AcademicYear, Semester or
+    ProgramLevel changes (the "academic_calendar" version, bumped by the
+    model signals), and memoized on the request by get_academic_calendar().
+    The instances are shared: read them, never save them.
+
+        calendar = get_academic_calendar(request)
+        calendar.year
+        calendar.semester_for(user.level_id)
+    """
+
+    def __init__(self, year, semesters):
+        self.year = year
+
+        # Every active semester (any year), latest first
+        self.semesters = sorted(
+            semesters,
+            key=lambda s: (s.start_date or datetime.date.min, s.id),
+            reverse=True,
+        )
+
+        # Active semester of each level in the active year (lowest id wins,
+        # as with .first() on an unordered queryset)
+        self._by_level = {}
+        if year is not None:
+            for semester in sorted(semesters, key=lambda s: s.id):
+                if semester.academic_year_id == year.id and semester.level_id:
+                    self._by_level.setdefault(semester.level_id, semester)
+
+    @classmethod
+    def load(cls):
+        year = AcademicYear.objects.filter(is_active=True).order_by("id").first()
+        semesters = list(
+            Semester.objects
+            .filter(is_active=True)
+            .select_related("academic_year", "level")
+        )
+        return cls(year, semesters)
+
+    @property
+    def years(self):
+        """The active year as a list (the "only one active year" rule)."""
+        return [self.year] if self.year else []
+
+    def semester_for(self, level):
+        """Active semester of a level (ProgramLevel or id) in the active year, or None."""
+        if level is None:
+            return None
+        return self._by_level.get(_pk(level))
+
+
+_calendar_cache = ProcessCache("academic_calendar", AcademicCalendar.load)
+
+
+def get_academic_calendar(request=None):
+    """The current AcademicCalendar, memoized on ``request`` when given."""
+    if request is None:
+        return _calendar_cache.get()
+
+    calendar = getattr(request, "_academic_calendar", None)
+    if calendar is None:
+        calendar = request._academic_calendar = _calendar_cache.get()
+    return calendar
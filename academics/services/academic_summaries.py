@@ -0,0 +1,182 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from academics.models import Assessment, StudentAcademicSummary, StudentSemesterSummary
+from academics.services.grading_policy import get_grading_policy
+from users.models import CustomUser
+
+
+SUMMARY_BATCH_SIZE = 500
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def _gpa(points, credits):
+    if not credits:
+        return None
+    return (points / credits).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def compute_academic_summaries(rows, policy):
+    """
+    Builds the summaries of one student from their assessment rows
+    (dicts with semester_id, grade, course__course_code and
+    course__credit_hours, ordered by semester start date).
+
+    Returns (totals, semesters): totals is {"points", "credits", "cgpa"},
+    semesters a list of {"semester_id", "points", "credits", "gpa",
+    "cgpa", "course_points"} in semester order.
+    """
+    semesters = {}
+    for row in rows:
+        sem = semesters.setdefault(row["semester_id"], {
+            "semester_id": row["semester_id"],
+            "points": Decimal("0"),
+            "credits": 0,
+            "course_points": [],
+        })
+
+        credits = row["course__credit_hours"] or 0
+        grade_point = policy.points_for(row["grade"])
+
+        sem["points"] += grade_point * credits
+        sem["credits"] += credits
+        sem["course_points"].append([row["course__course_code"], float(grade_point)])
+
+    total_points = Decimal("0")
+    total_credits = 0
+    for sem in semesters.values():
+        total_points += sem["points"]
+        total_credits += sem["credits"]
+
+        sem["gpa"] = _gpa(sem["points"], sem["credits"])
+        sem["cgpa"] = _gpa(total_points, total_credits)
+        sem["course_points"].sort(key=lambda item: item[0] or "")
+
+    totals = {
+        "points": total_points,
+        "credits": total_credits,
+        "cgpa": _gpa(total_points, total_credits),
+    }
+    return totals, list(semesters.values())
+
+
+@transaction.atomic
+def _upsert(model, rows, *, unique_fields, update_fields, existing):
+    """
+    Writes summary rows keyed by ``unique_fields`` with INSERT ... ON
+    CONFLICT DO UPDATE where the backend supports it, otherwise one
+    bulk_update of the rows in ``existing`` plus one bulk_create of the rest.
+    """
+    if connection.features.supports_update_conflicts_with_target:
+        model.objects.bulk_create(
+            rows,
+            batch_size=SUMMARY_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        return
+
+    attnames = [model._meta.get_field(name).attname for name in unique_fields]
+    stored = {
+        tuple(values[:-1]): values[-1]
+        for values in existing.values_list(*attnames, "pk")
+    }
+
+    now = timezone.now()  # bulk_update() skips auto_now
+    for row in rows:
+        row.pk = stored.get(tuple(getattr(row, name) for name in attnames))
+        row.updated_at = now
+
+    model.objects.bulk_update([row for row in rows if row.pk], update_fields, batch_size=SUMMARY_BATCH_SIZE)
+    model.objects.bulk_create([row for row in rows if not row.pk], batch_size=SUMMARY_BATCH_SIZE)
+
+
+def refresh_academic_summaries(students):
+    """
+    Recomputes the academic and semester summaries of ``students`` (users
+    or ids) from their assessments: one read, then one write per table.
+    Semester rows without assessments left are removed.
+    """
+    student_ids = {_pk(s) for s in students}
+    if not student_ids:
+        return
+
+    rows = (
+        Assessment.objects
+        .filter(student_id__in=student_ids)
+        .order_by("student_id", "semester__start_date", "semester_id")
+        .values("student_id", "semester_id", "grade", "course__course_code", "course__credit_hours")
+    )
+
+    by_student = {student_id: [] for student_id in student_ids}
+    for row in rows:
+        by_student[row["student_id"]].append(row)
+
+    policy = get_grading_policy()
+    summaries = []
+    semester_summaries = []
+
+    for student_id, student_rows in by_student.items():
+        totals, semesters = compute_academic_summaries(student_rows, policy)
+
+        summaries.append(StudentAcademicSummary(
+            student_id=student_id,
+            total_points=totals["points"],
+            total_credits=totals["credits"],
+            cgpa=totals["cgpa"],
+        ))
+        semester_summaries.extend(
+            StudentSemesterSummary(
+                student_id=student_id,
+                semester_id=sem["semester_id"],
+                points=sem["points"],
+                credits=sem["credits"],
+                gpa=sem["gpa"],
+                cgpa=sem["cgpa"],
+                course_points=sem["course_points"],
+            )
+            for sem in semesters
+        )
+
+    # Upsert, so concurrent refreshes of one student cannot collide on the
+    # unique constraints, then drop the semesters that no longer have grades
+    _upsert(
+        StudentSemesterSummary,
+        semester_summaries,
+        unique_fields=["student", "semester"],
+        update_fields=["points", "credits", "gpa", "cgpa", "course_points", "updated_at"],
+        existing=StudentSemesterSummary.objects.filter(student_id__in=student_ids),
+    )
+
+    kept = {}
+    for row in semester_summaries:
+        kept.setdefault(row.student_id, []).append(row.semester_id)
+
+    stale = Q()
+    for student_id in student_ids:
+        stale |= Q(student_id=student_id) & ~Q(semester_id__in=kept.get(student_id, []))
+    StudentSemesterSummary.objects.filter(stale).delete()
+
+    _upsert(
+        StudentAcademicSummary,
+        summaries,
+        unique_fields=["student"],
+        update_fields=["total_points", "total_credits", "cgpa", "updated_at"],
+        existing=StudentAcademicSummary.objects.filter(student_id__in=student_ids),
+    )
+
+def rebuild_all_academic_summaries(batch_size=SUMMARY_BATCH_SIZE):
+    """Recomputes the summaries of every student, ``batch_size`` students at a time."""
+    student_ids = list(
+        CustomUser.objects.filter(role="student").order_by("id").values_list("id", flat=True)
+    )
+
+    for start in range(0, len(student_ids), batch_size):
+        refresh_academic_summaries(student_ids[start:start + batch_size])
+
+    return len(student_ids)
@@ -1,105 +1,150 @@
 from decimal import Decimal
-from django.db import transaction
-from academics.models import (
-    Assessment,
-    AssessmentTaskScore,
-    AssessmentCategory,
-    Grade,
-)
+from django.db import connection, transaction
+from django.utils import timezone
+from academics.models import Assessment
+from academics.services.grading_policy import get_grading_policy
+from academics.services.score_accumulators import get_course_totals
+from academics.services.assessment_statistics import refresh_course_statistics
+from academics.services.academic_summaries import refresh_academic_summaries
 from decimal import ROUND_HALF_UP
 
 
-def resolve_letter_grade(percent, grade_rules):
-    for rule in grade_rules:
-        if rule.min_score <= percent <= rule.max_score:
-            return rule.letter
-    return "N/A"
+ASSESSMENT_UPSERT_FIELDS = ["program", "score", "grade", "recorded_by", "updated_at"]
 
 
-@transaction.atomic
-def recalculate_student_assessment(*, student, course, semester, recorded_by=None):
-    scores = (
-        AssessmentTaskScore.objects
-        .filter(
-            student=student,
-            task__course=course,
-            task__semester=semester,
-            marks_obtained__isnull=False
-        )
-        .select_related("task", "task__assessment_category")
-    )
-
-    if not scores.exists():
-        return None
+def calculate_final_score(totals, weights):
+    """
+    Weighted final score (0-100) from per-category raw/max totals.
 
-    # ---------------------------------
-    # Fetch category weights
-    # ---------------------------------
-    categories = {
-        c.system_role: c
-        for c in AssessmentCategory.objects.all()
-    }
-
-    internal_cat = categories.get("INTERNAL")
-    external_cat = categories.get("EXTERNAL")
-
-    internal_score = Decimal("0")
-    internal_max = Decimal("0")
-    external_score = Decimal("0")
-    external_max = Decimal("0")
-
-    for s in scores:
-        cat = s.task.assessment_category.system_role
-        score = Decimal(str(s.marks_obtained))
-        max_score = Decimal(str(s.task.total_marks))
-
-        if cat == "INTERNAL":
-            internal_score += score
-            internal_max += max_score
-        else:
-            external_score += score
-            external_max += max_score
-
-    # ---------------------------------
-    # Weighted calculation
-    # ---------------------------------
+    totals:  {"INTERNAL": (raw, max), "EXTERNAL": (raw, max)}
+    weights: {"INTERNAL": Decimal("40"), "EXTERNAL": Decimal("60")}
+    """
     final_score = Decimal("0")
 
-    if internal_max > 0:
-        final_score += (
-            (internal_score / internal_max)
-            * internal_cat.weight_percentage
-        )
-
-    if external_max > 0:
-        final_score += (
-            (external_score / external_max)
-            * external_cat.weight_percentage
-        )
+    for role, (raw, max_score) in totals.items():
+        if max_score > 0:
+            final_score += (raw / max_score) * weights.get(role, Decimal("0"))
 
     # Clamp safety
-    final_score = max(
+    return max(
         Decimal("0"),
         min(final_score, Decimal("100"))
     ).quantize(Decimal("0.0"), rounding=ROUND_HALF_UP)
 
+
+def bulk_upsert_assessments(assessments):
+    """
+    Writes Assessment rows keyed by (student, course, semester) in one
+    statement. Uses INSERT ... ON CONFLICT DO UPDATE where the backend
+    supports it, otherwise one bulk_update plus one bulk_create.
+    The academic summaries of the students written are refreshed.
+    """
+    if not assessments:
+        return []
+
+    if connection.features.supports_update_conflicts_with_target:
+        written = Assessment.objects.bulk_create(
+            assessments,
+            update_conflicts=True,
+            unique_fields=["student", "course", "semester"],
+            update_fields=ASSESSMENT_UPSERT_FIELDS,
+        )
+        refresh_academic_summaries({a.student_id for a in assessments})
+        return written
+
+    keys = {(a.student_id, a.course_id, a.semester_id): a for a in assessments}
+    existing = Assessment.objects.filter(
+        student_id__in={k[0] for k in keys},
+        course_id__in={k[1] for k in keys},
+        semester_id__in={k[2] for k in keys},
+    ).only("id", "student_id", "course_id", "semester_id")
+
+    now = timezone.now()  # bulk_update() skips auto_now
+    to_update = []
+    for row in existing:
+        new = keys.pop((row.student_id, row.course_id, row.semester_id), None)
+        if new is not None:
+            new.pk = row.pk
+            new.updated_at = now
+            to_update.append(new)
+
+    Assessment.objects.bulk_update(to_update, ASSESSMENT_UPSERT_FIELDS)
+    Assessment.objects.bulk_create(list(keys.values()))
+    refresh_academic_summaries({a.student_id for a in assessments})
+
+    return assessments
+
+
+@transaction.atomic
+def recalculate_course_assessments(*, course, semester, students=None, tasks=None, recorded_by=None):
+    """
+    Recalculates the final Assessment of every student in a course/semester
+    from their task scores.
+
+    Internal and external totals come from the students' course score
+    accumulators (one query), the grading rules are loaded once and every
+    Assessment row is written with a single bulk upsert. Pass ``students``
+    (users or ids) to limit the recalculation to those students.
+
+    Students without any entered marks are skipped. The course statistics
+    are refreshed afterwards; pass ``tasks`` (tasks or ids) when only the
+    marks of those tasks changed.
+    Returns the list of Assessment rows written.
+    """
+    if students is not None:
+        students = {getattr(s, "pk", s) for s in students}
+        if not students:
+            return []
+
+    # Precomputed raw/max totals (kept in step with every score write)
+    per_student = get_course_totals(
+        course=course,
+        semester=semester,
+        students=students,
+    )
+
+    if not per_student:
+        refresh_course_statistics(course=course, semester=semester, tasks=tasks)
+        return []
+
     # ---------------------------------
-    # Resolve grade
+    # Grading policy (cached per process)
     # ---------------------------------
-    grade_rules = Grade.objects.order_by("-min_score")
-    grade = next(
-        (g.letter for g in grade_rules if g.min_score <= final_score <= g.max_score),
-        "N/A"
-    )
+    policy = get_grading_policy()
+
+    student_ids = list(per_student)
+    final_scores = [
+        calculate_final_score(per_student[student_id], policy.weights)
+        for student_id in student_ids
+    ]
+    letters = policy.letters_for(final_scores)
+
+    assessments = [
+        Assessment(
+            student_id=student_id,
+            course_id=course.pk,
+            semester_id=semester.pk,
+            program_id=course.program_id,
+            score=final_score,
+            grade=letter,
+            recorded_by=recorded_by,
+        )
+        for student_id, final_score, letter in zip(student_ids, final_scores, letters)
+    ]
+
+    written = bulk_upsert_assessments(assessments)
+
+    # Distribution / pass-rate figures shown on the dashboards
+    refresh_course_statistics(course=course, semester=semester, tasks=tasks)
 
-    Assessment.objects.update_or_create(
-        student=student,
+    return written
+
+
+def recalculate_student_assessment(*, student, course, semester, recorded_by=None):
+    written = recalculate_course_assessments(
         course=course,
         semester=semester,
-        defaults={
-            "program": course.program,
-            "score": final_score,
-            "grade": grade,
-            "recorded_by": recorded_by,
-        }
-    )
\ No newline at end of file
+        students=[student],
+        recorded_by=recorded_by,
+    )
+    return written[0] if written else None
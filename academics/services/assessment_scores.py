@@ -0,0 +1,295 @@
+import codecs
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from academics.models import AssessmentTaskScore
+from academics.services.assessment_aggregation import recalculate_course_assessments
+from academics.services.score_accumulators import apply_score_deltas
+
+
+SCORE_UPDATE_FIELDS = ["marks_obtained", "recorded_by", "recorded_at"]
+SCORE_WRITE_BATCH_SIZE = 500
+
+
+def diff_task_scores(scores, submitted):
+    """
+    Compares submitted marks with the stored AssessmentTaskScore rows.
+
+    scores:    AssessmentTaskScore rows of one task
+    submitted: {student_id: Decimal or None}; students missing from the
+               dict are left untouched
+
+    Returns (row, previous_marks) pairs for the rows whose marks changed;
+    each row already carries the new value.
+    """
+    changes = []
+
+    for score in scores:
+        if score.student_id not in submitted:
+            continue
+
+        value = submitted[score.student_id]
+        if value == score.marks_obtained:
+            continue
+
+        changes.append((score, score.marks_obtained))
+        score.marks_obtained = value
+
+    return changes
+
+
+def bulk_save_task_scores(task, changes, *, recorded_by=None):
+    """
+    Writes changed score rows of one task in bulk and moves the students'
+    course score accumulators by the difference.
+
+    Uses INSERT ... ON CONFLICT (task, student) DO UPDATE where the
+    backend supports it (a single cheap statement per batch), otherwise
+    falls back to bulk_update.
+    """
+    if not changes:
+        return
+
+    changed = [score for score, _ in changes]
+
+    now = timezone.now()
+    for score in changed:
+        score.recorded_by = recorded_by
+        score.recorded_at = now  # auto_now is skipped by bulk_update
+
+    if connection.features.supports_update_conflicts_with_target:
+        AssessmentTaskScore.objects.bulk_create(
+            [
+                AssessmentTaskScore(
+                    task_id=score.task_id,
+                    student_id=score.student_id,
+                    marks_obtained=score.marks_obtained,
+                    recorded_by=recorded_by,
+                    recorded_at=now,
+                )
+                for score in changed
+            ],
+            batch_size=SCORE_WRITE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["task", "student"],
+            update_fields=SCORE_UPDATE_FIELDS,
+        )
+
+    else:
+        AssessmentTaskScore.objects.bulk_update(
+            changed, SCORE_UPDATE_FIELDS, batch_size=SCORE_WRITE_BATCH_SIZE
+        )
+
+    apply_score_deltas(
+        task=task,
+        changes=[
+            (score.student_id, previous, score.marks_obtained)
+            for score, previous in changes
+        ],
+    )
+
+
+@transaction.atomic
+def save_task_scores(*, task, submitted, recorded_by=None, scores=None):
+    """
+    Saves the marks a lecturer submitted for one task.
+
+    Only rows whose value actually changed are written (in bulk),
+    followed by one batched recalculation of the final Assessment for
+    just those students. Pass ``scores`` when the task's rows are already
+    loaded to skip re-reading them.
+
+    Returns the list of changed AssessmentTaskScore rows.
+    """
+    if scores is None:
+        scores = (
+            AssessmentTaskScore.objects
+            .filter(task=task)
+            .only("id", "task_id", "student_id", "marks_obtained")
+        )
+
+    changes = diff_task_scores(scores, submitted)
+    if not changes:
+        return []
+
+    bulk_save_task_scores(task, changes, recorded_by=recorded_by)
+    changed = [score for score, _ in changes]
+
+    recalculate_course_assessments(
+        course=task.course,
+        semester=task.semester,
+        students={score.student_id for score in changed},
+        tasks=[task],
+        recorded_by=recorded_by,
+    )
+
+    return changed
+
+
+# ---------------------------------
+# CSV IMPORT
+# ---------------------------------
+IMPORT_CHUNK_SIZE = 1000
+ERROR_REPORT_HEADER = ["line", "student_id", "marks_obtained", "error"]
+
+
+def parse_marks(raw, total_marks):
+    """
+    Parses one submitted mark.
+
+    Returns None for a blank value, a Decimal otherwise.
+    Raises ValueError for non-numeric or out-of-range marks.
+    """
+    raw = (raw or "").strip()
+    if raw == "":
+        return None
+
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        raise ValueError("Marks must be a number")
+
+    if not value.is_finite():
+        raise ValueError("Marks must be a number")
+
+    if value < 0 or value > Decimal(str(total_marks)):
+        raise ValueError("Score out of range")
+
+    return value
+
+
+class ScoreImportResult:
+    """Outcome of a CSV score import."""
+
+    def __init__(self):
+        self.rows = 0
+        self.updated = 0
+        self.errors = []  # (line, student_id, marks_obtained, message)
+
+    def add_error(self, line, row, message):
+        self.errors.append((
+            line,
+            (row.get("student_id") or "").strip(),
+            (row.get("marks_obtained") or "").strip(),
+            message,
+        ))
+
+    def error_report(self):
+        """Per-row error report as CSV text."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(ERROR_REPORT_HEADER)
+        writer.writerows(self.errors)
+        return buffer.getvalue()
+
+
+def _apply_chunk(task, chunk, roster, recorded_by):
+    submitted = dict(chunk)  # a later row for the same student wins
+    changes = diff_task_scores(
+        (roster[student_id] for student_id in submitted),
+        submitted,
+    )
+    bulk_save_task_scores(task, changes, recorded_by=recorded_by)
+    return [score for score, _ in changes]
+
+
+@transaction.atomic
+def import_task_scores_csv(*, task, upload, recorded_by=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Imports marks for one task from an uploaded CSV with the columns
+    ``student_id`` and ``marks_obtained`` (the download template).
+
+    The file is decoded line by line and validated in chunks against the
+    task roster, which is loaded once. Each chunk's changed rows are
+    written with one bulk_update and the final Assessment of every
+    affected student is recalculated once at the end. Blank marks are
+    skipped; invalid rows are collected in the result's error report.
+    """
+    result = ScoreImportResult()
+
+    roster = {
+        score.student_id: score
+        for score in (
+            AssessmentTaskScore.objects
+            .filter(task=task)
+            .only("id", "task_id", "student_id", "marks_obtained")
+        )
+    }
+
+    reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+    if not reader.fieldnames or not {"student_id", "marks_obtained"} <= set(reader.fieldnames):
+        raise ValueError("CSV must have 'student_id' and 'marks_obtained' columns.")
+
+    changed_students = set()
+    chunk = []
+
+    try:
+        for row in reader:
+            result.rows += 1
+            line = reader.line_num
+
+            try:
+                student_id = int((row.get("student_id") or "").strip())
+            except ValueError:
+                result.add_error(line, row, "Invalid student_id")
+                continue
+
+            if student_id not in roster:
+                result.add_error(line, row, "Student not part of task")
+                continue
+
+            try:
+                value = parse_marks(row.get("marks_obtained"), task.total_marks)
+            except ValueError as e:
+                result.add_error(line, row, str(e))
+                continue
+
+            if value is None:
+                continue
+
+            chunk.append((student_id, value))
+
+            if len(chunk) >= chunk_size:
+                changed = _apply_chunk(task, chunk, roster, recorded_by)
+                changed_students.update(score.student_id for score in changed)
+                chunk = []
+    except UnicodeDecodeError:
+        raise ValueError("CSV file must be UTF-8 encoded.")
+
+    if chunk:
+        changed = _apply_chunk(task, chunk, roster, recorded_by)
+        changed_students.update(score.student_id for score in changed)
+
+    result.updated = len(changed_students)
+
+    recalculate_course_assessments(
+        course=task.course,
+        semester=task.semester,
+        students=changed_students,
+        tasks=[task],
+        recorded_by=recorded_by,
+    )
+
+    return result
+
+
+# ---------------------------------
+# ERROR REPORTS (kept in the shared cache for download)
+# ---------------------------------
+ERROR_REPORT_KEY = "score_import_errors:{}:{}"
+ERROR_REPORT_TIMEOUT = 60 * 60
+
+
+def store_error_report(task, user, result):
+    key = ERROR_REPORT_KEY.format(task.pk, user.pk)
+    if result.errors:
+        cache.set(key, result.error_report(), ERROR_REPORT_TIMEOUT)
+    else:
+        cache.delete(key)
+
+
+def get_error_report(task, user):
+    return cache.get(ERROR_REPORT_KEY.format(task.pk, user.pk))
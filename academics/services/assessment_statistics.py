@@ -0,0 +1,239 @@
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+from academics.models import (
+    Assessment,
+    AssessmentTask,
+    AssessmentTaskScore,
+    CourseStatistics,
+    TaskStatistics,
+)
+from academics.services.grading_policy import get_grading_policy
+
+
+# 10% bands of a task's total marks
+TASK_HISTOGRAM_BINS = np.linspace(0, 100, 11)
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def _round(value):
+    return round(float(value), 2)
+
+
+def summarize(values, passed):
+    """
+    Summary statistics of a 1-D float array; ``passed`` is a boolean array
+    of the same length. Empty input gives a count of 0 and no figures.
+    """
+    if values.size == 0:
+        return {
+            "count": 0,
+            "mean": None,
+            "median": None,
+            "std_dev": None,
+            "min_score": None,
+            "max_score": None,
+            "pass_rate": None,
+        }
+
+    return {
+        "count": int(values.size),
+        "mean": _round(values.mean()),
+        "median": _round(np.median(values)),
+        "std_dev": _round(values.std()),
+        "min_score": _round(values.min()),
+        "max_score": _round(values.max()),
+        "pass_rate": _round(passed.mean() * 100),
+    }
+
+
+def _passing(letters, policy):
+    """Boolean array: True where the letter earns grade points."""
+    letters = np.asarray(letters, dtype=object)
+    if letters.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    unique, inverse = np.unique(letters.astype(str), return_inverse=True)
+    passes = np.array([policy.points_for(letter) > 0 for letter in unique])
+    return passes[inverse]
+
+
+def compute_course_statistics(scores, grades, policy):
+    scores = np.asarray(scores, dtype=float)
+    grades = np.asarray(grades, dtype=object)
+
+    stats = summarize(scores, _passing(grades, policy))
+
+    letters, counts = np.unique(grades.astype(str), return_counts=True)
+    histogram = sorted(
+        zip(letters.tolist(), counts.tolist()),
+        key=lambda item: (-policy.points_for(item[0]), item[0]),
+    )
+    stats["grade_histogram"] = dict(histogram)  # best grade first
+    return stats
+
+
+def compute_task_statistics(percents, policy):
+    percents = np.asarray(percents, dtype=float)
+
+    stats = summarize(percents, _passing(policy.letters_for(percents), policy))
+
+    histogram, _ = np.histogram(np.clip(percents, 0, 100), bins=TASK_HISTOGRAM_BINS)
+    stats["histogram"] = histogram.tolist()
+    return stats
+
+
+STATISTICS_FIELDS = ["count", "mean", "median", "std_dev", "min_score", "max_score", "pass_rate"]
+
+
+def _upsert(model, rows, *, unique_fields, update_fields, existing):
+    """
+    Writes statistics rows keyed by ``unique_fields`` with INSERT ... ON
+    CONFLICT DO UPDATE where the backend supports it, otherwise one
+    bulk_update of the rows in ``existing`` (a queryset covering them)
+    plus one bulk_create of the new ones.
+    """
+    if connection.features.supports_update_conflicts_with_target:
+        model.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        return
+
+    attnames = [model._meta.get_field(name).attname for name in unique_fields]
+    stored = {
+        tuple(values[:-1]): values[-1]
+        for values in existing.values_list(*attnames, "pk")
+    }
+
+    now = timezone.now()  # bulk_update() skips auto_now
+    for row in rows:
+        row.pk = stored.get(tuple(getattr(row, name) for name in attnames))
+        row.updated_at = now
+
+    model.objects.bulk_update([row for row in rows if row.pk], update_fields)
+    model.objects.bulk_create([row for row in rows if not row.pk])
+
+
+@transaction.atomic
+def refresh_course_statistics(*, course, semester, tasks=None):
+    """
+    Recomputes the statistics of a course/semester and of its tasks: two
+    reads (final scores, entered task marks), one vectorized pass per
+    group and one upsert per table.
+
+    Pass ``tasks`` (tasks or ids) to refresh only the statistics of the
+    tasks whose marks changed; the other tasks keep their rows.
+    """
+    policy = get_grading_policy()
+
+    # ---------------------------------
+    # Final course scores
+    # ---------------------------------
+    rows = list(
+        Assessment.objects
+        .filter(course_id=_pk(course), semester_id=_pk(semester))
+        .values_list("score", "grade")
+    )
+    scores = [score for score, _ in rows]
+    grades = [grade for _, grade in rows]
+
+    _upsert(
+        CourseStatistics,
+        [
+            CourseStatistics(
+                course_id=_pk(course),
+                semester_id=_pk(semester),
+                **compute_course_statistics(scores, grades, policy),
+            )
+        ],
+        unique_fields=["course", "semester"],
+        update_fields=STATISTICS_FIELDS + ["grade_histogram", "updated_at"],
+        existing=CourseStatistics.objects.filter(course_id=_pk(course), semester_id=_pk(semester)),
+    )
+
+    # ---------------------------------
+    # Task marks (as % of total marks)
+    # ---------------------------------
+    task_qs = AssessmentTask.objects.filter(course_id=_pk(course), semester_id=_pk(semester))
+    if tasks is not None:
+        task_qs = task_qs.filter(id__in={_pk(task) for task in tasks})
+
+    totals = dict(task_qs.values_list("id", "total_marks"))
+    if not totals:
+        return
+
+    marks = list(
+        AssessmentTaskScore.objects
+        .filter(task_id__in=list(totals), marks_obtained__isnull=False)
+        .values_list("task_id", "marks_obtained")
+    )
+
+    task_ids = np.array([task_id for task_id, _ in marks], dtype=np.int64)
+    values = np.array([float(mark) for _, mark in marks], dtype=float)
+
+    task_stats = []
+    for task_id, total in totals.items():
+        total = float(total)
+        task_values = values[task_ids == task_id]
+        percents = task_values / total * 100 if total > 0 else np.zeros_like(task_values)
+
+        task_stats.append(
+            TaskStatistics(task_id=task_id, **compute_task_statistics(percents, policy))
+        )
+
+    _upsert(
+        TaskStatistics,
+        task_stats,
+        unique_fields=["task"],
+        update_fields=STATISTICS_FIELDS + ["histogram", "updated_at"],
+        existing=TaskStatistics.objects.filter(task_id__in=list(totals)),
+    )
+
+
+def refresh_all_statistics():
+    """Recomputes the statistics of every course/semester with tasks or grades."""
+    pairs = set(
+        AssessmentTask.objects.values_list("course_id", "semester_id").distinct()
+    ) | set(
+        Assessment.objects.values_list("course_id", "semester_id").distinct()
+    )
+
+    for course_id, semester_id in sorted(pairs):
+        refresh_course_statistics(course=course_id, semester=semester_id)
+
+    return len(pairs)
+
+
+def attach_task_statistics(course_stats):
+    """
+    Loads the task statistics of the given CourseStatistics rows in one
+    query and sets them as ``stat.task_stats``.
+    """
+    course_stats = list(course_stats)
+    keys = {(stat.course_id, stat.semester_id) for stat in course_stats}
+
+    by_course = {}
+    if keys:
+        task_stats = (
+            TaskStatistics.objects
+            .filter(
+                task__course_id__in={course_id for course_id, _ in keys},
+                task__semester_id__in={semester_id for _, semester_id in keys},
+            )
+            .select_related("task", "task__assessment_category")
+            .order_by("task__created_at", "task_id")
+        )
+        for task_stat in task_stats:
+            key = (task_stat.task.course_id, task_stat.task.semester_id)
+            by_course.setdefault(key, []).append(task_stat)
+
+    for stat in course_stats:
+        stat.task_stats = by_course.get((stat.course_id, stat.semester_id), [])
+
+    return course_stats
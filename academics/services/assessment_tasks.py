@@ -1,31 +1,110 @@
-from django.db import transaction
-from academics.models import AssessmentTask, AssessmentTaskScore
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+from academics.models import AssessmentTask, AssessmentTaskScore, ProgramCourse
 from users.models import StudentRegistration
 
 
+def _insert_missing_scores(conditions, params):
+    """
+    Creates the missing AssessmentTaskScore rows (marks not entered) for
+    every (task, registered student) pair matching ``conditions``, with a
+    single INSERT ... SELECT over the registration/course through table.
+    Rows that already exist are left alone.
+
+    conditions: SQL fragments over the aliases t (task), r (registration),
+                rc (registration course) and pc (program course)
+
+    Returns the number of rows created.
+    """
+    qn = connection.ops.quote_name
+    courses_field = StudentRegistration._meta.get_field("courses")
+    through = courses_field.remote_field.through._meta.db_table
+
+    where = " AND ".join(
+        [f"r.{qn('program_id')} = pc.{qn('program_id')}", *conditions]
+    )
+
+    insert = connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)
+    suffix = connection.ops.on_conflict_suffix_sql(
+        [], OnConflict.IGNORE, None, None
+    )
+
+    sql = f"""
+        {insert} {qn(AssessmentTaskScore._meta.db_table)}
+            ({qn('task_id')}, {qn('student_id')}, {qn('marks_obtained')}, {qn('recorded_at')})
+        SELECT t.{qn('id')}, r.{qn('student_id')}, NULL, %s
+        FROM {qn(through)} rc
+        JOIN {qn(StudentRegistration._meta.db_table)} r
+            ON r.{qn('id')} = rc.{qn(courses_field.m2m_column_name())}
+        JOIN {qn(ProgramCourse._meta.db_table)} pc
+            ON pc.{qn('id')} = rc.{qn(courses_field.m2m_reverse_name())}
+        JOIN {qn(AssessmentTask._meta.db_table)} t
+            ON t.{qn('course_id')} = pc.{qn('id')}
+            AND t.{qn('semester_id')} = r.{qn('semester_id')}
+        WHERE {where}
+        {suffix}
+    """
+
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [now, *params])
+        return cursor.rowcount
+
+
 @transaction.atomic
 def create_task_with_scores(*, task: AssessmentTask):
     """
     Creates AssessmentTaskScore rows for all students registered
     for the task's course in the given semester.
     """
-
-    registrations = (
-        StudentRegistration.objects
-        .filter(
-            program=task.course.program,
-            semester=task.semester,
-            courses=task.course,
-        )
-        .select_related("student")
+    return _insert_missing_scores(
+        [f"t.{connection.ops.quote_name('id')} = %s"],
+        [task.pk],
     )
 
-    scores = [
-        AssessmentTaskScore(
-            task=task,
-            student=reg.student
+
+@transaction.atomic
+def reconcile_task_scores(*, course=None, semester=None):
+    """
+    Backfills missing AssessmentTaskScore rows for every task of a course
+    (and optionally one semester) in one pass, e.g. for students who
+    registered after the tasks were created. Without a course, all tasks
+    are reconciled.
+
+    Returns the number of rows created.
+    """
+    qn = connection.ops.quote_name
+    conditions, params = [], []
+
+    if course is not None:
+        conditions.append(f"t.{qn('course_id')} = %s")
+        params.append(getattr(course, "pk", course))
+
+    if semester is not None:
+        conditions.append(f"t.{qn('semester_id')} = %s")
+        params.append(getattr(semester, "pk", semester))
+
+    return _insert_missing_scores(conditions, params)
+
+
+def seed_registration_scores(*, registration, courses=None):
+    """
+    Creates score rows on the existing tasks of a registration's courses
+    (optionally only ``courses``) so late registrants can be graded.
+    """
+    qn = connection.ops.quote_name
+    conditions = [f"r.{qn('id')} = %s"]
+    params = [getattr(registration, "pk", registration)]
+
+    if courses is not None:
+        course_ids = [getattr(c, "pk", c) for c in courses]
+        if not course_ids:
+            return 0
+        conditions.append(
+            f"pc.{qn('id')} IN ({', '.join(['%s'] * len(course_ids))})"
         )
-        for reg in registrations
-    ]
+        params.extend(course_ids)
 
-    AssessmentTaskScore.objects.bulk_create(scores)
+    return _insert_missing_scores(conditions, params)
@@ -0,0 +1,120 @@
+import numpy as np
+from decimal import Decimal
+from django.db import transaction
+from django.utils import timezone
+from academics.models import StudentRanking, StudentSemesterSummary
+
+
+# Dean's list: semester GPA at or above the bar on a full-enough load
+DEANS_LIST_MIN_GPA = Decimal("3.50")
+DEANS_LIST_MIN_CREDITS = 12
+
+RANKING_BATCH_SIZE = 1000
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def rank_within_groups(groups, values):
+    """
+    Competition ranks (1, 2, 2, 4; highest value first) and percentile
+    ranks of ``values`` within each group, in one vectorized pass.
+
+    The percentile of a value is the share of its group scoring at or
+    below it, so the top of every group is at 100.
+    Returns (ranks, percentiles, group_sizes) in input order.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    n = values.size
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    order = np.lexsort((-values, groups))
+    g = groups[order]
+    v = values[order]
+    positions = np.arange(n)
+
+    new_group = np.r_[True, g[1:] != g[:-1]]
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.r_[starts, n])
+    group_start = np.repeat(starts, sizes)
+    group_size = np.repeat(sizes, sizes)
+
+    # Tied values share the position of the first of them
+    new_value = new_group | np.r_[True, v[1:] != v[:-1]]
+    first_of_tie = np.maximum.accumulate(np.where(new_value, positions, 0))
+
+    ranks_sorted = first_of_tie - group_start + 1
+    percentiles_sorted = (group_size - ranks_sorted + 1) / group_size * 100
+
+    ranks = np.empty(n, dtype=np.int64)
+    percentiles = np.empty(n)
+    size_of = np.empty(n, dtype=np.int64)
+    ranks[order] = ranks_sorted
+    percentiles[order] = percentiles_sorted
+    size_of[order] = group_size
+
+    return ranks, percentiles, size_of
+
+
+@transaction.atomic
+def rank_semester(semester, programs=None):
+    """
+    Ranks every program cohort of a semester by semester GPA and by CGPA
+    from the students' semester summaries: one read, one vectorized pass
+    and one bulk write. Pass ``programs`` (objects or ids) to limit the
+    cohorts re-ranked.
+
+    Students are grouped by their current program; semesters without a
+    GPA (no graded credits) are left out.
+    Returns the number of students ranked.
+    """
+    summaries = StudentSemesterSummary.objects.filter(
+        semester_id=_pk(semester),
+        gpa__isnull=False,
+        student__program__isnull=False,
+    )
+    stale = StudentRanking.objects.filter(semester_id=_pk(semester))
+
+    if programs is not None:
+        program_ids = {_pk(p) for p in programs}
+        summaries = summaries.filter(student__program_id__in=program_ids)
+        stale = stale.filter(program_id__in=program_ids)
+
+    rows = list(summaries.values_list("student_id", "student__program_id", "gpa", "cgpa", "credits"))
+
+    stale.delete()
+    if not rows:
+        return 0
+
+    student_ids, program_ids, gpas, cgpas, credits = zip(*rows)
+
+    gpa_ranks, gpa_percentiles, cohort_sizes = rank_within_groups(program_ids, gpas)
+    cgpa_ranks, cgpa_percentiles, _ = rank_within_groups(program_ids, cgpas)
+
+    now = timezone.now()
+    StudentRanking.objects.bulk_create(
+        [
+            StudentRanking(
+                student_id=student_ids[i],
+                program_id=program_ids[i],
+                semester_id=_pk(semester),
+                gpa=gpas[i],
+                cgpa=cgpas[i],
+                credits=credits[i],
+                gpa_rank=int(gpa_ranks[i]),
+                cgpa_rank=int(cgpa_ranks[i]),
+                gpa_percentile=round(float(gpa_percentiles[i]), 1),
+                cgpa_percentile=round(float(cgpa_percentiles[i]), 1),
+                cohort_size=int(cohort_sizes[i]),
+                on_deans_list=gpas[i] >= DEANS_LIST_MIN_GPA and credits[i] >= DEANS_LIST_MIN_CREDITS,
+                ranked_at=now,
+            )
+            for i in range(len(rows))
+        ],
+        batch_size=RANKING_BATCH_SIZE,
+    )
+
+    return len(rows)
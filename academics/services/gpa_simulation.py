@@ -0,0 +1,187 @@
+import numpy as np
+from academics.models import (
+    Assessment,
+    StudentAcademicSummary,
+    StudentSemesterSummary,
+)
+from academics.services.grading_policy import get_grading_policy
+from users.models import StudentRegistration
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+class GPASimulator:
+    """
+    What-if GPA projections for one student or a whole cohort.
+
+    The students' completed points/credits (all-time and in the semester)
+    and their pending courses — registered in the semester but not graded
+    yet — are loaded once into arrays; every scenario is then evaluated
+    with array arithmetic, without touching the database.
+
+        sim = GPASimulator.load([student], semester)
+        sim.simulate([[70, 55], [80, 65]])   # two scenarios, one score per pending course
+        sim.required_for(3.5)
+    """
+
+    def __init__(self, student_ids, courses, credits, base, semester_base, policy):
+        self.student_ids = list(student_ids)
+        self.courses = courses            # [{"id", "code", "title", "credits"}], one per column
+        self.credits = credits            # (students, courses): credit hours, 0 when not pending
+        self.base_points, self.base_credits = base                    # (students,) each
+        self.sem_points, self.sem_credits = semester_base             # (students,) each
+        self.policy = policy
+
+        self.pending_credits = credits.sum(axis=1)
+
+    @classmethod
+    def load(cls, students, semester):
+        """Loads the students' summaries and pending courses of ``semester`` (four queries)."""
+        student_ids = [_pk(s) for s in students]
+        index = {sid: i for i, sid in enumerate(student_ids)}
+        n = len(student_ids)
+
+        def totals(queryset, points_field, credits_field):
+            points = np.zeros(n)
+            credits = np.zeros(n)
+            for sid, p, c in queryset.values_list("student_id", points_field, credits_field):
+                points[index[sid]] = float(p)
+                credits[index[sid]] = float(c)
+            return points, credits
+
+        base = totals(
+            StudentAcademicSummary.objects.filter(student_id__in=student_ids),
+            "total_points", "total_credits",
+        )
+        semester_base = totals(
+            StudentSemesterSummary.objects.filter(student_id__in=student_ids, semester_id=_pk(semester)),
+            "points", "credits",
+        )
+
+        graded = set(
+            Assessment.objects
+            .filter(student_id__in=student_ids, semester_id=_pk(semester))
+            .values_list("student_id", "course_id")
+        )
+
+        registered = (
+            StudentRegistration.courses.through.objects
+            .filter(
+                studentregistration__student_id__in=student_ids,
+                studentregistration__semester_id=_pk(semester),
+            )
+            .values_list(
+                "studentregistration__student_id",
+                "programcourse_id",
+                "programcourse__course_code",
+                "programcourse__title",
+                "programcourse__credit_hours",
+            )
+            .order_by("programcourse__course_code")
+        )
+
+        courses = []
+        columns = {}
+        pending = []
+        for sid, course_id, code, title, credit_hours in registered:
+            if (sid, course_id) in graded:
+                continue
+            if course_id not in columns:
+                columns[course_id] = len(courses)
+                courses.append({"id": course_id, "code": code, "title": title, "credits": credit_hours or 0})
+            pending.append((index[sid], columns[course_id], credit_hours or 0))
+
+        credits = np.zeros((n, len(courses)))
+        for row, col, credit_hours in pending:
+            credits[row, col] = credit_hours
+
+        return cls(student_ids, courses, credits, base, semester_base, get_grading_policy())
+
+    def grade_points(self, scores):
+        """Grade points of an array of scores (any shape), via the grading policy."""
+        scores = np.asarray(scores, dtype=float)
+        letters = self.policy.letters_for(scores.ravel())
+
+        unique, inverse = np.unique(letters.astype(str), return_inverse=True)
+        points = np.array([float(self.policy.points_for(letter)) for letter in unique])
+        return points[inverse].reshape(scores.shape)
+
+    def _scenario_scores(self, scores):
+        """
+        Normalizes scenarios to (scenarios, courses): a list of uniform
+        scores applies one score to every pending course, a 2-D list gives
+        one score per pending course.
+        """
+        scores = np.asarray(scores, dtype=float)
+        if scores.ndim == 1:
+            scores = np.repeat(scores[:, None], len(self.courses), axis=1)
+        if scores.ndim != 2 or scores.shape[1] != len(self.courses):
+            raise ValueError(f"Expected one score per pending course ({len(self.courses)}).")
+        return scores
+
+    def simulate(self, scores):
+        """
+        Projected semester GPA and CGPA of every student under each scenario.
+
+        Returns {"gpa": (scenarios, students), "cgpa": (scenarios, students)},
+        NaN where a student has no credits at all.
+        """
+        scores = self._scenario_scores(scores)
+
+        # (scenarios, courses) @ (courses, students) -> points earned per student
+        new_points = self.grade_points(scores) @ self.credits.T
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gpa = (self.sem_points + new_points) / (self.sem_credits + self.pending_credits)
+            cgpa = (self.base_points + new_points) / (self.base_credits + self.pending_credits)
+
+        return {"gpa": gpa, "cgpa": cgpa}
+
+    def required_for(self, target_cgpa):
+        """
+        The grade each student needs on average across their pending courses
+        to reach ``target_cgpa``: [{"student_id", "grade_point", "letter",
+        "min_score", "reachable"}]. grade_point is the average grade point
+        required (<= 0 when already secured); letter/min_score are the
+        lowest grade that meets it, None when the target is out of reach.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            required = (
+                target_cgpa * (self.base_credits + self.pending_credits) - self.base_points
+            ) / self.pending_credits
+
+        # Only letters the Grade table can actually award
+        minimums = self.policy.boundaries.minimum_scores()
+        scale = sorted(
+            (float(points), letter)
+            for letter, points in self.policy.grade_points.items()
+            if letter in minimums
+        )
+        scale_points = np.array([points for points, _ in scale])
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            current = self.base_points / self.base_credits
+
+        # Lowest grade whose points cover the requirement
+        positions = np.searchsorted(scale_points, np.nan_to_num(required, nan=np.inf) - 1e-9)
+
+        results = []
+        for i, (student_id, need, pos) in enumerate(zip(self.student_ids, required, positions)):
+            if not self.pending_credits[i]:
+                # Nothing pending: the CGPA is already final
+                reachable = bool(current[i] >= target_cgpa)
+                letter = None
+            else:
+                reachable = bool(pos < len(scale))
+                letter = scale[pos][1] if reachable else None
+            min_score = minimums.get(letter) if letter else None
+            results.append({
+                "student_id": student_id,
+                "grade_point": round(float(need), 2) if np.isfinite(need) else None,
+                "letter": letter,
+                "min_score": float(min_score) if min_score is not None else None,
+                "reachable": reachable,
+            })
+        return results
@@ -0,0 +1,113 @@
+import bisect
+from decimal import Decimal
+import numpy as np
+from academics.models import Grade
+
+
+NO_GRADE = "N/A"
+
+
+class GradeBoundaries:
+    """
+    The Grade table compiled into sorted boundary arrays.
+
+    A score resolves to the grade whose [min_score, max_score] range
+    contains it, preferring the highest min_score — the same answer as
+    scanning Grade.objects.order_by("-min_score"). Scores outside every
+    range resolve to "N/A".
+
+    resolve() is the scalar path (bisect on Decimal boundaries);
+    resolve_many() grades a whole array with one NumPy binary search.
+    """
+
+    def __init__(self, rules):
+        # rules: iterable of (letter, min_score, max_score)
+        rules = sorted(
+            ((letter, Decimal(str(lo)), Decimal(str(hi))) for letter, lo, hi in rules),
+            key=lambda r: r[1],
+        )
+
+        self.letters = [r[0] for r in rules]
+        self._mins = [r[1] for r in rules]
+        self._maxs = [r[2] for r in rules]
+
+        self._min_array = np.array(self._mins, dtype=float)
+        self._max_array = np.array(self._maxs, dtype=float)
+
+        # Highest max_score among all rules up to each position. A score that
+        # misses its nearest rule can only fall inside an earlier (overlapping)
+        # rule when this is >= the score.
+        self._prefix_max = (
+            np.maximum.accumulate(self._max_array)
+            if rules else self._max_array
+        )
+
+        self._letter_array = np.array(self.letters + [NO_GRADE], dtype=object)
+
+    @classmethod
+    def from_grades(cls, grades=None):
+        """Compile from Grade rows (defaults to the whole Grade table)."""
+        if grades is None:
+            grades = Grade.objects.values_list("letter", "min_score", "max_score")
+        else:
+            grades = [(g.letter, g.min_score, g.max_score) for g in grades]
+        return cls(grades)
+
+    def __len__(self):
+        return len(self.letters)
+
+    def minimum_scores(self):
+        """{letter: lowest score earning it} (the lowest range wins for repeated letters)."""
+        minimums = {}
+        for letter, lo in zip(self.letters, self._mins):
+            minimums.setdefault(letter, lo)
+        return minimums
+
+    def resolve(self, score):
+        """Letter grade for a single score."""
+        if score is None:
+            return NO_GRADE
+
+        if not isinstance(score, Decimal):
+            score = Decimal(str(score))
+
+        i = bisect.bisect_right(self._mins, score) - 1
+        while i >= 0:
+            if score <= self._maxs[i]:
+                return self.letters[i]
+            i -= 1
+
+        return NO_GRADE
+
+    def resolve_many(self, scores):
+        """
+        Letter grades for a sequence of scores, as a NumPy object array.
+        None / NaN entries resolve to "N/A".
+        """
+        if isinstance(scores, np.ndarray):
+            values = scores.astype(float, copy=False)
+        else:
+            values = np.array(
+                [np.nan if s is None else float(s) for s in scores],
+                dtype=float,
+            )
+
+        if not self.letters or values.size == 0:
+            return np.full(values.shape, NO_GRADE, dtype=object)
+
+        idx = np.searchsorted(self._min_array, values, side="right") - 1
+        safe_idx = np.clip(idx, 0, None)
+
+        hit = (idx >= 0) & (values <= self._max_array[safe_idx])
+        result = self._letter_array[np.where(hit, safe_idx, len(self.letters))]
+
+        # Overlapping ranges: fall back to the scalar scan for the few
+        # scores a lower rule may still cover.
+        prev_idx = np.clip(idx - 1, 0, None)
+        overlap = np.nonzero(
+            ~hit & (idx > 0) & (self._prefix_max[prev_idx] >= values)
+        )[0]
+        for i in overlap:
+            result[i] = self.resolve(values[i])
+
+        return result
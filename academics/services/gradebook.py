@@ -0,0 +1,191 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Max, OuterRef, Q, Subquery
+from academics.models import Assessment, AssessmentTask, AssessmentTaskScore
+from academics.services.assessment_aggregation import recalculate_course_assessments
+from academics.services.assessment_scores import (
+    bulk_save_task_scores,
+    diff_task_scores,
+    parse_marks,
+)
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def get_gradebook_tasks(*, course, semester):
+    return list(
+        AssessmentTask.objects
+        .filter(course=course, semester=semester)
+        .select_related("assessment_category")
+        .order_by("assessment_category__system_role", "created_at", "id")
+    )
+
+
+def build_gradebook(*, course, semester, tasks=None, editor=None):
+    """
+    Students x tasks matrix of a course/semester as columnar JSON data.
+
+    Marks come from one pivoting query: one row per student, one
+    conditional MAX() column per task, with the final Assessment score
+    and grade joined in as subqueries. ``marks[i][j]`` is the mark of
+    student i on task j (None when not entered). ``tasks.editable``
+    flags the tasks ``editor`` created (the only ones they may edit).
+    """
+    if tasks is None:
+        tasks = get_gradebook_tasks(course=course, semester=semester)
+
+    final = Assessment.objects.filter(
+        student_id=OuterRef("student_id"),
+        course=course,
+        semester=semester,
+    )
+
+    rows = (
+        AssessmentTaskScore.objects
+        .filter(task__course=course, task__semester=semester)
+        .values(
+            "student_id",
+            "student__student_id",
+            "student__first_name",
+            "student__last_name",
+        )
+        .annotate(
+            final_score=Subquery(final.values("score")[:1]),
+            final_grade=Subquery(final.values("grade")[:1]),
+            **{
+                f"task_{task.id}": Max("marks_obtained", filter=Q(task_id=task.id))
+                for task in tasks
+            },
+        )
+        .order_by("student__last_name", "student__first_name", "student_id")
+    )
+
+    students = {"id": [], "student_id": [], "name": []}
+    final_scores = {"score": [], "grade": []}
+    marks = []
+
+    for row in rows:
+        students["id"].append(row["student_id"])
+        students["student_id"].append(row["student__student_id"])
+        students["name"].append(
+            f"{row['student__first_name']} {row['student__last_name']}".strip()
+        )
+        final_scores["score"].append(_number(row["final_score"]))
+        final_scores["grade"].append(row["final_grade"])
+        marks.append([_number(row[f"task_{task.id}"]) for task in tasks])
+
+    return {
+        "course": {"id": course.id, "code": course.course_code, "title": course.title},
+        "semester": {"id": semester.id, "name": semester.name},
+        "tasks": {
+            "id": [task.id for task in tasks],
+            "title": [task.title for task in tasks],
+            "category": [task.assessment_category.system_role for task in tasks],
+            "total_marks": [_number(task.total_marks) for task in tasks],
+            "editable": [task.created_by_id == _pk(editor) for task in tasks],
+        },
+        "students": students,
+        "marks": marks,
+        "final": final_scores,
+    }
+
+
+@transaction.atomic
+def apply_gradebook_edits(*, course, semester, edits, recorded_by=None):
+    """
+    Applies a batch of matrix edits: [{"student": id, "task": id, "marks": value}],
+    a null/blank value clearing the mark. Only tasks created by
+    ``recorded_by`` can be edited, as in the per-task score views.
+
+    Every edit is validated first; if any is invalid nothing is written
+    and the list of errors is returned. Otherwise each task's changed
+    rows are written in bulk and the final Assessments of all affected
+    students are recalculated once.
+
+    Returns (updated_count, errors).
+    """
+    tasks = {
+        task.id: task
+        for task in AssessmentTask.objects
+        .filter(course=course, semester=semester)
+        .select_related("assessment_category")
+    }
+
+    parsed = []  # (edit index, task_id, student_id, marks)
+    errors = []
+
+    for index, edit in enumerate(edits):
+        try:
+            task = tasks.get(int(edit["task"]))
+            student_id = int(edit["student"])
+        except (KeyError, TypeError, ValueError):
+            errors.append({"edit": index, "error": "Each edit needs a task and a student id"})
+            continue
+
+        if task is None:
+            errors.append({"edit": index, "error": "Task is not part of this course"})
+            continue
+
+        if task.created_by_id != _pk(recorded_by):
+            errors.append({"edit": index, "error": "You can only edit marks of your own tasks"})
+            continue
+
+        raw = edit.get("marks")
+        try:
+            value = parse_marks("" if raw is None else str(raw), task.total_marks)
+        except ValueError as e:
+            errors.append({"edit": index, "error": str(e)})
+            continue
+
+        parsed.append((index, task.id, student_id, value))
+
+    # Score rows of every edited (task, student) pair, in one query
+    rows = defaultdict(dict)  # task_id -> {student_id: score row}
+    if parsed:
+        for score in (
+            AssessmentTaskScore.objects
+            .filter(
+                task_id__in={task_id for _, task_id, _, _ in parsed},
+                student_id__in={student_id for _, _, student_id, _ in parsed},
+            )
+            .only("id", "task_id", "student_id", "marks_obtained")
+        ):
+            rows[score.task_id][score.student_id] = score
+
+    submitted = defaultdict(dict)  # task_id -> {student_id: marks}
+    for index, task_id, student_id, value in parsed:
+        if student_id not in rows[task_id]:
+            errors.append({"edit": index, "error": "Student not part of task"})
+            continue
+        submitted[task_id][student_id] = value
+
+    if errors:
+        return 0, sorted(errors, key=lambda e: e["edit"])
+
+    changed_students = set()
+    updated = 0
+
+    for task_id, by_student in submitted.items():
+        changes = diff_task_scores(
+            (rows[task_id][student_id] for student_id in by_student),
+            by_student,
+        )
+        bulk_save_task_scores(tasks[task_id], changes, recorded_by=recorded_by)
+        changed_students.update(score.student_id for score, _ in changes)
+        updated += len(changes)
+
+    recalculate_course_assessments(
+        course=course,
+        semester=semester,
+        students=changed_students,
+        tasks=list(submitted),
+        recorded_by=recorded_by,
+    )
+
+    return updated, []
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from academics.models import AssessmentCategory
+from academics.services.grade_boundaries import GradeBoundaries
+from portal.cache import ProcessCache
+
+
+# Grade letter -> grade point (4.0 scale)
+GRADE_POINTS = {
+    "A": 4.0, "A-": 3.7,
+    "B+": 3.5, "B": 3.0, "B-": 2.7,
+    "C+": 2.5, "C": 2.0,
+    "D+": 1.5, "D": 1.0,
+    "F": 0.0,
+}
+
+
+class GradingPolicy:
+    """
+    Everything needed to grade a score: compiled grade boundaries,
+    category weights and the grade-point scale.
+
+    Loaded from the Grade and AssessmentCategory tables once per process;
+    use get_grading_policy() instead of building one directly.
+    """
+
+    def __init__(self, boundaries, weights, grade_points=GRADE_POINTS):
+        self.boundaries = boundaries
+        self.weights = weights
+        self.grade_points = grade_points
+
+    @classmethod
+    def load(cls):
+        weights = {
+            c.system_role: Decimal(str(c.weight_percentage))
+            for c in AssessmentCategory.objects.all()
+        }
+        return cls(GradeBoundaries.from_grades(), weights)
+
+    @property
+    def internal_weight(self):
+        return self.weights.get(AssessmentCategory.INTERNAL, Decimal("0"))
+
+    @property
+    def external_weight(self):
+        return self.weights.get(AssessmentCategory.EXTERNAL, Decimal("0"))
+
+    def letter_for(self, score):
+        return self.boundaries.resolve(score)
+
+    def letters_for(self, scores):
+        return self.boundaries.resolve_many(scores)
+
+    def points_for(self, letter):
+        """Grade point of a letter as a Decimal (0 for unknown letters)."""
+        return Decimal(str(self.grade_points.get((letter or "").upper(), 0.0)))
+
+
+_policy_cache = ProcessCache("grading_policy", GradingPolicy.load)
+
+
+def get_grading_policy():
+    """The current GradingPolicy, cached per process."""
+    return _policy_cache.get()
+
+
+def grading_policy_version():
+    """Version token of the grading policy (changes on every edit)."""
+    return _policy_cache.version
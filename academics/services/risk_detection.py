@@ -0,0 +1,310 @@
+import numpy as np
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+from academics.models import (
+    Assessment,
+    AssessmentCategory,
+    AssessmentTaskScore,
+    StudentAcademicSummary,
+    StudentRiskFlag,
+    StudentSemesterSummary,
+)
+from academics.services.grading_policy import get_grading_policy
+from users.models import Payment
+
+
+# (reason, weight): weights add up to 100
+RISK_RULES = [
+    ("falling_gpa", 25),       # semester GPA dropped by FALLING_GPA_DROP or more
+    ("low_cgpa", 25),          # CGPA below LOW_CGPA
+    ("failed_courses", 20),    # FAILED_COURSES or more failing grades
+    ("missing_internal", 15),  # MISSING_INTERNAL_RATIO of internal marks not entered
+    ("declining_marks", 10),   # task marks falling by DECLINING_TREND % per task
+    ("unpaid_balance", 5),     # verified payments with an outstanding balance
+]
+
+FALLING_GPA_DROP = 0.5
+LOW_CGPA = 2.0
+FAILED_COURSES = 2
+MISSING_INTERNAL_RATIO = 0.3
+DECLINING_TREND = -2.0
+
+# Minimum risk score of each level
+HIGH_RISK = 50
+MEDIUM_RISK = 25
+
+RISK_BATCH_SIZE = 1000
+
+# Rows listed on the dean and lecturer dashboards
+AT_RISK_DASHBOARD_LIMIT = 25
+
+
+def _fill(index, rows, dtype=float, default=0):
+    """Array aligned to ``index`` ({student_id: position}) from (student_id, value) rows."""
+    values = np.full(len(index), default, dtype=dtype)
+    for student_id, value in rows:
+        position = index.get(student_id)
+        if position is not None and value is not None:
+            values[position] = value
+    return values
+
+
+def _group_bounds(groups):
+    """Start offset of each row's group in an array sorted by group."""
+    n = groups.size
+    new_group = np.r_[True, groups[1:] != groups[:-1]]
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.r_[starts, n])
+    return starts, sizes
+
+
+def latest_gpa_change(student_ids, gpas, index):
+    """
+    Latest semester GPA minus the previous one per student, from rows
+    sorted by student then semester date (NaN with fewer than two).
+    """
+    change = np.full(len(index), np.nan)
+    if gpas.size == 0:
+        return change
+
+    starts, sizes = _group_bounds(student_ids)
+    last = starts + sizes - 1
+    has_two = sizes >= 2
+
+    positions = np.array([index[s] for s in student_ids[last]])
+    change[positions[has_two]] = gpas[last[has_two]] - gpas[last[has_two] - 1]
+    return change
+
+
+def marks_trend(student_ids, percents, index):
+    """
+    Least-squares slope of each student's task marks (% per task, in task
+    order), from rows sorted by student then task. NaN with fewer than
+    three marks.
+    """
+    trend = np.full(len(index), np.nan)
+    if percents.size == 0:
+        return trend
+
+    starts, sizes = _group_bounds(student_ids)
+    group = np.repeat(np.arange(starts.size), sizes)
+    x = np.arange(percents.size) - np.repeat(starts, sizes)
+
+    # Per-group sums for the closed-form slope
+    n = sizes.astype(float)
+    sum_x = np.bincount(group, weights=x)
+    sum_y = np.bincount(group, weights=percents)
+    sum_xy = np.bincount(group, weights=x * percents)
+    sum_xx = np.bincount(group, weights=x * x)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+    slope[sizes < 3] = np.nan
+
+    positions = np.array([index[s] for s in student_ids[starts]])
+    trend[positions] = slope
+    return trend
+
+
+def build_risk_features(student_ids):
+    """
+    The feature matrix of ``student_ids`` with six set-based queries.
+    Returns {feature: array aligned to student_ids}.
+    """
+    index = {sid: i for i, sid in enumerate(student_ids)}
+    policy = get_grading_policy()
+
+    # ---------------------------------
+    # GPA history (semester summaries)
+    # ---------------------------------
+    history = list(
+        StudentSemesterSummary.objects
+        .filter(student_id__in=student_ids, gpa__isnull=False)
+        .order_by("student_id", "semester__start_date", "semester_id")
+        .values_list("student_id", "gpa")
+    )
+    gpa_change = latest_gpa_change(
+        np.array([sid for sid, _ in history], dtype=np.int64),
+        np.array([float(gpa) for _, gpa in history], dtype=float),
+        index,
+    )
+
+    cgpa = _fill(
+        index,
+        StudentAcademicSummary.objects.filter(student_id__in=student_ids).values_list("student_id", "cgpa"),
+        default=np.nan,
+    )
+
+    # ---------------------------------
+    # Failing grades
+    # ---------------------------------
+    failing = [letter for letter, points in policy.grade_points.items() if not points]
+    failed = _fill(
+        index,
+        Assessment.objects
+        .filter(student_id__in=student_ids, grade__in=failing)
+        .values("student_id")
+        .annotate(count=Count("id"))
+        .values_list("student_id", "count")
+        .order_by(),
+        dtype=np.int64,
+    )
+
+    # ---------------------------------
+    # Internal marks still missing (active semesters)
+    # ---------------------------------
+    active_scores = AssessmentTaskScore.objects.filter(
+        student_id__in=student_ids,
+        task__semester__is_active=True,
+    )
+    internal = (
+        active_scores
+        .filter(task__assessment_category__system_role=AssessmentCategory.INTERNAL)
+        .values("student_id")
+        .annotate(total=Count("id"), missing=Count("id", filter=Q(marks_obtained__isnull=True)))
+        .values_list("student_id", "total", "missing")
+        .order_by()
+    )
+    missing_ratio = _fill(
+        index,
+        ((sid, missing / total) for sid, total, missing in internal if total),
+    )
+
+    # ---------------------------------
+    # Task mark trend (active semesters)
+    # ---------------------------------
+    marks = list(
+        active_scores
+        .filter(marks_obtained__isnull=False, task__total_marks__gt=0)
+        .annotate(
+            percent=ExpressionWrapper(
+                F("marks_obtained") * Decimal("100") / F("task__total_marks"),
+                output_field=DecimalField(max_digits=9, decimal_places=4),
+            )
+        )
+        .order_by("student_id", "task__created_at", "task_id")
+        .values_list("student_id", "percent")
+    )
+    trend = marks_trend(
+        np.array([sid for sid, _ in marks], dtype=np.int64),
+        np.array([float(p) for _, p in marks], dtype=float),
+        index,
+    )
+
+    # ---------------------------------
+    # Outstanding fees (verified payments)
+    # ---------------------------------
+    balance = _fill(
+        index,
+        Payment.objects
+        .filter(student_id__in=student_ids, is_verified=True)
+        .values("student_id")
+        .annotate(
+            balance=Sum(
+                ExpressionWrapper(
+                    F("amount_expected") - F("amount_paid"),
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                )
+            )
+        )
+        .values_list("student_id", "balance")
+        .order_by(),
+    )
+
+    return {
+        "cgpa": cgpa,
+        "gpa_change": gpa_change,
+        "failed_courses": failed,
+        "missing_internal_ratio": missing_ratio,
+        "task_trend": trend,
+        "outstanding_balance": balance,
+    }
+
+
+def score_risk(features):
+    """
+    Applies RISK_RULES to a feature matrix in one vectorized pass.
+    Returns (scores, levels, fired) where fired is a (students, rules)
+    boolean matrix in RISK_RULES order.
+    """
+    with np.errstate(invalid="ignore"):
+        fired = np.column_stack([
+            features["gpa_change"] <= -FALLING_GPA_DROP,
+            features["cgpa"] < LOW_CGPA,
+            features["failed_courses"] >= FAILED_COURSES,
+            features["missing_internal_ratio"] >= MISSING_INTERNAL_RATIO,
+            features["task_trend"] <= DECLINING_TREND,
+            features["outstanding_balance"] > 0,
+        ])
+
+    weights = np.array([weight for _, weight in RISK_RULES])
+    scores = fired.astype(np.int64) @ weights
+
+    levels = np.where(
+        scores >= HIGH_RISK,
+        StudentRiskFlag.HIGH,
+        np.where(scores >= MEDIUM_RISK, StudentRiskFlag.MEDIUM, StudentRiskFlag.LOW),
+    )
+    return scores, levels, fired
+
+
+def _decimal(value):
+    return None if np.isnan(value) else Decimal(str(round(float(value), 2)))
+
+
+@transaction.atomic
+def detect_at_risk_students():
+    """
+    Recomputes the risk flag of every active student and replaces the
+    StudentRiskFlag table. Returns {"students": n, "high": n, "medium": n}.
+    """
+    student_ids = list(
+        get_user_model().objects
+        .filter(role="student", is_active=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+    features = build_risk_features(student_ids)
+    scores, levels, fired = score_risk(features)
+    reasons = [reason for reason, _ in RISK_RULES]
+
+    now = timezone.now()
+    flags = [
+        StudentRiskFlag(
+            student_id=student_id,
+            risk_score=int(scores[i]),
+            risk_level=str(levels[i]),
+            cgpa=_decimal(features["cgpa"][i]),
+            gpa_change=_decimal(features["gpa_change"][i]),
+            failed_courses=int(features["failed_courses"][i]),
+            missing_internal_ratio=round(float(features["missing_internal_ratio"][i]), 3),
+            task_trend=None if np.isnan(features["task_trend"][i]) else round(float(features["task_trend"][i]), 2),
+            outstanding_balance=_decimal(features["outstanding_balance"][i]),
+            reasons=[reasons[r] for r in np.flatnonzero(fired[i])],
+            computed_at=now,
+        )
+        for i, student_id in enumerate(student_ids)
+    ]
+
+    StudentRiskFlag.objects.all().delete()
+    StudentRiskFlag.objects.bulk_create(flags, batch_size=RISK_BATCH_SIZE)
+
+    return {
+        "students": len(flags),
+        "high": int((levels == StudentRiskFlag.HIGH).sum()),
+        "medium": int((levels == StudentRiskFlag.MEDIUM).sum()),
+    }
+
+
+def at_risk_flags():
+    """Medium and high risk flags, highest score first, for the dashboards."""
+    return (
+        StudentRiskFlag.objects
+        .filter(risk_level__in=[StudentRiskFlag.HIGH, StudentRiskFlag.MEDIUM])
+        .select_related("student", "student__program")
+        .order_by("-risk_score", "student__username")
+    )
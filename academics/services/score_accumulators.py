@@ -0,0 +1,213 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from academics.models import (
+    AssessmentCategory,
+    AssessmentTaskScore,
+    CourseScoreAccumulator,
+)
+
+
+ACCUMULATOR_FIELDS = [
+    "internal_raw",
+    "internal_max",
+    "external_raw",
+    "external_max",
+    "scores_entered",
+    "updated_at",
+]
+ACCUMULATOR_BATCH_SIZE = 500
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def _prefix(system_role):
+    """Field prefix of a category role; anything not INTERNAL counts as external."""
+    return "internal" if system_role == AssessmentCategory.INTERNAL else "external"
+
+
+def _write_accumulators(rows):
+    """
+    Stores accumulator rows keyed by (student, course, semester) with
+    INSERT ... ON CONFLICT DO UPDATE where the backend supports it,
+    otherwise bulk_update on the (already existing) rows.
+    """
+    if not rows:
+        return
+
+    now = timezone.now()
+    for row in rows:
+        row.updated_at = now  # auto_now is skipped by bulk_update
+
+    if connection.features.supports_update_conflicts_with_target:
+        CourseScoreAccumulator.objects.bulk_create(
+            [
+                CourseScoreAccumulator(
+                    student_id=row.student_id,
+                    course_id=row.course_id,
+                    semester_id=row.semester_id,
+                    **{field: getattr(row, field) for field in ACCUMULATOR_FIELDS},
+                )
+                for row in rows
+            ],
+            batch_size=ACCUMULATOR_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["student", "course", "semester"],
+            update_fields=ACCUMULATOR_FIELDS,
+        )
+        return
+
+    CourseScoreAccumulator.objects.bulk_update(
+        rows, ACCUMULATOR_FIELDS, batch_size=ACCUMULATOR_BATCH_SIZE
+    )
+
+
+@transaction.atomic
+def apply_score_deltas(*, task, changes):
+    """
+    Moves the accumulators of one task's students by the change in marks.
+
+    changes: [(student_id, previous_marks, new_marks)], None meaning
+             "not entered"
+
+    Rows are created when missing and locked before the new totals are
+    written, so concurrent saves for the same students serialize.
+    """
+    if not changes:
+        return
+
+    prefix = _prefix(task.assessment_category.system_role)
+    total = Decimal(str(task.total_marks))
+
+    deltas = defaultdict(lambda: [Decimal("0"), Decimal("0"), 0])
+    for student_id, previous, new in changes:
+        delta = deltas[student_id]
+        if previous is not None:
+            delta[0] -= previous
+            delta[1] -= total
+            delta[2] -= 1
+        if new is not None:
+            delta[0] += new
+            delta[1] += total
+            delta[2] += 1
+
+    CourseScoreAccumulator.objects.bulk_create(
+        [
+            CourseScoreAccumulator(
+                student_id=student_id,
+                course_id=task.course_id,
+                semester_id=task.semester_id,
+            )
+            for student_id in deltas
+        ],
+        batch_size=ACCUMULATOR_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    rows = list(
+        CourseScoreAccumulator.objects
+        .select_for_update()
+        .filter(
+            course_id=task.course_id,
+            semester_id=task.semester_id,
+            student_id__in=list(deltas),
+        )
+    )
+
+    for row in rows:
+        raw, max_score, count = deltas[row.student_id]
+        setattr(row, f"{prefix}_raw", getattr(row, f"{prefix}_raw") + raw)
+        setattr(row, f"{prefix}_max", getattr(row, f"{prefix}_max") + max_score)
+        row.scores_entered += count
+
+    _write_accumulators(rows)
+
+
+@transaction.atomic
+def rebuild_score_accumulators(*, course, semester, students=None):
+    """
+    Recomputes accumulators of a course/semester from the task scores
+    (one grouped query). Pass ``students`` (users or ids) to limit the
+    rebuild. Accumulators left without entered marks are removed.
+    """
+    scores = AssessmentTaskScore.objects.filter(
+        task__course_id=_pk(course),
+        task__semester_id=_pk(semester),
+        marks_obtained__isnull=False,
+    )
+    stale = CourseScoreAccumulator.objects.filter(
+        course_id=_pk(course),
+        semester_id=_pk(semester),
+    )
+
+    if students is not None:
+        student_ids = {_pk(s) for s in students}
+        if not student_ids:
+            return []
+        scores = scores.filter(student_id__in=student_ids)
+        stale = stale.filter(student_id__in=student_ids)
+
+    totals = (
+        scores
+        .values("student_id", "task__assessment_category__system_role")
+        .annotate(
+            raw=Sum("marks_obtained"),
+            max_score=Sum("task__total_marks"),
+            entered=Count("id"),
+        )
+        .order_by()
+    )
+
+    rows = {}
+    for row in totals:
+        acc = rows.get(row["student_id"])
+        if acc is None:
+            acc = rows[row["student_id"]] = CourseScoreAccumulator(
+                student_id=row["student_id"],
+                course_id=_pk(course),
+                semester_id=_pk(semester),
+            )
+
+        prefix = _prefix(row["task__assessment_category__system_role"])
+        setattr(acc, f"{prefix}_raw", getattr(acc, f"{prefix}_raw") + row["raw"])
+        setattr(acc, f"{prefix}_max", getattr(acc, f"{prefix}_max") + row["max_score"])
+        acc.scores_entered += row["entered"]
+
+    stale.exclude(student_id__in=list(rows)).delete()
+
+    if connection.features.supports_update_conflicts_with_target:
+        _write_accumulators(list(rows.values()))
+    else:
+        existing = dict(
+            CourseScoreAccumulator.objects
+            .filter(course_id=_pk(course), semester_id=_pk(semester), student_id__in=list(rows))
+            .values_list("student_id", "id")
+        )
+        for student_id, acc in rows.items():
+            acc.pk = existing.get(student_id)
+        _write_accumulators([acc for acc in rows.values() if acc.pk])
+        CourseScoreAccumulator.objects.bulk_create([acc for acc in rows.values() if not acc.pk])
+
+    return list(rows.values())
+
+
+def get_course_totals(*, course, semester, students=None):
+    """
+    Precomputed marks of a course/semester:
+    {student_id: {"INTERNAL": (raw, max), "EXTERNAL": (raw, max)}}.
+    Students without entered marks are left out.
+    """
+    accumulators = CourseScoreAccumulator.objects.filter(
+        course_id=_pk(course),
+        semester_id=_pk(semester),
+        scores_entered__gt=0,
+    )
+
+    if students is not None:
+        accumulators = accumulators.filter(student_id__in={_pk(s) for s in students})
+
+    return {acc.student_id: acc.totals() for acc in accumulators}
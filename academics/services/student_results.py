@@ -0,0 +1,112 @@
+from decimal import Decimal
+from django.db.models import DecimalField, ExpressionWrapper, F
+from academics.models import (
+    AssessmentCategory,
+    AssessmentTaskScore,
+    CourseScoreAccumulator,
+    ProgramCourse,
+    Semester,
+)
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def student_category_totals(student, academic_year):
+    """
+    Raw/max marks of a student per (semester, course, category) in an
+    academic year, read from the course score accumulators: one row per
+    course, whatever the number of tasks.
+
+    Returns [{"semester_id", "course_id", "category", "raw", "max"}].
+    Courses without entered marks are left out.
+    """
+    rows = (
+        CourseScoreAccumulator.objects
+        .filter(
+            student_id=_pk(student),
+            semester__academic_year_id=_pk(academic_year),
+            scores_entered__gt=0,
+        )
+        .values(
+            "semester_id",
+            "course_id",
+            "internal_raw",
+            "internal_max",
+            "external_raw",
+            "external_max",
+        )
+        .order_by("semester_id", "course_id")
+    )
+
+    totals = []
+    for row in rows:
+        for category, prefix in (
+            (AssessmentCategory.INTERNAL, "internal"),
+            (AssessmentCategory.EXTERNAL, "external"),
+        ):
+            totals.append({
+                "semester_id": row["semester_id"],
+                "course_id": row["course_id"],
+                "category": category,
+                "raw": row[f"{prefix}_raw"],
+                "max": row[f"{prefix}_max"],
+            })
+    return totals
+
+
+def student_task_rows(student, academic_year):
+    """
+    The entered task marks of a student in an academic year, as flat rows
+    for display, with the percentage computed by the database.
+    """
+    return list(
+        AssessmentTaskScore.objects
+        .filter(
+            student_id=_pk(student),
+            task__semester__academic_year_id=_pk(academic_year),
+            marks_obtained__isnull=False,
+            task__total_marks__gt=0,
+        )
+        .annotate(
+            percent=ExpressionWrapper(
+                F("marks_obtained") * Decimal("100") / F("task__total_marks"),
+                output_field=DecimalField(max_digits=9, decimal_places=4),
+            )
+        )
+        .values(
+            "task__semester_id",
+            "task__course_id",
+            "task__title",
+            "task__total_marks",
+            "task__assessment_category__system_role",
+            "task__assessment_type__name",
+            "marks_obtained",
+            "percent",
+        )
+        .order_by("task__created_at", "task_id")
+    )
+
+
+def load_student_results(student, academic_year):
+    """
+    Everything the student results page needs for an academic year in
+    four light queries: category totals, task rows, and the semesters and
+    courses they refer to.
+    """
+    totals = student_category_totals(student, academic_year)
+    tasks = student_task_rows(student, academic_year)
+
+    semester_ids = {row["semester_id"] for row in totals}
+    course_ids = {row["course_id"] for row in totals}
+
+    semesters = Semester.objects.select_related("academic_year").in_bulk(semester_ids)
+    courses = ProgramCourse.objects.only("id", "course_code", "title", "credit_hours").in_bulk(course_ids)
+
+    return {
+        "totals": totals,
+        "tasks": tasks,
+        "semesters": semesters,
+        "courses": courses,
+    }
@@ -0,0 +1,114 @@
+from django.core.cache import cache
+from academics.models import CourseAnnouncement, Enrollment, ProgramCourse
+from academics.services.academic_calendar import get_academic_calendar
+from portal.cache import bump_versions, get_version
+from users.models import StudentRegistration
+
+
+# Safety net for changes that do not bump the student (course titles, ...)
+STUDENT_SIDEBAR_TTL = 60 * 15
+
+ANNOUNCEMENT_PREVIEW = 5
+
+EMPTY_SIDEBAR = {
+    "student_courses": [],
+    "announcements": [],
+    "has_active_announcements": False,
+}
+
+
+def sidebar_namespace(student_id):
+    return f"student_sidebar:{student_id}"
+
+
+def invalidate_student_sidebars(student_ids):
+    """Drop the cached sidebar of these students (on commit)."""
+    bump_versions(sidebar_namespace(sid) for sid in set(student_ids))
+
+
+def build_student_sidebar(student_id, level_id, academic_year_id, semester_id):
+    """
+    The sidebar payload of a student in the active semester: registered
+    courses and the latest course announcements, as plain cacheable data.
+    """
+    # HARD GATE: Enrollment (payment / verification proof)
+    program_id = (
+        Enrollment.objects
+        .filter(student_id=student_id, level_id=level_id, semester_id=semester_id, is_current=True)
+        .values_list("program_id", flat=True)
+        .first()
+    )
+    if program_id is None:
+        return EMPTY_SIDEBAR
+
+    registration = (
+        StudentRegistration.objects
+        .filter(
+            student_id=student_id,
+            academic_year_id=academic_year_id,
+            semester_id=semester_id,
+            program_id=program_id,
+            status__in=["submitted", "approved"],
+        )
+        .values_list("id", flat=True)
+        .first()
+    )
+    if registration is None:
+        return EMPTY_SIDEBAR
+
+    # Registered courses that are still offered in this program/level/semester
+    courses = list(
+        ProgramCourse.objects
+        .filter(
+            registered_students=registration,
+            program_id=program_id,
+            level_id=level_id,
+            semester_id=semester_id,
+            is_active=True,
+        )
+        .values("id", "course_code", "title", "credit_hours")
+        .order_by("course_code")
+    )
+
+    announcements = [
+        {
+            "id": ann["id"],
+            "title": ann["title"],
+            "message": ann["message"],
+            "created_at": ann["created_at"],
+            "is_active": ann["is_active"],
+            "course": {"id": ann["course_id"], "title": ann["course__title"]},
+        }
+        for ann in (
+            CourseAnnouncement.objects
+            .filter(course_id__in=[c["id"] for c in courses], send_as_notification=True)
+            .values("id", "title", "message", "created_at", "is_active", "course_id", "course__title")
+            .order_by("-created_at")[:ANNOUNCEMENT_PREVIEW]
+        )
+    ]
+
+    return {
+        "student_courses": courses,
+        "announcements": announcements,
+        "has_active_announcements": any(ann["is_active"] for ann in announcements),
+    }
+
+
+def get_student_sidebar(user, request=None):
+    """
+    The cached sidebar payload of a student, keyed by student, active
+    semester and the student's sidebar version.
+    """
+    semester = get_academic_calendar(request).semester_for(user.level_id)
+    if semester is None:
+        return EMPTY_SIDEBAR
+    academic_year_id, semester_id = semester.academic_year_id, semester.id
+
+    version = get_version(sidebar_namespace(user.pk))
+    key = f"{sidebar_namespace(user.pk)}:{semester_id}:{version}"
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_student_sidebar(user.pk, user.level_id, academic_year_id, semester_id)
+        cache.set(key, payload, STUDENT_SIDEBAR_TTL)
+    return payload
@@ -0,0 +1,90 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.db.models import Count, Max
+from academics.models import Assessment
+from academics.services.grading_policy import grading_policy_version
+from portal.cache import get_version
+from portal.utils import generate_transcript_json, transcript_student_info
+from users.models import StudentRegistration
+
+
+TRANSCRIPT_CACHE_KEY = "transcript:{}:{}"
+TRANSCRIPT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+HITS_KEY = "transcript_cache:hits"
+MISSES_KEY = "transcript_cache:misses"
+
+
+def transcript_fingerprint(student):
+    """
+    Hash of everything a student's transcript depends on: their assessments
+    (last update and count), registrations and registered courses, profile,
+    the grading policy version and the course/semester catalog version.
+    """
+    assessments = Assessment.objects.filter(student=student).aggregate(
+        count=Count("id"),
+        latest=Max("updated_at"),
+    )
+    # Exact (registration, semester, course) rows: sums and counts of ids
+    # can collide when courses are swapped between registrations
+    registrations = list(
+        StudentRegistration.objects
+        .filter(student=student)
+        .order_by("id", "semester_id", "courses")
+        .values_list("id", "semester_id", "courses")
+    )
+
+    parts = [
+        assessments,
+        registrations,
+        transcript_student_info(student),
+        grading_policy_version(),
+        get_version("transcript_catalog"),
+    ]
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First event (or evicted): start the counter
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_cached_transcript(student, fingerprint=None):
+    """
+    The student's live transcript, rebuilt only when its fingerprint
+    changed since it was last built.
+    """
+    fingerprint = fingerprint or transcript_fingerprint(student)
+    key = TRANSCRIPT_CACHE_KEY.format(student.pk, fingerprint)
+
+    transcript = cache.get(key)
+    if transcript is not None:
+        _count(HITS_KEY)
+        return transcript
+
+    _count(MISSES_KEY)
+    transcript = generate_transcript_json(student)
+    cache.set(key, transcript, TRANSCRIPT_CACHE_TIMEOUT)
+    return transcript
+
+
+def transcript_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total * 100, 1) if total else None,
+    }
+
+
+def reset_transcript_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
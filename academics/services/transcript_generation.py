@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.utils import timezone
+from academics.models import TranscriptRequest
+from academics.services.grading_policy import get_grading_policy
+from portal.utils import (
+    assemble_transcript,
+    load_transcript_data,
+    transcript_build_stamp,
+    transcript_student_info,
+)
+
+
+COHORT_BATCH_SIZE = 200
+
+# Requests a generated transcript is written to
+OPEN_REQUEST_STATUSES = ["pending", "approved"]
+
+
+def cohort_students(*, program=None, level=None, academic_year=None):
+    """Students of a program, level and/or academic year (registered in it)."""
+    students = (
+        get_user_model().objects
+        .filter(role="student")
+        .select_related("department", "program")
+        .order_by("id")
+    )
+
+    if program is not None:
+        students = students.filter(program=program)
+    if level is not None:
+        students = students.filter(level=level)
+    if academic_year is not None:
+        students = students.filter(registrations__academic_year=academic_year).distinct()
+
+    return students
+
+
+def _assemble_chunk(jobs, policy):
+    # Runs in a worker process: pure Python, no database access.
+    return [
+        (student_id, assemble_transcript(info, registrations, assessments, policy))
+        for student_id, info, registrations, assessments in jobs
+    ]
+
+
+def _split(items, parts):
+    size = max(1, -(-len(items) // parts))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _process_pool(workers):
+    """
+    A fork-based pool (workers inherit the loaded Django apps), or None
+    when running inline or on platforms without fork.
+    """
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+
+    # Workers are forked while jobs are submitted, after the connections
+    # were closed (see generate_cohort_transcripts); that is only possible
+    # outside a transaction.
+    if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+
+
+def generate_cohort_transcripts(
+    *,
+    program=None,
+    level=None,
+    academic_year=None,
+    create_missing=False,
+    workers=None,
+    batch_size=COHORT_BATCH_SIZE,
+    progress=None,
+):
+    """
+    Generates the transcripts of a whole cohort.
+
+    Students are processed in batches: each batch is loaded with a few
+    set-based queries, the JSON assembly and GPA math are sharded across
+    worker processes, and each student's latest pending or approved
+    TranscriptRequest is written with batched updates (rejected, revoked
+    and older requests are left alone). With ``create_missing`` an
+    approved request is created for students without one (as the
+    per-student admin generation does).
+
+    progress(done, total) is called after each batch.
+    Returns {"students": n, "updated": n, "created": n}, counting students.
+    """
+    workers = workers or os.cpu_count() or 1
+    policy = get_grading_policy()
+    stamp = transcript_build_stamp()
+
+    student_ids = list(
+        cohort_students(program=program, level=level, academic_year=academic_year)
+        .values_list("id", flat=True)
+    )
+    total = len(student_ids)
+    result = {"students": total, "updated": 0, "created": 0}
+
+    pool = _process_pool(workers)
+    try:
+        for start in range(0, total, batch_size):
+            batch_ids = student_ids[start:start + batch_size]
+
+            # ---------------------------------
+            # LOAD (set-based)
+            # ---------------------------------
+            students = (
+                get_user_model().objects
+                .filter(id__in=batch_ids)
+                .select_related("department", "program")
+            )
+            data = load_transcript_data(batch_ids)
+            jobs = [
+                (
+                    student.id,
+                    transcript_student_info(student),
+                    data[student.id]["registrations"],
+                    data[student.id]["assessments"],
+                )
+                for student in students
+            ]
+
+            # ---------------------------------
+            # ASSEMBLE (sharded across processes)
+            # ---------------------------------
+            if pool is None:
+                transcripts = dict(_assemble_chunk(jobs, policy))
+            else:
+                # The pool forks lazily, on submit: close the connections
+                # the load opened so no child inherits a database socket.
+                connections.close_all()
+                transcripts = {}
+                chunks = _split(jobs, workers)
+                for assembled in pool.map(_assemble_chunk, chunks, [policy] * len(chunks)):
+                    transcripts.update(assembled)
+
+            for transcript in transcripts.values():
+                transcript["build"] = stamp
+
+            # ---------------------------------
+            # WRITE (batched)
+            # ---------------------------------
+            updated, created = _store_transcripts(transcripts, create_missing=create_missing)
+            result["updated"] += updated
+            result["created"] += created
+
+            if progress:
+                progress(min(start + batch_size, total), total)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return result
+
+
+@transaction.atomic
+def _store_transcripts(transcripts, *, create_missing=False):
+    now = timezone.now()
+
+    # Latest open request per student
+    latest = {}
+    for req in (
+        TranscriptRequest.objects
+        .filter(student_id__in=list(transcripts), status__in=OPEN_REQUEST_STATUSES)
+        .only("id", "student_id", "transcript_json", "generated_at")
+        .order_by("student_id", "-created_at", "-id")
+    ):
+        latest.setdefault(req.student_id, req)
+    requests = list(latest.values())
+
+    for req in requests:
+        req.transcript_json = transcripts[req.student_id]
+        req.generated_at = now
+
+    TranscriptRequest.objects.bulk_update(
+        requests,
+        ["transcript_json", "generated_at"],
+        batch_size=COHORT_BATCH_SIZE,
+    )
+
+    created = []
+    if create_missing:
+        have_request = set(latest)
+        created = TranscriptRequest.objects.bulk_create([
+            TranscriptRequest(
+                student_id=student_id,
+                status="approved",
+                transcript_json=transcript,
+                generated_at=now,
+                approved_at=now,
+            )
+            for student_id, transcript in transcripts.items()
+            if student_id not in have_request
+        ])
+
+    return len(requests), len(created)
@@ -0,0 +1,180 @@
+import hashlib
+import io
+from xml.sax.saxutils import escape
+from django.core.cache import cache
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import (
+    CondPageBreak, Image, KeepTogether, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
+)
+from academics.services.transcript_cache import get_cached_transcript, transcript_fingerprint
+from portal.cache import get_version
+from portal.pdf import draw_school_header, school_image_path
+from portal.config import get_config
+
+
+TRANSCRIPT_PDF_CACHE_KEY = "transcript_pdf:{}:{}"
+TRANSCRIPT_PDF_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Room left at the top of every page for the branding header
+HEADER_HEIGHT = 150
+
+styles = getSampleStyleSheet()
+LABEL = ParagraphStyle("label", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=8, textColor=colors.HexColor("#6b7280"))
+VALUE = ParagraphStyle("value", parent=styles["Normal"], fontSize=10)
+CELL = ParagraphStyle("cell", parent=styles["Normal"], fontSize=9, leading=11)
+SEMESTER = ParagraphStyle("semester", parent=styles["Heading4"], spaceBefore=0, spaceAfter=4)
+SUMMARY = ParagraphStyle("summary", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=10, alignment=2)
+
+
+def _fmt(value, places=2):
+    return f"{value:.{places}f}" if value is not None else "N/A"
+
+
+def _student_details(student):
+    rows = [
+        ("NAME", student["name"], "STUDENT ID", student["student_id"] or "N/A"),
+        ("DEPARTMENT", student["department"] or "N/A", "PROGRAM", student["program"] or "N/A"),
+        ("AWARD", student["award_type"] or "N/A", "EMAIL", student["email"] or "N/A"),
+    ]
+    data = [
+        [Paragraph(l1, LABEL), Paragraph(escape(str(v1)), VALUE), Paragraph(l2, LABEL), Paragraph(escape(str(v2)), VALUE)]
+        for l1, v1, l2, v2 in rows
+    ]
+
+    table = Table(data, colWidths=[80, 170, 80, 170])
+    table.setStyle(TableStyle([
+        ("LINEBELOW", (0, 0), (-1, -1), 0.4, colors.HexColor("#e6e6e6")),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("TOPPADDING", (0, 0), (-1, -1), 6),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]))
+    return table
+
+
+def _semester_block(sem):
+    heading = Paragraph(
+        f"{escape(sem['level'] or '')} &mdash; {escape(sem['semester'])} "
+        f"<font size=8 color='#6b7280'>({escape(sem['academic_year'])})</font>",
+        SEMESTER,
+    )
+
+    data = [["Code", "Course Title", "Credits", "Score", "Grade"]]
+    for course in sem["courses"]:
+        data.append([
+            course["code"],
+            Paragraph(escape(course["title"]), CELL),
+            course["credits"],
+            _fmt(course["score"], 1),
+            course["grade"],
+        ])
+    if len(data) == 1:
+        data.append(["", Paragraph("No graded courses", CELL), "", "", ""])
+
+    # repeatRows keeps the column header on every page a long semester spans
+    table = Table(data, colWidths=[70, 270, 50, 55, 55], repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f3f4f6")),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#d1d5db")),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.4, colors.HexColor("#e6e6e6")),
+        ("ALIGN", (2, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]))
+
+    gpa = Paragraph(f"GPA: {_fmt(sem['gpa'])}", SUMMARY)
+
+    # Start the semester on a new page rather than leave its heading and
+    # header row stranded at the bottom
+    return [CondPageBreak(90), heading, table, Spacer(1, 4), gpa, Spacer(1, 14)]
+
+
+def _signature_block(school):
+    flowables = [Spacer(1, 30)]
+
+    signature_path = school_image_path(school.signature) if school else None
+    if signature_path:
+        image = Image(signature_path, width=120, height=45, kind="proportional")
+        image.hAlign = "LEFT"
+        flowables.append(image)
+    else:
+        flowables.append(Spacer(1, 45))
+
+    line = Table([[""]], colWidths=[180], hAlign="LEFT")
+    line.setStyle(TableStyle([("LINEABOVE", (0, 0), (-1, -1), 0.6, colors.black)]))
+    flowables.append(line)
+
+    if school and school.signee_name:
+        flowables.append(Paragraph(escape(school.signee_name), VALUE))
+    flowables.append(Paragraph("Registrar", LABEL))
+
+    return KeepTogether(flowables)
+
+
+def render_transcript_pdf(transcript, school):
+    """Renders a transcript dictionary (see generate_transcript_json) to PDF bytes."""
+    buffer = io.BytesIO()
+    width, height = letter
+    timestamp = timezone.now().strftime("%Y-%m-%d %H:%M")
+
+    def decorate_page(p, doc):
+        p.saveState()
+        draw_school_header(p, school, width, height, "OFFICIAL ACADEMIC TRANSCRIPT")
+
+        # FOOTER
+        p.setFont("Helvetica-Oblique", 8)
+        p.setFillColor(colors.HexColor("#999999"))
+        p.drawString(50, 40, transcript["student"]["name"])
+        p.drawCentredString(width / 2, 40, f"Page {doc.page}")
+        p.drawRightString(width - 50, 40, f"Generated on {timestamp}")
+        p.restoreState()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        leftMargin=50,
+        rightMargin=50,
+        topMargin=HEADER_HEIGHT,
+        bottomMargin=60,
+        title=f"Transcript - {transcript['student']['name']}",
+    )
+
+    story = [
+        _student_details(transcript["student"]),
+        Spacer(1, 12),
+        Paragraph(f"CGPA: {_fmt(transcript['cgpa'])}", ParagraphStyle("cgpa", parent=SUMMARY, fontSize=12, alignment=0)),
+        Spacer(1, 16),
+    ]
+    for sem in transcript["semesters"]:
+        story.extend(_semester_block(sem))
+    story.append(_signature_block(school))
+
+    doc.build(story, onFirstPage=decorate_page, onLaterPages=decorate_page)
+    return buffer.getvalue()
+
+
+def get_transcript_pdf(student):
+    """
+    Returns (pdf_bytes, etag) for the student's live transcript.
+
+    The PDF is cached under the transcript fingerprint plus the school
+    branding version, so repeat downloads cost a fingerprint lookup and
+    a cache read; it is only rendered again when the transcript data or
+    the school details changed.
+    """
+    fingerprint = transcript_fingerprint(student)
+    etag = hashlib.sha1(
+        f"{fingerprint}:{get_version('school_branding')}".encode()
+    ).hexdigest()
+
+    key = TRANSCRIPT_PDF_CACHE_KEY.format(student.pk, etag)
+    pdf = cache.get(key)
+    if pdf is None:
+        transcript = get_cached_transcript(student, fingerprint)
+        pdf = render_transcript_pdf(transcript, get_config("school"))
+        cache.set(key, pdf, TRANSCRIPT_PDF_CACHE_TIMEOUT)
+
+    return pdf, etag
@@ -0,0 +1,730 @@
+import numpy as np
+from decimal import Decimal
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from academics.models import (
+    AcademicYear,
+    Assessment,
+    AssessmentCategory,
+    AssessmentTask,
+    AssessmentTaskScore,
+    AssessmentType,
+    Course,
+    CourseScoreAccumulator,
+    CourseStatistics,
+    Department,
+    Grade,
+    Program,
+    ProgramCourse,
+    ProgramLevel,
+    Semester,
+    StudentAcademicSummary,
+    TaskStatistics,
+    TranscriptRequest,
+)
+from academics.services.assessment_aggregation import bulk_upsert_assessments, recalculate_course_assessments
+from academics.services.assessment_scores import import_task_scores_csv, save_task_scores
+from academics.services.assessment_statistics import refresh_course_statistics
+from academics.services.assessment_tasks import (
+    create_task_with_scores,
+    reconcile_task_scores,
+    seed_registration_scores,
+)
+from academics.services.class_rankings import rank_within_groups
+from academics.services.grade_boundaries import NO_GRADE, GradeBoundaries
+from academics.services.gradebook import apply_gradebook_edits, build_gradebook
+from academics.services.score_accumulators import rebuild_score_accumulators
+from academics.services.risk_detection import latest_gpa_change, marks_trend
+from academics.services.transcript_generation import generate_cohort_transcripts
+from academics.services.transcript_cache import get_cached_transcript, transcript_cache_stats
+from users.models import StudentRegistration
+
+
+class GradeBoundariesTests(SimpleTestCase):
+    def setUp(self):
+        self.boundaries = GradeBoundaries([
+            ("A", 70, 100),
+            ("B", 60, 69.99),
+            ("C", 50, 59.99),
+            ("F", 0, 49.99),
+        ])
+
+    def test_resolve_many_matches_resolve(self):
+        scores = [0, 49.99, 50, 59.995, 60, 69.99, 70, 85.5, 100]
+
+        self.assertEqual(
+            self.boundaries.resolve_many(scores).tolist(),
+            [self.boundaries.resolve(score) for score in scores],
+        )
+
+    def test_missing_and_out_of_range_scores(self):
+        self.assertEqual(
+            self.boundaries.resolve_many([None, np.nan, -1, 100.5]).tolist(),
+            [NO_GRADE] * 4,
+        )
+
+    def test_overlapping_ranges_fall_back_to_lower_rule(self):
+        # "P" (50-80) overlaps "B" and "A": a score above B's max but below
+        # A's min is only covered by the lower, wider rule.
+        boundaries = GradeBoundaries([
+            ("A", 70, 100),
+            ("B", 60, 65),
+            ("P", 50, 80),
+        ])
+
+        self.assertEqual(
+            boundaries.resolve_many([67, 75, 62, 55, 85, 45]).tolist(),
+            ["P", "A", "B", "P", "A", NO_GRADE],
+        )
+        self.assertEqual(boundaries.resolve(67), "P")
+
+    def test_empty_table(self):
+        self.assertEqual(GradeBoundaries([]).resolve_many([50, 90]).tolist(), [NO_GRADE, NO_GRADE])
+
+
+class RankWithinGroupsTests(SimpleTestCase):
+    def test_ties_share_a_competition_rank(self):
+        ranks, percentiles, sizes = rank_within_groups([1, 1, 1, 1], [3.2, 3.8, 3.2, 2.5])
+
+        self.assertEqual(ranks.tolist(), [2, 1, 2, 4])
+        self.assertEqual(percentiles.tolist(), [75.0, 100.0, 75.0, 25.0])
+        self.assertEqual(sizes.tolist(), [4, 4, 4, 4])
+
+    def test_groups_are_ranked_separately(self):
+        ranks, percentiles, sizes = rank_within_groups([2, 1, 2, 1, 2], [3.0, 3.0, 3.5, 2.0, 3.0])
+
+        self.assertEqual(ranks.tolist(), [2, 1, 1, 2, 2])
+        self.assertEqual(sizes.tolist(), [3, 2, 3, 2, 3])
+        self.assertAlmostEqual(percentiles[0], 200 / 3)
+
+    def test_empty_input(self):
+        ranks, percentiles, sizes = rank_within_groups([], [])
+
+        self.assertEqual((ranks.size, percentiles.size, sizes.size), (0, 0, 0))
+
+
+class RiskFeatureTests(SimpleTestCase):
+    # Student 30 has no rows at all
+    index = {10: 0, 20: 1, 30: 2}
+
+    def test_latest_gpa_change_needs_two_semesters(self):
+        change = latest_gpa_change(
+            np.array([10, 10, 10, 20]),
+            np.array([3.0, 3.5, 2.8, 3.9]),
+            self.index,
+        )
+
+        self.assertAlmostEqual(change[0], -0.7)
+        self.assertTrue(np.isnan(change[1]))
+        self.assertTrue(np.isnan(change[2]))
+
+    def test_latest_gpa_change_without_rows(self):
+        change = latest_gpa_change(np.array([], dtype=np.int64), np.array([]), self.index)
+
+        self.assertTrue(np.isnan(change).all())
+
+    def test_marks_trend_needs_three_marks(self):
+        trend = marks_trend(
+            np.array([10, 10, 10, 10, 20, 20]),
+            np.array([80.0, 75.0, 70.0, 65.0, 90.0, 40.0]),
+            self.index,
+        )
+
+        self.assertAlmostEqual(trend[0], -5.0)
+        self.assertTrue(np.isnan(trend[1]))
+        self.assertTrue(np.isnan(trend[2]))
+
+    def test_marks_trend_without_rows(self):
+        trend = marks_trend(np.array([], dtype=np.int64), np.array([]), self.index)
+
+        self.assertTrue(np.isnan(trend).all())
+
+
+class TranscriptCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_hits_and_misses_are_counted(self):
+        student = get_user_model().objects.create(username="student", role="student")
+
+        first = get_cached_transcript(student)
+        second = get_cached_transcript(student)
+
+        self.assertEqual(first, second)
+        self.assertEqual(transcript_cache_stats(), {"hits": 1, "misses": 1, "hit_rate": 50.0})
+
+
+class CourseTestData:
+    """
+    One course with three registered students, an internal quiz (20
+    marks) and an external exam (100 marks) by ``lecturer``, and an
+    internal quiz by ``other_lecturer``. Score rows exist, marks do not.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+
+        for letter, low, high in [("A", 70, 100), ("B", 60, 69.99), ("C", 50, 59.99), ("F", 0, 49.99)]:
+            Grade.objects.create(letter=letter, min_score=low, max_score=high)
+
+        department = Department.objects.create(name="Computing", code="CMP")
+        cls.program = Program.objects.create(name="Software", code="SWE", department=department)
+        level = ProgramLevel.objects.create(program=cls.program, level_name="Level 100")
+        year = AcademicYear.objects.create(name="2025/2026", is_active=True)
+        cls.semester = Semester.objects.create(name="First", academic_year=year, level=level, is_active=True)
+
+        base = Course.objects.create(program=cls.program, department=department, code="CS101", title="Programming")
+        cls.course = ProgramCourse.objects.create(
+            base_course=base,
+            program=cls.program,
+            level=level,
+            course_code="SWE101",
+            title="Programming",
+            credit_hours=3,
+        )
+
+        cls.lecturer = User.objects.create_user(username="lecturer", password="password", role="lecturer")
+        cls.other_lecturer = User.objects.create_user(username="other", password="password", role="lecturer")
+        cls.course.assigned_lecturers.add(cls.lecturer, cls.other_lecturer)
+
+        cls.students = []
+        for i in range(3):
+            student = User.objects.create_user(
+                username=f"student{i}",
+                role="student",
+                student_id=f"STU{i}",
+                program=cls.program,
+                level=level,
+            )
+            registration = StudentRegistration.objects.create(
+                student=student,
+                academic_year=year,
+                semester=cls.semester,
+                program=cls.program,
+                level=level,
+                status="approved",
+            )
+            registration.courses.add(cls.course)
+            cls.students.append(student)
+
+        quiz = AssessmentType.objects.get(name="Quiz")
+        exam = AssessmentType.objects.get(name="Final Exam")
+        internal = AssessmentCategory.objects.get(system_role=AssessmentCategory.INTERNAL)
+        external = AssessmentCategory.objects.get(system_role=AssessmentCategory.EXTERNAL)
+
+        def task(title, assessment_type, category, total_marks, created_by):
+            task = AssessmentTask.objects.create(
+                course=cls.course,
+                semester=cls.semester,
+                assessment_type=assessment_type,
+                assessment_category=category,
+                title=title,
+                total_marks=total_marks,
+                created_by=created_by,
+            )
+            create_task_with_scores(task=task)
+            return task
+
+        cls.quiz = task("Quiz 1", quiz, internal, 20, cls.lecturer)
+        cls.exam = task("Final", exam, external, 100, cls.lecturer)
+        cls.foreign_quiz = task("Quiz 2", quiz, internal, 10, cls.other_lecturer)
+
+    def setUp(self):
+        # Reload the grading policy with this class's Grade rows
+        cache.clear()
+
+    def marks(self, task):
+        return dict(
+            AssessmentTaskScore.objects
+            .filter(task=task)
+            .values_list("student_id", "marks_obtained")
+        )
+
+    def enter(self, task, marks):
+        """Saves {student index: marks} for a task as its lecturer would."""
+        return save_task_scores(
+            task=task,
+            submitted={self.students[i].pk: Decimal(str(value)) for i, value in marks.items()},
+            recorded_by=task.created_by,
+        )
+
+
+
+class ScoreRowSeedingTests(CourseTestData, TestCase):
+    def register_late_student(self):
+        student = get_user_model().objects.create_user(
+            username="late", role="student", student_id="STU9", program=self.program, level=self.course.level
+        )
+        registration = StudentRegistration.objects.create(
+            student=student,
+            academic_year=self.semester.academic_year,
+            semester=self.semester,
+            program=self.program,
+            level=self.course.level,
+            status="approved",
+        )
+        return student, registration
+
+    def test_added_course_seeds_rows_once(self):
+        student, registration = self.register_late_student()
+
+        # m2m_changed seeds a row on each of the course's three tasks
+        registration.courses.add(self.course)
+
+        self.assertEqual(AssessmentTaskScore.objects.filter(student=student).count(), 3)
+        self.assertEqual(seed_registration_scores(registration=registration), 0)
+        self.assertEqual(reconcile_task_scores(course=self.course), 0)
+
+    def test_reconcile_fills_gaps_and_keeps_marks(self):
+        self.enter(self.quiz, {0: 15, 1: 10})
+        AssessmentTaskScore.objects.filter(task=self.quiz, student=self.students[2]).delete()
+
+        self.assertEqual(reconcile_task_scores(course=self.course, semester=self.semester), 1)
+        self.assertEqual(reconcile_task_scores(course=self.course, semester=self.semester), 0)
+
+        self.assertEqual(
+            self.marks(self.quiz),
+            {self.students[0].pk: Decimal("15"), self.students[1].pk: Decimal("10"), self.students[2].pk: None},
+        )
+        self.assertEqual(AssessmentTaskScore.objects.count(), 9)
+
+class GradebookTests(CourseTestData, TestCase):
+    def test_build_gradebook_pivots_marks(self):
+        self.enter(self.quiz, {0: 15, 1: 10})
+        self.enter(self.exam, {0: 80})
+
+        gradebook = build_gradebook(course=self.course, semester=self.semester, editor=self.lecturer)
+
+        # External tasks first, then by creation
+        self.assertEqual(gradebook["tasks"]["id"], [self.exam.id, self.quiz.id, self.foreign_quiz.id])
+        self.assertEqual(gradebook["tasks"]["editable"], [True, True, False])
+        self.assertEqual(gradebook["students"]["student_id"], ["STU0", "STU1", "STU2"])
+        self.assertEqual(gradebook["marks"], [[80.0, 15.0, None], [None, 10.0, None], [None, None, None]])
+        # 15/20 * 40 + 80/100 * 60 = 78
+        self.assertEqual(gradebook["final"]["score"][0], 78.0)
+        self.assertEqual(gradebook["final"]["grade"], ["A", "F", None])
+
+    def test_edits_are_written_and_graded(self):
+        updated, errors = apply_gradebook_edits(
+            course=self.course,
+            semester=self.semester,
+            edits=[
+                {"student": self.students[0].pk, "task": self.quiz.pk, "marks": "10"},
+                {"student": self.students[0].pk, "task": self.exam.pk, "marks": 50},
+                {"student": self.students[1].pk, "task": self.quiz.pk, "marks": None},
+            ],
+            recorded_by=self.lecturer,
+        )
+
+        self.assertEqual((updated, errors), (2, []))
+        self.assertEqual(self.marks(self.quiz)[self.students[0].pk], Decimal("10"))
+        assessment = Assessment.objects.get(student=self.students[0], course=self.course)
+        self.assertEqual((assessment.score, assessment.grade), (Decimal("50.0"), "C"))
+
+    def test_edit_of_another_lecturers_task_is_rejected(self):
+        updated, errors = apply_gradebook_edits(
+            course=self.course,
+            semester=self.semester,
+            edits=[
+                {"student": self.students[0].pk, "task": self.quiz.pk, "marks": 10},
+                {"student": self.students[0].pk, "task": self.foreign_quiz.pk, "marks": 5},
+            ],
+            recorded_by=self.lecturer,
+        )
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(errors, [{"edit": 1, "error": "You can only edit marks of your own tasks"}])
+        # Nothing is written when any edit is invalid
+        self.assertIsNone(self.marks(self.quiz)[self.students[0].pk])
+        self.assertIsNone(self.marks(self.foreign_quiz)[self.students[0].pk])
+
+    def test_invalid_edits_are_reported(self):
+        updated, errors = apply_gradebook_edits(
+            course=self.course,
+            semester=self.semester,
+            edits=[
+                {"student": self.students[0].pk, "task": self.quiz.pk, "marks": 25},
+                {"student": self.students[0].pk},
+                {"student": self.lecturer.pk, "task": self.quiz.pk, "marks": 5},
+            ],
+            recorded_by=self.lecturer,
+        )
+
+        self.assertEqual(updated, 0)
+        self.assertEqual([e["edit"] for e in errors], [0, 1, 2])
+        self.assertEqual(errors[0]["error"], "Score out of range")
+        self.assertEqual(errors[2]["error"], "Student not part of task")
+
+
+class CohortTranscriptTests(CourseTestData, TestCase):
+    def test_only_the_latest_open_request_is_updated(self):
+        first, second, third = self.students
+        rejected = TranscriptRequest.objects.create(student=first, status="rejected")
+        older = TranscriptRequest.objects.create(student=first, status="approved")
+        latest = TranscriptRequest.objects.create(student=first, status="pending")
+        revoked = TranscriptRequest.objects.create(student=second, status="revoked")
+
+        result = generate_cohort_transcripts(program=self.program, workers=1)
+
+        self.assertEqual(result, {"students": 3, "updated": 1, "created": 0})
+        latest.refresh_from_db()
+        self.assertEqual(latest.transcript_json["student"]["student_id"], "STU0")
+        for req in (rejected, older, revoked):
+            req.refresh_from_db()
+            self.assertIsNone(req.transcript_json)
+
+    def test_create_missing_counts_students(self):
+        TranscriptRequest.objects.create(student=self.students[0], status="approved")
+        TranscriptRequest.objects.create(student=self.students[1], status="rejected")
+
+        result = generate_cohort_transcripts(program=self.program, create_missing=True, workers=1)
+
+        self.assertEqual(result, {"students": 3, "updated": 1, "created": 2})
+        self.assertEqual(TranscriptRequest.objects.count(), 4)
+
+
+def without_upsert():
+    """Runs the bulk_update fallbacks of backends without ON CONFLICT ... DO UPDATE."""
+    return mock.patch.object(connection.features, "supports_update_conflicts_with_target", False)
+
+
+
+class AssessmentAggregationTests(CourseTestData, TestCase):
+    def finals(self):
+        return {
+            student_id: (float(score), grade, pk)
+            for student_id, score, grade, pk in
+            Assessment.objects
+            .filter(course=self.course, semester=self.semester)
+            .values_list("student__student_id", "score", "grade", "pk")
+        }
+
+    def check_recalculation_updates_in_place(self):
+        # Finals: 15/20 * 40 + 80/100 * 60 = 78, 10/20 * 40 = 20
+        self.enter(self.quiz, {0: 15, 1: 10})
+        self.enter(self.exam, {0: 80})
+        before = self.finals()
+
+        self.enter(self.quiz, {1: 20})
+        written = recalculate_course_assessments(course=self.course, semester=self.semester)
+
+        after = self.finals()
+        self.assertEqual(len(written), 2)
+        self.assertEqual({k: v[:2] for k, v in after.items()}, {"STU0": (78.0, "A"), "STU1": (40.0, "F")})
+        self.assertEqual({k: v[2] for k, v in after.items()}, {k: v[2] for k, v in before.items()})
+
+    def test_recalculation_updates_in_place(self):
+        self.check_recalculation_updates_in_place()
+
+    def test_recalculation_without_upsert_support(self):
+        with without_upsert():
+            self.check_recalculation_updates_in_place()
+
+    def check_bulk_upsert(self):
+        existing = Assessment.objects.create(
+            student=self.students[0],
+            course=self.course,
+            semester=self.semester,
+            program=self.program,
+            score=40,
+            grade="F",
+        )
+
+        bulk_upsert_assessments([
+            Assessment(
+                student=student,
+                course=self.course,
+                semester=self.semester,
+                program=self.program,
+                score=score,
+                grade=grade,
+            )
+            for student, score, grade in [(self.students[0], 65, "B"), (self.students[1], 90, "A")]
+        ])
+
+        finals = self.finals()
+        self.assertEqual({k: v[:2] for k, v in finals.items()}, {"STU0": (65.0, "B"), "STU1": (90.0, "A")})
+        self.assertEqual(finals["STU0"][2], existing.pk)
+        self.assertEqual(
+            StudentAcademicSummary.objects.filter(student__in=self.students[:2]).count(),
+            2,
+        )
+
+    def test_bulk_upsert_updates_and_inserts(self):
+        self.check_bulk_upsert()
+
+    def test_bulk_upsert_without_upsert_support(self):
+        with without_upsert():
+            self.check_bulk_upsert()
+
+
+class AssessmentUniqueMigrationTests(TransactionTestCase):
+    before = [("academics", "0004_seed_assessment_types")]
+    after = [("academics", "0005_assessment_unique_student_course_semester")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_keep_the_newest_row(self):
+        apps = self.migrate(self.before)
+        Assessment = apps.get_model("academics", "Assessment")
+
+        department = apps.get_model("academics", "Department").objects.create(name="Computing", code="CMP")
+        program = apps.get_model("academics", "Program").objects.create(
+            name="Software", code="SWE", department=department
+        )
+        level = apps.get_model("academics", "ProgramLevel").objects.create(program=program, level_name="Level 100")
+        year = apps.get_model("academics", "AcademicYear").objects.create(name="2025/2026")
+        semester = apps.get_model("academics", "Semester").objects.create(name="First", academic_year=year, level=level)
+        base = apps.get_model("academics", "Course").objects.create(
+            program=program, department=department, code="CS101", title="Programming"
+        )
+        course = apps.get_model("academics", "ProgramCourse").objects.create(
+            base_course=base, program=program, level=level, course_code="SWE101", title="Programming", credit_hours=3
+        )
+        User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+        first, second = [User.objects.create(username=f"student{i}", role="student") for i in range(2)]
+
+        def assessment(student, score):
+            return Assessment.objects.create(
+                student=student, course=course, semester=semester, program=program, score=score, grade="F"
+            ).pk
+
+        assessment(first, 10)
+        assessment(first, 20)
+        newest = assessment(first, 30)
+        single = assessment(second, 40)
+
+        apps = self.migrate(self.after)
+
+        self.assertEqual(
+            sorted(apps.get_model("academics", "Assessment").objects.values_list("pk", "score")),
+            [(newest, 30), (single, 40)],
+        )
+
+
+class ScoreAccumulatorTests(CourseTestData, TestCase):
+    def accumulators(self):
+        return {
+            row[0]: row[1:]
+            for row in CourseScoreAccumulator.objects.filter(course=self.course, semester=self.semester)
+            .values_list("student_id", "internal_raw", "internal_max", "external_raw", "external_max", "scores_entered")
+        }
+
+    def assert_matches_rebuild(self):
+        incremental = self.accumulators()
+
+        with transaction.atomic():
+            CourseScoreAccumulator.objects.all().delete()
+            rebuild_score_accumulators(course=self.course, semester=self.semester)
+            rebuilt = self.accumulators()
+            transaction.set_rollback(True)
+
+        self.assertEqual(incremental, rebuilt)
+        return incremental
+
+    def test_deltas_match_a_rebuild(self):
+        first, second, third = [student.pk for student in self.students]
+
+        self.enter(self.quiz, {0: 15, 1: 10, 2: 5})
+        self.enter(self.exam, {0: 80})
+        self.enter(self.foreign_quiz, {1: 7})
+        self.assert_matches_rebuild()
+
+        # Edits
+        self.enter(self.quiz, {0: 18, 2: 0})
+        self.enter(self.exam, {1: 60})
+        self.assert_matches_rebuild()
+
+        # Single-row delete
+        AssessmentTaskScore.objects.get(task=self.quiz, student_id=third).delete()
+        self.assertNotIn(third, self.assert_matches_rebuild())
+
+        # Task weight change
+        self.quiz.total_marks = 25
+        self.quiz.save()
+        self.assertEqual(
+            self.assert_matches_rebuild(),
+            {
+                first: (Decimal("18"), Decimal("25"), Decimal("80"), Decimal("100"), 2),
+                second: (Decimal("17"), Decimal("35"), Decimal("60"), Decimal("100"), 3),
+            },
+        )
+
+
+class ImportTaskScoresCsvTests(CourseTestData, TestCase):
+    def import_csv(self, *rows, chunk_size=1000):
+        upload = SimpleUploadedFile(
+            "scores.csv",
+            "\n".join(["student_id,marks_obtained", *rows]).encode(),
+            content_type="text/csv",
+        )
+        return import_task_scores_csv(task=self.quiz, upload=upload, recorded_by=self.lecturer, chunk_size=chunk_size)
+
+    def check_import(self, chunk_size):
+        first, second, third = [student.pk for student in self.students]
+
+        result = self.import_csv(
+            f"{first},15",
+            f"{second},10",
+            f"{first},18",  # a later row for the same student wins
+            "abc,5",
+            "999999,5",
+            f"{third},25",
+            f"{third},x",
+            f"{third},",
+            chunk_size=chunk_size,
+        )
+
+        self.assertEqual((result.rows, result.updated), (8, 2))
+        self.assertEqual(self.marks(self.quiz), {first: Decimal("18"), second: Decimal("10"), third: None})
+        self.assertEqual(
+            result.error_report().splitlines(),
+            [
+                "line,student_id,marks_obtained,error",
+                "5,abc,5,Invalid student_id",
+                "6,999999,5,Student not part of task",
+                f"7,{third},25,Score out of range",
+                f"8,{third},x,Marks must be a number",
+            ],
+        )
+        # 18/20 * 40 = 36
+        self.assertEqual(Assessment.objects.get(student_id=first, course=self.course).score, Decimal("36"))
+
+    def test_import(self):
+        self.check_import(chunk_size=1000)
+
+    def test_chunks_of_one_row(self):
+        self.check_import(chunk_size=1)
+
+    def test_missing_columns(self):
+        with self.assertRaisesMessage(ValueError, "CSV must have 'student_id' and 'marks_obtained' columns."):
+            import_task_scores_csv(task=self.quiz, upload=SimpleUploadedFile("scores.csv", b"id,marks\n1,5"))
+
+class CourseStatisticsTests(CourseTestData, TestCase):
+    def enter_marks(self):
+        # Quiz: 100%, 50%, 25%. Finals: 40 + 48 = 88 (A), 20 + 36 = 56 (C), 10 (F)
+        self.enter(self.quiz, {0: 20, 1: 10, 2: 5})
+        self.enter(self.exam, {0: 80, 1: 60})
+
+    def assert_statistics(self):
+        course_stats = CourseStatistics.objects.get(course=self.course, semester=self.semester)
+        self.assertEqual(course_stats.count, 3)
+        self.assertAlmostEqual(course_stats.mean, 51.33)
+        self.assertEqual(course_stats.median, 56.0)
+        self.assertAlmostEqual(course_stats.pass_rate, 66.67)
+        self.assertEqual(course_stats.grade_histogram, {"A": 1, "C": 1, "F": 1})
+
+        quiz_stats = TaskStatistics.objects.get(task=self.quiz)
+        self.assertEqual(quiz_stats.count, 3)
+        self.assertAlmostEqual(quiz_stats.mean, 58.33)
+        self.assertEqual(quiz_stats.median, 50.0)
+        self.assertAlmostEqual(quiz_stats.pass_rate, 66.67)
+        self.assertEqual(quiz_stats.histogram, [0, 0, 1, 0, 0, 1, 0, 0, 0, 1])
+
+    def test_statistics_follow_score_saves(self):
+        self.enter_marks()
+        refresh_course_statistics(course=self.course, semester=self.semester, tasks=[])
+        self.assert_statistics()
+
+    def test_refresh_is_idempotent(self):
+        self.enter_marks()
+        refresh_course_statistics(course=self.course, semester=self.semester)
+        refresh_course_statistics(course=self.course, semester=self.semester)
+
+        self.assert_statistics()
+        self.assertEqual(CourseStatistics.objects.count(), 1)
+        self.assertEqual(TaskStatistics.objects.count(), 3)
+        self.assertEqual(TaskStatistics.objects.get(task=self.foreign_quiz).count, 0)
+
+    def test_without_upsert_support(self):
+        with without_upsert():
+            self.enter_marks()
+            refresh_course_statistics(course=self.course, semester=self.semester)
+            refresh_course_statistics(course=self.course, semester=self.semester)
+
+        self.assert_statistics()
+        self.assertEqual(CourseStatistics.objects.count(), 1)
+        self.assertEqual(TaskStatistics.objects.count(), 3)
+        self.assertEqual(TaskStatistics.objects.get(task=self.foreign_quiz).count, 0)
+
+
+class UploadScoresCsvTests(CourseTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.lecturer)
+        self.url = reverse("upload_scores_csv", args=[self.course.pk, self.semester.pk])
+
+    def upload(self, *rows):
+        csv_file = SimpleUploadedFile(
+            "scores.csv",
+            "\n".join(["student_id,score", *rows]).encode(),
+            content_type="text/csv",
+        )
+        return self.client.post(self.url, {"file": csv_file})
+
+    def messages(self, response):
+        self.assertRedirects(
+            response,
+            reverse("lecturer_gradebook", args=[self.course.pk, self.semester.pk]),
+            fetch_redirect_response=False,
+        )
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def scores(self):
+        return dict(
+            Assessment.objects
+            .filter(course=self.course, semester=self.semester)
+            .values_list("student__student_id", "score")
+        )
+
+    def test_created_and_updated_counts(self):
+        Assessment.objects.create(
+            student=self.students[0],
+            course=self.course,
+            semester=self.semester,
+            program=self.program,
+            score=40,
+            grade="F",
+        )
+
+        # STU1 twice: the later row wins, and counts as an update
+        response = self.upload("STU0,75", "STU1,55", "STU1,65", "STU2,")
+
+        self.assertEqual(self.messages(response), ["Scores uploaded successfully. Created: 1, Updated: 2"])
+        self.assertEqual(self.scores(), {"STU0": 75.0, "STU1": 65.0})
+        self.assertEqual(
+            Assessment.objects.get(student=self.students[1], course=self.course).grade,
+            "B",
+        )
+
+    def test_unknown_student_is_not_found(self):
+        response = self.upload("STU0,75", "NOPE,60")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.scores(), {})
+
+    def test_out_of_range_score_is_rejected(self):
+        response = self.upload("STU0,75", "STU1,120")
+
+        self.assertEqual(
+            self.messages(response),
+            ["Invalid score '120.0' for student ID STU1. Scores must be between 0 and 100."],
+        )
+        self.assertEqual(self.scores(), {})
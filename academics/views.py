@@ -4,16 +4,20 @@ from django.contrib.auth import get_user_model
 from django.contrib import messages
 from .models import Program, Course
 from users.models import CustomUser, Payment, StudentRegistration
-from .models import Department, Semester, ProgramCourse, Assessment, Grade,  TranscriptSettings
+from .models import Department, Semester, ProgramCourse, Assessment, TranscriptSettings
 import csv
 from django.http import HttpResponse
 import pandas as pd
 from collections import defaultdict
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import JsonResponse, HttpResponseBadRequest, Http404
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from academics.transition_service import run_program_transition
-from portal.models import SystemLock
+from portal.config import get_config, system_is_locked
 from academics.models import CourseAnnouncement
+from academics.services.grading_policy import get_grading_policy
+from academics.services.assessment_aggregation import bulk_upsert_assessments
+from academics.services.assessment_statistics import refresh_course_statistics
 
 
 # -------------------------------
@@ -27,7 +31,7 @@ def admin_transition_page(request):
         messages.error(request, "Access denied.")
         return redirect("home")
     
-    lock_obj = SystemLock.objects.first()
+    lock_obj = get_config("system_lock")
 
     programs = Program.objects.all().order_by("name")
     return render(request, "users/dashboard/contents/admin/admin_transition.html", {"programs": programs,  "system_lock": lock_obj})
@@ -42,8 +46,7 @@ def start_program_transition(request):
     if getattr(request.user, "role", None) != "admin":
         return JsonResponse({"success": False, "error": "Access denied."}, status=403)
     
-    lock_obj = SystemLock.objects.first()
-    if not lock_obj.is_locked:
+    if not system_is_locked():
         return JsonResponse({
             "success": False,
             "error": "System must be LOCKED before running transition."
@@ -182,7 +185,7 @@ def upload_scores_csv(request, course_id, semester_id):
 
     if request.method != "POST" or "file" not in request.FILES:
         messages.error(request, "No file uploaded.")
-        return redirect("lecturer_enter_assessments", course_id, semester_id)
+        return redirect("lecturer_gradebook", course_id, semester_id)
 
     file = request.FILES["file"]
 
@@ -191,76 +194,80 @@ def upload_scores_csv(request, course_id, semester_id):
         df = pd.read_csv(file).fillna("")
     except:
         messages.error(request, "Invalid CSV format.")
-        return redirect("lecturer_enter_assessments", course_id, semester_id)
+        return redirect("lecturer_gradebook", course_id, semester_id)
 
     # Validate required columns
     if "student_id" not in df or "score" not in df:
         messages.error(request, "CSV must have student_id and score columns.")
-        return redirect("lecturer_enter_assessments", course_id, semester_id)
+        return redirect("lecturer_gradebook", course_id, semester_id)
 
     # Fetch course & semester
     course = get_object_or_404(ProgramCourse, id=course_id, assigned_lecturers=user)
     semester = get_object_or_404(Semester, id=semester_id)
 
-    # Grade helper
-    def get_letter(score):
-        g = Grade.objects.filter(min_score__lte=score, max_score__gte=score).first()
-        return g.letter if g else "N/A"
-
-    created, updated = 0, 0
+    # Blank or non-numeric scores are skipped (lecturer didn't fill them)
+    scores = pd.to_numeric(df["score"], errors="coerce")
+    rows = df.assign(score=scores)[scores.notna()]
+
+    # NEW VALIDATION
+    out_of_range = rows[(rows["score"] < 0) | (rows["score"] > 100)]
+    if not out_of_range.empty:
+        bad = out_of_range.iloc[0]
+        messages.error(
+            request,
+            f"Invalid score '{float(bad['score'])}' for student ID {bad['student_id']}. Scores must be between 0 and 100."
+        )
+        return redirect("lecturer_gradebook", course_id, semester_id)
 
+    # Resolve every student ID with one query
     User = get_user_model()
+    student_ids = rows["student_id"].astype(str).tolist()
+    students = dict(
+        User.objects
+        .filter(student_id__in=set(student_ids), role="student")
+        .values_list("student_id", "id")
+    )
+    if len(students) != len(set(student_ids)):
+        raise Http404("No student matches the given query.")
 
-    for _, row in df.iterrows():
-        student_id = row["student_id"]
-        score = row["score"]
-
-        if score == "":
-            continue  # lecturer didn't fill it
+    # Grade all rows at once (boundaries compiled once, cached per process)
+    score_values = rows["score"].to_numpy(dtype=float)
+    grades = get_grading_policy().letters_for(score_values)
 
-        try:
-            score = float(score)
-        except:
-            continue
+    # A later row for the same student wins, as with row-by-row updates
+    latest = {}
+    for student_id, score, grade in zip(student_ids, score_values, grades):
+        latest[students[student_id]] = (float(score), grade)
 
-        # NEW VALIDATION
-        if score < 0 or score > 100:
-            messages.error(
-                request,
-                f"Invalid score '{score}' for student ID {student_id}. Scores must be between 0 and 100."
+    existing = set(
+        Assessment.objects
+        .filter(course=course, semester=semester, student_id__in=latest)
+        .values_list("student_id", flat=True)
+    )
+    created = len(latest.keys() - existing)
+    updated = len(student_ids) - created
+
+    # Insert or update (one upsert statement)
+    with transaction.atomic():
+        bulk_upsert_assessments([
+            Assessment(
+                student_id=student_pk,
+                course=course,
+                semester=semester,
+                program_id=course.program_id,
+                score=score,
+                grade=grade,
+                recorded_by=user,
             )
-            return redirect("lecturer_enter_assessments", course_id, semester_id)
-    
-        student = get_object_or_404(
-        User,
-        student_id=student_id,
-        role="student"
-        )
-        grade = get_letter(score)
-
-        # Insert or update
-        assessment, created_flag = Assessment.objects.update_or_create(
-            student=student,
-            course=course,
-            semester=semester,
-            defaults={
-                "program": course.program,
-                "score": score,
-                "grade": grade,
-                "recorded_by": user
-            }
-        )
-
-        if created_flag:
-            created += 1
-        else:
-            updated += 1
+            for student_pk, (score, grade) in latest.items()
+        ])
+        refresh_course_statistics(course=course, semester=semester)
 
     messages.success(
         request,
         f"Scores uploaded successfully. Created: {created}, Updated: {updated}"
     )
-    return redirect("lecturer_enter_assessments", course_id, semester_id)
+    return redirect("lecturer_gradebook", course_id, semester_id)
 
 
 # TRANSCRIPT SYSTEM
@@ -296,11 +303,7 @@ def generate_transcript_data(student):
         })
 
     # Compute CGPA
-    grade_points = {
-        "A": 4.0, "B+": 3.5, "B": 3.0,
-        "C+": 2.5, "C": 2.0, "D+": 1.5,
-        "D": 1.0, "F": 0.0,
-    }
+    grade_points = get_grading_policy().grade_points
 
     total_points = 0
     total_credits = 0
@@ -53,6 +53,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so it counts the session/auth queries too, like query_budget()
+    # around a test client request does
+    'portal.query_inspector.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +66,23 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
+# Query inspector (portal.query_inspector): logs SQL count/time and repeated
+# query shapes (N+1) per view. Development only; off unless enabled.
+QUERY_INSPECTOR_ENABLED = os.environ.get("QUERY_INSPECTOR", "False") == "True"
+
+# {url_name: max queries}, checked by the inspector and query_budget(url_name=...).
+# Whole-request counts (session and user included) with a cold cache, plus
+# a little headroom; none of them grows with the number of students.
+QUERY_BUDGETS = {
+    "student_main": 18,
+    "student_view_transcript": 15,
+    "lecturer_main": 6,
+    "dean_main": 8,
+    "class_rankings": 10,
+    "admin_main": 4,
+    "admin_transcript_requests": 10,
+}
+
 ROOT_URLCONF = 'eti_mis.urls'
 
 AUTH_USER_MODEL = 'users.CustomUser'
@@ -123,6 +143,39 @@ DATABASES = {
     )
 }
 
+# Audit log
+# log_event() queues SystemLog rows for a background writer (portal.audit).
+# Set to False to write every event synchronously.
+AUDIT_LOG_ASYNC = os.environ.get("AUDIT_LOG_ASYNC", "True") == "True"
+
+# Cache
+# Holds the version stamps of the process-level caches (grading policy,
+# academic calendar, config rows, ...) and the cached transcripts. With
+# several workers or hosts it must be shared, or a change made in one
+# worker is never seen by the others: set REDIS_URL or MEMCACHED_LOCATION.
+# The per-process memory cache is only right for a single process
+# (development, tests); `manage.py check --deploy` warns about it.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ["REDIS_URL"],
+        }
+    }
+elif os.environ.get("MEMCACHED_LOCATION"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ["MEMCACHED_LOCATION"].split(","),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
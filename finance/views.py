@@ -15,6 +15,7 @@ from django.db import  IntegrityError
 from django.forms import inlineformset_factory
 from finance.models import ProgramFee, ProgramFeeComponent, FeeComponent
 from academics.models import AcademicYear, Semester, Program
+from academics.services.academic_calendar import get_academic_calendar
 from portal.utils import log_event
 from academics.models import Course, Assessment, Grade, ProgramLevel, Enrollment
 from django.utils.crypto import get_random_string
@@ -156,8 +157,9 @@ def semester_fee_list(request):
 
     components = FeeComponent.objects.order_by("name")
 
-    academic_years = AcademicYear.objects.filter(is_active=True).order_by("-start_date")
-    semesters = Semester.objects.filter(is_active=True)
+    calendar = get_academic_calendar(request)
+    academic_years = calendar.years
+    semesters = calendar.semesters
     programs = Program.objects.filter(is_active=True).order_by("name")
 
 
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.core import checks
 from django.contrib.auth import get_user_model
 from django.db.models.signals import post_migrate
 import os
@@ -9,7 +10,10 @@ class PortalConfig(AppConfig):
     name = 'portal'
 
     def ready(self):
+        from portal.cache import check_shared_cache
+
         post_migrate.connect(create_default_superuser, sender=self)
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
 
 
 def create_default_superuser(sender, **kwargs):
@@ -0,0 +1,149 @@
+"""
+Buffered audit log writer behind portal.utils.log_event.
+
+Events are queued in memory and written with bulk_create by a background
+thread: when a batch fills up, when a request finishes, or every
+AUDIT_LOG_FLUSH_INTERVAL seconds (and once more at process exit). The
+writer thread has its own database connection, so events logged inside a
+transaction keep their order and are written even if that transaction
+rolls back, and requests never wait on audit inserts.
+
+Set AUDIT_LOG_ASYNC = False to write every event synchronously.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.dispatch import receiver
+from .models import SystemLog
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_BATCH_SIZE = 200
+AUDIT_LOG_FLUSH_INTERVAL = 2.0
+
+# Events kept while the database is unreachable; the oldest are dropped beyond this
+AUDIT_LOG_MAX_PENDING = 10000
+
+# Errors worth retrying: the database is down, not the event
+CONNECTION_ERRORS = (InterfaceError, OperationalError)
+
+
+class AuditLogWriter:
+    def __init__(self, batch_size=AUDIT_LOG_BATCH_SIZE, interval=AUDIT_LOG_FLUSH_INTERVAL,
+                 max_pending=AUDIT_LOG_MAX_PENDING):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_thread(self):
+        # Started lazily in each worker process (after gunicorn forks)
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+    def log(self, entry):
+        """Queues an unsaved SystemLog."""
+        with self._lock:
+            self._ensure_thread()
+            self._pending.append(entry)
+            if len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                logger.warning("Audit log buffer full: dropped the oldest event.")
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self._wake.set()
+
+    def wake(self):
+        """Asks the writer thread to flush now."""
+        if self._pending:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Writes every queued event in the calling thread, in logging order.
+        Returns the number written. Call it outside transactions: a flush
+        inside one would be rolled back with it.
+
+        Events are re-queued only when the database is unreachable; when
+        the batch is rejected, they are written one by one and the ones
+        that still fail are logged and dropped.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+
+            if not batch:
+                return 0
+
+            try:
+                SystemLog.objects.bulk_create(batch, batch_size=self.batch_size)
+            except CONNECTION_ERRORS:
+                logger.exception("Could not write %s audit log event(s); retrying later.", len(batch))
+                self._requeue(batch)
+                return 0
+            except Exception:
+                # One bad event must not block the others: write them one by one
+                return self._write_each(batch)
+
+            return len(batch)
+
+    def _write_each(self, batch):
+        written = 0
+        for index, entry in enumerate(batch):
+            try:
+                with transaction.atomic():
+                    entry.save(force_insert=True)
+            except CONNECTION_ERRORS:
+                logger.exception("Could not write %s audit log event(s); retrying later.", len(batch) - index)
+                self._requeue(batch[index:])
+                break
+            except Exception:
+                logger.exception("Dropped an audit log event that could not be written: %s", entry)
+            else:
+                written += 1
+        return written
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._pending.extendleft(reversed(batch))
+
+    def __len__(self):
+        return len(self._pending)
+
+
+audit_log = AuditLogWriter()
+
+atexit.register(audit_log.flush)
+
+
+@receiver(request_finished)
+def flush_audit_log_after_request(sender, **kwargs):
+    audit_log.wake()
+
+
+def audit_log_is_async():
+    return getattr(settings, "AUDIT_LOG_ASYNC", True)
@@ -0,0 +1,118 @@
+"""
+Process-local caches kept consistent across workers with version stamps.
+
+Every cached value belongs to a namespace. Writers call bump_version()
+(usually from a post_save / post_delete signal), which stores a fresh
+token in the shared Django cache once the surrounding transaction
+commits. Readers compare the token they loaded with the shared one and
+reload when it changed, so every gunicorn worker picks up the change on
+its next lookup.
+"""
+import threading
+import uuid
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+
+
+VERSION_KEY = "version:{}"
+
+# Backends whose entries are not seen by other processes, or that cost a
+# query per version lookup
+UNSHARED_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+}
+SLOW_BACKENDS = {
+    "django.core.cache.backends.db.DatabaseCache",
+}
+
+
+def get_version(namespace):
+    """Current version token of a namespace (created on first use)."""
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+
+    if version is None:
+        # Missing or evicted: publish a new token so stale readers reload.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate a namespace in every process once the write is committed."""
+    transaction.on_commit(
+        lambda: cache.set(VERSION_KEY.format(namespace), uuid.uuid4().hex, None)
+    )
+
+
+class ProcessCache:
+    """
+    A value loaded once per process and reloaded whenever the namespace
+    version changes.
+
+        policy_cache = ProcessCache("grading_policy", load_policy)
+        policy = policy_cache.get()
+    """
+
+    def __init__(self, namespace, loader):
+        self.namespace = namespace
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+
+    def get(self):
+        # Read the version BEFORE loading: a bump that lands while we load
+        # leaves us with an older token, so the next call reloads again.
+        version = get_version(self.namespace)
+
+        with self._lock:
+            if self._version != version:
+                self._value = self.loader()
+                self._version = version
+            return self._value
+
+    @property
+    def version(self):
+        return get_version(self.namespace)
+
+    def clear(self):
+        with self._lock:
+            self._value = None
+            self._version = None
+
+
+def bump_versions(namespaces):
+    """bump_version() for many namespaces with a single cache write."""
+    namespaces = list(namespaces)
+    if not namespaces:
+        return
+    transaction.on_commit(
+        lambda: cache.set_many(
+            {VERSION_KEY.format(ns): uuid.uuid4().hex for ns in namespaces}, None
+        )
+    )
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Deploy check: version stamps need a shared, query-free cache."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend in UNSHARED_BACKENDS:
+        return [checks.Warning(
+            f"The default cache ({backend}) is not shared between processes: "
+            "cache invalidations will not reach the other workers.",
+            hint="Set REDIS_URL or MEMCACHED_LOCATION.",
+            id="portal.W001",
+        )]
+    if backend in SLOW_BACKENDS:
+        return [checks.Warning(
+            "The database cache costs a query for every version lookup.",
+            hint="Set REDIS_URL or MEMCACHED_LOCATION.",
+            id="portal.W002",
+        )]
+    return []
@@ -0,0 +1,50 @@
+"""
+Singleton configuration rows (system lock, transcript settings, portal
+settings, school branding) cached per process.
+
+Each entry is loaded with Model.objects.first() on first use and kept
+until its namespace version changes; the models' post_save / post_delete
+receivers bump it, so the lock toggle or school setup reaches every
+worker on its next lookup. The cached instances are shared: read them,
+never save them (fetch a fresh row to edit).
+
+    if system_is_locked(): ...
+    school = get_config("school")
+"""
+from django.apps import apps
+from portal.cache import ProcessCache, bump_version
+
+
+# name: (model label, version namespace)
+CONFIG_MODELS = {
+    "system_lock": ("portal.SystemLock", "config:system_lock"),
+    "portal_settings": ("portal.PortalSettings", "config:portal_settings"),
+    "transcript_settings": ("academics.TranscriptSettings", "config:transcript_settings"),
+    # Shared with the cached PDFs that print the branding
+    "school": ("school.School", "school_branding"),
+}
+
+
+def _first_row(label):
+    return lambda: apps.get_model(label).objects.order_by("pk").first()
+
+
+_caches = {
+    name: ProcessCache(namespace, _first_row(label))
+    for name, (label, namespace) in CONFIG_MODELS.items()
+}
+
+
+def get_config(name):
+    """The cached singleton row registered as ``name`` (None when missing)."""
+    return _caches[name].get()
+
+
+def invalidate_config(name):
+    """Reload ``name`` in every process once the current write commits."""
+    bump_version(CONFIG_MODELS[name][1])
+
+
+def system_is_locked():
+    lock = get_config("system_lock")
+    return lock.is_locked if lock else False
@@ -7,7 +7,10 @@
 
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils import timezone
+from portal.config import invalidate_config
 
 
 # Example: Portal-level settings or utilities could go here
@@ -50,7 +53,8 @@ class SystemLog(models.Model):
         help_text="Optional metadata or extra context (JSON/text)."
     )
 
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event is logged, not when the buffered batch is written
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-timestamp"]
@@ -82,6 +86,18 @@ class SystemLock(models.Model):
 
     def __str__(self):
         return "System is LOCKED" if self.is_locked else "System is UNLOCKED"
+
+
+# The lock and portal settings are read from the process cache
+# (portal.config): reload them in every worker when they change.
+@receiver([post_save, post_delete], sender=SystemLock)
+def invalidate_system_lock(sender, **kwargs):
+    invalidate_config("system_lock")
+
+
+@receiver([post_save, post_delete], sender=PortalSettings)
+def invalidate_portal_settings(sender, **kwargs):
+    invalidate_config("portal_settings")
     
 
 class Announcement(models.Model):
@@ -0,0 +1,80 @@
+"""
+ReportLab helpers shared by the generated PDFs (payment records,
+transcripts): the school branding header and image lookups.
+"""
+import os
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
+
+
+def school_image_path(image):
+    """Filesystem path of a School image field, or None if it is missing."""
+    if not image:
+        return None
+
+    path = os.path.join(settings.MEDIA_ROOT, image.name)
+    return path if os.path.exists(path) else None
+
+
+def draw_school_header(p, school, width, height, title):
+    """
+    Draws the logo, school name, contact details, divider and document
+    title at the top of the page. Returns the y of the title baseline.
+    """
+    header_top = height - 50
+
+    # LOGO (LEFT)
+    logo_path = school_image_path(school.logo) if school else None
+    if logo_path:
+        p.drawImage(
+            ImageReader(logo_path),
+            50,
+            header_top - 50,
+            width=60,
+            height=60,
+            preserveAspectRatio=True,
+            mask="auto"
+        )
+
+    # SCHOOL NAME
+    p.setFont("Helvetica-Bold", 16)
+    p.setFillColor(colors.HexColor("#1f2937"))  # slate-800
+    p.drawCentredString(
+        width / 2,
+        header_top,
+        school.name.upper() if school else "OFFICIAL"
+    )
+
+    # SCHOOL DETAILS
+    p.setFont("Helvetica", 9)
+    p.setFillColor(colors.HexColor("#6b7280"))  # gray-500
+
+    details = []
+    if school:
+        if school.address:
+            details.append(school.address)
+        if school.phone:
+            details.append(f"Tel: {school.phone}")
+        if school.email:
+            details.append(school.email)
+
+    if details:
+        p.drawCentredString(
+            width / 2,
+            header_top - 18,
+            " | ".join(details)
+        )
+
+    # DIVIDER LINE
+    p.setStrokeColor(colors.HexColor("#e5e7eb"))
+    p.setLineWidth(0.6)
+    p.line(50, header_top - 35, width - 50, header_top - 35)
+
+    # DOCUMENT TITLE — centered with breathing room
+    p.setFont("Helvetica-Bold", 14)
+    p.setFillColor(colors.HexColor("#111827"))
+    title_y = header_top - 80
+    p.drawCentredString(width / 2, title_y, title)
+
+    return title_y
@@ -0,0 +1,181 @@
+"""
+SQL instrumentation for development and tests: query count, total SQL
+time and repeated query shapes (N+1 patterns) per view.
+
+Queries are normalized into fingerprints (literals and IN lists
+stripped), so "the same query with a different id" run N times in one
+request shows up as one shape repeated N times.
+
+    # settings.py (development)
+    QUERY_INSPECTOR_ENABLED = True
+    QUERY_BUDGETS = {"student_main": 12}
+
+    # tests
+    with query_budget(url_name="student_main"):
+        client.get(reverse("student_main"))
+
+    @query_budget(10, max_repeats=3)
+    def test_registration_complete(self): ...
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+# A shape run this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def sql_fingerprint(sql):
+    """The shape of a query: literals, placeholders and IN lists collapsed."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    Records every query run on any database connection of the current
+    thread while active (no DEBUG needed).
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.total_time, recorder.repeated()
+    """
+
+    def __init__(self):
+        self.queries = []  # [(sql, seconds)]
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+        return False
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """[(fingerprint, times)] of the shapes run at least ``threshold`` times, most first."""
+        shapes = Counter(sql_fingerprint(sql) for sql, _ in self.queries)
+        return [(shape, n) for shape, n in shapes.most_common() if n >= threshold]
+
+    def summary(self, label="", threshold=N_PLUS_ONE_THRESHOLD):
+        lines = [f"{label or 'queries'}: {self.count} SQL in {self.total_time * 1000:.1f} ms"]
+        for shape, n in self.repeated(threshold):
+            lines.append(f"  N+1? {n}x {shape[:300]}")
+        return "\n".join(lines)
+
+
+class query_budget(ContextDecorator):
+    """
+    Fails (AssertionError) when the wrapped block runs more than
+    ``max_queries`` queries, or repeats one query shape more than
+    ``max_repeats`` times. ``url_name`` reads the budget from
+    settings.QUERY_BUDGETS when max_queries is not given.
+    """
+
+    def __init__(self, max_queries=None, url_name=None, max_repeats=None):
+        if max_queries is None and url_name is not None:
+            max_queries = getattr(settings, "QUERY_BUDGETS", {}).get(url_name)
+        if max_queries is None and max_repeats is None:
+            raise ValueError(f"No query budget for {url_name or 'this block'}.")
+
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.label = url_name or "block"
+
+    def __enter__(self):
+        self.recorder = QueryRecorder().__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, *exc):
+        self.recorder.__exit__(exc_type, *exc)
+        if exc_type is not None:
+            return False
+
+        problems = []
+        if self.max_queries is not None and self.recorder.count > self.max_queries:
+            problems.append(f"{self.recorder.count} queries (budget {self.max_queries})")
+        if self.max_repeats is not None and self.recorder.repeated(self.max_repeats + 1):
+            problems.append(f"a query shape repeated more than {self.max_repeats} times")
+
+        if problems:
+            threshold = self.max_repeats + 1 if self.max_repeats is not None else N_PLUS_ONE_THRESHOLD
+            raise AssertionError(
+                f"{self.label}: " + ", ".join(problems) + "\n"
+                + self.recorder.summary(self.label, threshold)
+            )
+        return False
+
+
+class QueryInspectorMiddleware:
+    """
+    Development middleware: logs SQL count/time per view, warns about N+1
+    shapes and QUERY_BUDGETS overruns, and adds X-SQL-Count / X-SQL-Time
+    response headers. Disabled unless QUERY_INSPECTOR_ENABLED is set.
+
+    Keep it first in MIDDLEWARE: it then counts the session and auth
+    queries too, the same whole-request count query_budget() sees around
+    a test client request.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSPECTOR_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = getattr(settings, "QUERY_BUDGETS", {})
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        url_name = match.url_name if match and match.url_name else request.path
+
+        response["X-SQL-Count"] = str(recorder.count)
+        response["X-SQL-Time"] = f"{recorder.total_time * 1000:.1f}ms"
+
+        budget = self.budgets.get(url_name)
+        over_budget = budget is not None and recorder.count > budget
+
+        if over_budget or recorder.repeated():
+            label = f"{request.method} {url_name}"
+            if over_budget:
+                label += f" over budget ({budget})"
+            logger.warning(recorder.summary(label))
+        else:
+            logger.debug(recorder.summary(f"{request.method} {url_name}"))
+
+        return response
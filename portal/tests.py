@@ -1,3 +1,148 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from academics.models import AcademicYear, Department, Program, ProgramLevel, Semester
+from portal.config import system_is_locked
+from portal.models import SystemLock
+from portal.query_inspector import query_budget, sql_fingerprint
+from portal.utils import _parse_byte_range
 
-# Create your tests here.
+
+class SqlFingerprintTests(TestCase):
+    def test_literals_become_placeholders(self):
+        self.assertEqual(
+            sql_fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'O''Brien' AND score > 3.5"),
+            "SELECT * FROM t WHERE id = ? AND name = ? AND score > ?",
+        )
+
+    def test_placeholder_styles_match(self):
+        self.assertEqual(
+            sql_fingerprint('SELECT "a" FROM "t" WHERE "id" = %s'),
+            sql_fingerprint('SELECT "a" FROM "t" WHERE "id" = 7'),
+        )
+
+    def test_in_lists_of_any_length_match(self):
+        short = sql_fingerprint("SELECT * FROM t WHERE id IN (%s, %s)")
+        long = sql_fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s, %s, %s)")
+
+        self.assertEqual(short, long)
+        self.assertEqual(short, "SELECT * FROM t WHERE id IN (...)")
+
+    def test_whitespace_is_collapsed(self):
+        self.assertEqual(sql_fingerprint("  SELECT *\n\tFROM t  "), "SELECT * FROM t")
+
+
+def create_student():
+    department = Department.objects.create(name="Computing", code="CMP")
+    program = Program.objects.create(name="Software", code="SWE", department=department)
+    level = ProgramLevel.objects.create(program=program, level_name="Level 100")
+    year = AcademicYear.objects.create(name="2025/2026", is_active=True)
+    Semester.objects.create(name="First", academic_year=year, level=level, is_active=True)
+
+    return get_user_model().objects.create_user(
+        username="student",
+        password="password",
+        role="student",
+        program=program,
+        level=level,
+        department=department,
+    )
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = create_student()
+
+    def setUp(self):
+        # Cold: every process cache reloads on its next lookup
+        cache.clear()
+        self.client.force_login(self.student)
+
+    def test_student_main_within_budget(self):
+        with query_budget(url_name="student_main"):
+            response = self.client.get(reverse("student_main"))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_over_budget_fails(self):
+        with self.assertRaisesMessage(AssertionError, "student_main:"):
+            with query_budget(1, url_name="student_main"):
+                self.client.get(reverse("student_main"))
+
+    def test_repeated_shapes_fail(self):
+        with self.assertRaisesMessage(AssertionError, "repeated more than 2 times"):
+            with query_budget(max_repeats=2):
+                for _ in range(3):
+                    list(Department.objects.filter(code="CMP"))
+
+    def test_missing_budget_raises(self):
+        with self.assertRaises(ValueError):
+            query_budget(url_name="no_such_view")
+
+
+@override_settings(QUERY_INSPECTOR_ENABLED=True, QUERY_BUDGETS={"student_main": 1})
+class QueryInspectorMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = create_student()
+
+    def setUp(self):
+        self.client.force_login(self.student)
+
+    def test_headers_and_budget_by_url_name(self):
+        with self.assertLogs("portal.query_inspector", "WARNING") as logs:
+            response = self.client.get(reverse("student_main"))
+
+        self.assertIn("X-SQL-Count", response)
+        self.assertIn("GET student_main over budget (1)", logs.output[0])
+
+    def test_counts_the_same_queries_as_query_budget(self):
+        with self.assertLogs("portal.query_inspector", "WARNING"):
+            with query_budget(max_repeats=100) as recorder:
+                response = self.client.get(reverse("student_main"))
+
+        self.assertEqual(response["X-SQL-Count"], str(recorder.count))
+
+
+class SystemLockConfigTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_lookup_costs_no_query(self):
+        SystemLock.objects.create(is_locked=True)
+        self.assertTrue(system_is_locked())
+
+        with self.assertNumQueries(0):
+            self.assertTrue(system_is_locked())
+
+    def test_toggle_reloads_after_commit(self):
+        lock = SystemLock.objects.create(is_locked=False)
+        self.assertFalse(system_is_locked())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lock.is_locked = True
+            lock.save()
+
+        self.assertTrue(system_is_locked())
+
+
+class ParseByteRangeTests(SimpleTestCase):
+    def test_simple_ranges(self):
+        self.assertEqual(_parse_byte_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(_parse_byte_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(_parse_byte_range("bytes=900-5000", 1000), (900, 999))
+
+    def test_suffix_ranges(self):
+        self.assertEqual(_parse_byte_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(_parse_byte_range("bytes=-5000", 1000), (0, 999))
+
+    def test_unsatisfiable(self):
+        self.assertEqual(_parse_byte_range("bytes=1000-", 1000), "unsatisfiable")
+        self.assertEqual(_parse_byte_range("bytes=2000-3000", 1000), "unsatisfiable")
+
+    def test_invalid_headers_send_the_whole_file(self):
+        for header in [None, "", "items=0-10", "bytes=0-10,20-30", "bytes=abc-", "bytes=-", "bytes=10", "bytes=50-10"]:
+            with self.subTest(header=header):
+                self.assertIsNone(_parse_byte_range(header, 1000))
@@ -1,100 +1,383 @@
 from .models import SystemLog
+from .audit import audit_log, audit_log_is_async
+from django.utils import timezone
+from django.http import HttpResponse, HttpResponseNotModified
 from users.models import StudentRegistration
 from academics.models import Assessment
-from django.db.models import Prefetch
+from academics.services.grading_policy import get_grading_policy, grading_policy_version
+from portal.cache import get_version
+from django.db.models import Count, Max
 from decimal import Decimal
+import hashlib
 
 def log_event(user, category, message, meta=None):
-    SystemLog.objects.create(
-        user=user,
+    # Queued for the audit writer (portal.audit); stamped now so the
+    # batched insert keeps the time of the event.
+    entry = SystemLog(
+        user_id=getattr(user, "pk", None),
         category=category,
         message=message,
-        meta=meta
+        meta=meta,
+        timestamp=timezone.now(),
     )
 
+    if audit_log_is_async():
+        audit_log.log(entry)
+    else:
+        entry.save()
 
-def generate_transcript_json(student):
+
+# -------------------------------
+# TRANSCRIPT BUILDER
+# -------------------------------
+# Loading and assembly are split so a whole cohort can be loaded with a
+# few set-based queries and assembled anywhere (assembly is pure Python
+# over plain dicts, safe to hand to worker processes).
+
+def transcript_student_info(student):
+    return {
+        "name": student.get_full_name(),
+        "student_id": student.student_id,
+        "email": student.email,
+        "department": student.department.name if student.department else None,
+        "program": student.program.name if student.program else None,
+        "award_type": student.program.get_award_type_display() if student.program else None,
+        "program_duration_years": student.program.duration_years if student.program else None,
+    }
+
+
+def load_transcript_data(students):
     """
-    Returns a full transcript dictionary:
+    Loads everything the transcripts of ``students`` need in three
+    queries: registrations, their course through-rows and assessments.
+
+    Returns {student_id: {"registrations": [...], "assessments": [...]}}
+    with plain dicts only (see assemble_transcript).
     """
+    student_ids = [getattr(s, "pk", s) for s in students]
+    data = {sid: {"registrations": [], "assessments": []} for sid in student_ids}
+    if not student_ids:
+        return data
+
+    for reg in load_transcript_registrations(student_ids):
+        data[reg["student_id"]]["registrations"].append(reg)
+
+    for a in load_transcript_assessments(student_ids):
+        data[a["student_id"]]["assessments"].append(a)
+
+    return data
+
 
-    # Load all registrations for this student (old + new)
+def load_transcript_registrations(student_ids):
+    """Registrations of the students with their course ids (two queries)."""
     registrations = (
-        StudentRegistration.objects.filter(student=student)
+        StudentRegistration.objects.filter(student_id__in=student_ids)
         .select_related("semester", "semester__academic_year", "semester__level")
-        .order_by("semester__start_date")
+        .order_by("semester__start_date", "id")
     )
 
-    grade_points = {
-        "A": 4.0, "B+": 3.5, "B": 3.0,
-        "C+": 2.5, "C": 2.0, "D+": 1.5,
-        "D": 1.0, "F": 0.0,
-    }
-
-    transcript_semesters = []
-    total_points = Decimal("0")
-    total_credits = Decimal("0")
-
+    reg_rows = {}
     for reg in registrations:
-        sem_data = {
+        reg_rows[reg.id] = {
+            "id": reg.id,
+            "student_id": reg.student_id,
+            "semester_id": reg.semester_id,
             "semester": reg.semester.name,
             "academic_year": reg.semester.academic_year.name,
             "level": reg.semester.level.level_name if reg.semester.level else None,
-            "courses": [],
-            "gpa": None,
+            "course_ids": set(),
         }
 
-        assessments = (
-            Assessment.objects.filter(
-                student=student,
-                semester=reg.semester,
-                course__in=reg.courses.all()
-            ).select_related("course")
-        )
+    through = StudentRegistration.courses.through
+    for reg_id, course_id in (
+        through.objects
+        .filter(studentregistration_id__in=list(reg_rows))
+        .values_list("studentregistration_id", "programcourse_id")
+    ):
+        reg_rows[reg_id]["course_ids"].add(course_id)
 
-        sem_points = Decimal("0")
-        sem_credits = Decimal("0")
+    return list(reg_rows.values())
 
-        for a in assessments:
-            credits = Decimal(a.course.credit_hours or 0)
-            point = Decimal(grade_points.get(a.grade, 0)) * credits
 
-            sem_points += point
-            sem_credits += credits
+def load_transcript_assessments(student_ids, semester_ids=None):
+    """Assessment rows of the students, optionally of some semesters only."""
+    assessments = Assessment.objects.filter(student_id__in=student_ids)
+    if semester_ids is not None:
+        assessments = assessments.filter(semester_id__in=semester_ids)
 
-            sem_data["courses"].append({
-                "code": a.course.course_code,
-                "title": a.course.title,
-                "score": float(a.score),
-                "grade": a.grade,
-                "credits": int(credits),
-            })
+    return list(
+        assessments
+        .order_by("id")
+        .values(
+            "student_id",
+            "semester_id",
+            "course_id",
+            "course__course_code",
+            "course__title",
+            "course__credit_hours",
+            "score",
+            "grade",
+            "updated_at",
+        )
+    )
 
-        sem_data["gpa"] = float(sem_points / sem_credits) if sem_credits > 0 else None
 
-        # accumulate for CGPA
-        total_points += sem_points
-        total_credits += sem_credits
+def semester_fingerprint(semester_id, course_ids, assessment_count, latest_update):
+    """
+    Identifies the inputs of one transcript semester: the semester, its
+    registered courses and its assessments (count and last update).
+    """
+    latest = latest_update.isoformat() if latest_update else ""
+    payload = f"{semester_id}|{sorted(course_ids)}|{assessment_count}|{latest}"
+    return hashlib.sha1(payload.encode()).hexdigest()
 
-        transcript_semesters.append(sem_data)
 
-    cgpa = float(total_points / total_credits) if total_credits > 0 else None
+def assemble_transcript(student_info, registrations, assessments, policy):
+    """
+    Builds the transcript dictionary from loaded data (no database access).
+
+    Every semester also carries its registration id, a fingerprint of its
+    inputs and its grade-point/credit totals, so a later regeneration can
+    rebuild only the semesters that changed (see regenerate_transcript_json).
+    """
+    by_semester = {}
+    for a in assessments:
+        by_semester.setdefault(a["semester_id"], []).append(a)
+
+    transcript_semesters = [
+        assemble_semester(reg, by_semester.get(reg["semester_id"], []), policy)
+        for reg in registrations
+    ]
 
     # -------------------------------
     # BUILD FINAL TRANSCRIPT OBJECT
     # -------------------------------
-    transcript = {
-        "student": {
-            "name": student.get_full_name(),
-            "student_id": student.student_id,
-            "email": student.email,
-            "department": student.department.name if student.department else None,
-            "program": student.program.name if student.program else None,
-            "award_type": student.program.get_award_type_display() if student.program else None,
-            "program_duration_years": student.program.duration_years if student.program else None,
-        },
+    return {
+        "student": student_info,
         "semesters": transcript_semesters,
-        "cgpa": cgpa,
+        "cgpa": cumulative_gpa(transcript_semesters),
+    }
+
+
+def assemble_semester(reg, assessments, policy):
+    """One transcript semester from its registration and the semester's assessments."""
+    sem_data = {
+        "registration_id": reg["id"],
+        "semester": reg["semester"],
+        "academic_year": reg["academic_year"],
+        "level": reg["level"],
+        "courses": [],
+        "gpa": None,
+    }
+
+    sem_points = Decimal("0")
+    sem_credits = Decimal("0")
+
+    for a in assessments:
+        if a["course_id"] not in reg["course_ids"]:
+            continue
+
+        credits = Decimal(a["course__credit_hours"] or 0)
+        point = policy.points_for(a["grade"]) * credits
+
+        sem_points += point
+        sem_credits += credits
+
+        sem_data["courses"].append({
+            "code": a["course__course_code"],
+            "title": a["course__title"],
+            "score": float(a["score"]),
+            "grade": a["grade"],
+            "credits": int(credits),
+        })
+
+    sem_data["gpa"] = float(sem_points / sem_credits) if sem_credits > 0 else None
+
+    # Totals kept for CGPA, exact as strings
+    sem_data["points"] = str(sem_points)
+    sem_data["credits"] = str(sem_credits)
+    sem_data["fingerprint"] = semester_fingerprint(
+        reg["semester_id"],
+        reg["course_ids"],
+        len(assessments),
+        max((a["updated_at"] for a in assessments), default=None),
+    )
+
+    return sem_data
+
+
+def cumulative_gpa(semesters):
+    total_points = sum((Decimal(sem["points"]) for sem in semesters), Decimal("0"))
+    total_credits = sum((Decimal(sem["credits"]) for sem in semesters), Decimal("0"))
+    return float(total_points / total_credits) if total_credits > 0 else None
+
+
+def transcript_build_stamp():
+    """
+    Versions of the shared inputs of every transcript (grading policy,
+    course/semester catalog); a regeneration under different versions
+    rebuilds all semesters.
+    """
+    return {
+        "policy": grading_policy_version(),
+        "catalog": get_version("transcript_catalog"),
     }
 
+
+def generate_transcript_json(student):
+    """
+    Returns a full transcript dictionary (constant number of queries).
+    """
+    data = load_transcript_data([student])[student.pk]
+
+    transcript = assemble_transcript(
+        transcript_student_info(student),
+        data["registrations"],
+        data["assessments"],
+        get_grading_policy(),
+    )
+    transcript["build"] = transcript_build_stamp()
     return transcript
+
+
+def regenerate_transcript_json(student, previous):
+    """
+    Brings a previously generated transcript up to date, rebuilding only
+    the semesters whose fingerprint changed.
+
+    Registrations and per-semester assessment counts/last updates are
+    read first (three light queries); assessments are then loaded for the
+    changed semesters only and spliced into the document. The CGPA is
+    recomputed from the stored per-semester totals. Falls back to a full
+    generation when the previous document predates fingerprints or the
+    grading policy or catalog changed since.
+    """
+    stamp = transcript_build_stamp()
+    previous_semesters = {
+        sem.get("registration_id"): sem
+        for sem in (previous or {}).get("semesters", [])
+    }
+
+    if (
+        not previous
+        or previous.get("build") != stamp
+        or any(key is None or "fingerprint" not in sem for key, sem in previous_semesters.items())
+    ):
+        return generate_transcript_json(student)
+
+    registrations = load_transcript_registrations([student.pk])
+
+    semester_state = {
+        row["semester_id"]: (row["count"], row["latest"])
+        for row in (
+            Assessment.objects.filter(student=student)
+            .values("semester_id")
+            .annotate(count=Count("id"), latest=Max("updated_at"))
+            .order_by()
+        )
+    }
+
+    changed = []
+    for reg in registrations:
+        count, latest = semester_state.get(reg["semester_id"], (0, None))
+        fingerprint = semester_fingerprint(reg["semester_id"], reg["course_ids"], count, latest)
+        previous_sem = previous_semesters.get(reg["id"])
+        if previous_sem is None or previous_sem["fingerprint"] != fingerprint:
+            changed.append(reg)
+
+    rebuilt = {}
+    if changed:
+        policy = get_grading_policy()
+        by_semester = {}
+        for a in load_transcript_assessments([student.pk], {reg["semester_id"] for reg in changed}):
+            by_semester.setdefault(a["semester_id"], []).append(a)
+
+        for reg in changed:
+            rebuilt[reg["id"]] = assemble_semester(reg, by_semester.get(reg["semester_id"], []), policy)
+
+    semesters = [
+        rebuilt.get(reg["id"]) or previous_semesters[reg["id"]]
+        for reg in registrations
+    ]
+
+    return {
+        "student": transcript_student_info(student),
+        "semesters": semesters,
+        "cgpa": cumulative_gpa(semesters),
+        "build": stamp,
+    }
+
+
+# -------------------------------
+# CACHED FILE DOWNLOADS
+# -------------------------------
+
+def bytes_response(request, data, etag, content_type, filename):
+    """
+    Serves prebuilt bytes with an ETag and single-range support:
+    304 when the client already has this version, 206 for a satisfiable
+    "Range: bytes=..." request, 416 when the range is out of bounds.
+    """
+    etag = f'"{etag}"'
+    if_none_match = request.headers.get("If-None-Match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    size = len(data)
+    byte_range = _parse_byte_range(request.headers.get("Range"), size)
+
+    # If-Range: only honour the range when the client's copy is current
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip() != etag:
+        byte_range = None
+
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif byte_range:
+        start, end = byte_range
+        response = HttpResponse(data[start:end + 1], content_type=content_type, status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        response = HttpResponse(data, content_type=content_type)
+
+    response["ETag"] = etag
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private, no-cache"
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return response
+
+
+def _parse_byte_range(header, size):
+    """
+    (start, end) of a single "bytes=" range, "unsatisfiable", or None when
+    the header is absent, malformed or asks for several ranges (the whole
+    file is sent instead, as RFC 9110 allows).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start, sep, end = header[len("bytes="):].strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        elif end:
+            # suffix range: the last N bytes
+            start = max(size - int(end), 0)
+            end = size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+
+    if start >= size:
+        return "unsatisfiable"
+    if start > end:
+        return None
+    return start, end
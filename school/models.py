@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from portal.cache import bump_version
 
 
 
@@ -27,3 +30,11 @@ class School(models.Model):
 
     def __str__(self):
         return self.name
+
+
+# Name, logo, signature and signee are printed on generated PDFs:
+# invalidate the cached documents and the cached School row
+# (portal.config) when they change.
+@receiver([post_save, post_delete], sender=School)
+def invalidate_school_branding(sender, **kwargs):
+    bump_version("school_branding")
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.conf import settings  
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
 from academics.models import Department, Program, AcademicYear, Semester, ProgramCourse, ProgramLevel
 
 class CustomUser(AbstractUser):
@@ -169,27 +171,41 @@ class StudentRegistration(models.Model):
         return f"{self.student.get_full_name()} - {self.academic_year} - {self.semester}"
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# Students who register (or add a course) after its assessment tasks were
+# created still need score rows on those tasks.
+@receiver(m2m_changed, sender=StudentRegistration.courses.through)
+def seed_scores_for_added_courses(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != "post_add" or not pk_set:
+        return
+    from academics.services.assessment_tasks import seed_registration_scores
+
+    if reverse:
+        # course.registered_students.add(registration, ...)
+        for registration_id in pk_set:
+            seed_registration_scores(registration=registration_id, courses=[instance])
+    else:
+        seed_registration_scores(registration=instance, courses=pk_set)
+
+
+# The cached student sidebar lists the registered courses.
+@receiver([post_save, post_delete], sender=StudentRegistration)
+def invalidate_sidebar_on_registration(sender, instance, **kwargs):
+    from academics.services.student_sidebar import invalidate_student_sidebars
+
+    invalidate_student_sidebars([instance.student_id])
+
+
+@receiver(m2m_changed, sender=StudentRegistration.courses.through)
+def invalidate_sidebar_on_registered_courses(sender, instance, action, reverse, pk_set, **kwargs):
+    from academics.services.student_sidebar import invalidate_student_sidebars
+
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_student_sidebars([instance.student_id])
+    elif action in ("post_add", "post_remove"):
+        # course.registered_students.add(registration, ...)
+        invalidate_student_sidebars(
+            StudentRegistration.objects.filter(id__in=pk_set).values_list("student_id", flat=True)
+        )
+    elif action == "pre_clear":
+        invalidate_student_sidebars(instance.registered_students.values_list("student_id", flat=True))
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from academics.models import TranscriptRequest
+from academics.tests import CourseTestData
+from portal.models import SystemLock
+
+
+# Audit events are written inline: no writer thread in tests
+@override_settings(AUDIT_LOG_ASYNC=False)
+class CohortTranscriptViewTests(CourseTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        admin = get_user_model().objects.create_user(username="admin", password="password", role="admin")
+        self.client.force_login(admin)
+
+    def post(self, data):
+        response = self.client.post(reverse("admin_generate_cohort_transcripts"), data)
+        self.assertRedirects(response, reverse("admin_transcript_requests"), fetch_redirect_response=False)
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_non_numeric_ids_are_rejected(self):
+        self.assertEqual(
+            self.post({"program": "abc", "level": ""}),
+            ["Invalid program, level or academic year."],
+        )
+        self.assertFalse(TranscriptRequest.objects.exists())
+
+    def test_generates_for_a_program(self):
+        messages = self.post({"program": str(self.program.pk), "create_missing": "on"})
+
+        self.assertEqual(messages, ["Generated 3 transcript(s) (0 updated, 3 new)."])
+        self.assertEqual(TranscriptRequest.objects.filter(status="approved").count(), 3)
+
+
+class UploadTaskScoresCsvViewTests(CourseTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.lecturer)
+
+    def upload(self):
+        csv_file = SimpleUploadedFile(
+            "scores.csv",
+            f"student_id,marks_obtained\n{self.students[0].pk},15\n".encode(),
+            content_type="text/csv",
+        )
+        response = self.client.post(reverse("upload_task_scores_csv", args=[self.quiz.pk]), {"file": csv_file})
+        self.assertRedirects(
+            response,
+            reverse("lecturer_assessment_detail", args=[self.quiz.pk]),
+            fetch_redirect_response=False,
+        )
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_upload(self):
+        self.assertEqual(self.upload(), ["Scores uploaded successfully (1 scores updated)."])
+        self.assertEqual(self.marks(self.quiz)[self.students[0].pk], 15)
+
+    def test_locked_system_rejects_uploads(self):
+        SystemLock.objects.create(is_locked=True)
+
+        self.assertEqual(self.upload(), ["Assessment entry is locked. Please contact administration."])
+        self.assertEqual(set(self.marks(self.quiz).values()), {None})
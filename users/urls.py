@@ -21,6 +21,7 @@ urlpatterns = [
     path("student/transcript/", views.student_request_transcript, name="student_request_transcript"),
     path("student/profile/", views.student_profile, name="student_profile"),
     path("student/transcript/view", views.student_view_transcript, name="student_view_transcript"),
+    path("student/transcript/pdf/", views.student_transcript_pdf, name="student_transcript_pdf"),
     path("student/fee-payments/", views.student_fee_payments, name="student_fee_payments"),
     path("notifications/mark-read/", views.mark_announcement_read, name="mark_announcement_read"),
 
@@ -34,6 +35,8 @@ urlpatterns = [
     path("lecturer/resources/<int:resource_id>/delete/", views.resource_delete, name="resource_delete"),
     path("lecturer/assessments/task/<int:task_id>/download-csv/",views.download_task_scores_csv,name="download_task_scores_csv",),
     path("lecturer/assessments/task/<int:task_id>/upload-csv/",views.upload_task_scores_csv,name="upload_task_scores_csv",),
+    path("lecturer/assessments/task/<int:task_id>/upload-csv/errors/",views.download_task_scores_errors,name="download_task_scores_errors",),
+    path("lecturer/gradebook/<int:course_id>/semester/<int:semester_id>/", views.lecturer_gradebook, name="lecturer_gradebook"),
    
 
     path("admin/", views.admin_main, name="admin_main"),
@@ -55,6 +58,8 @@ urlpatterns = [
     path("dean/assign-lecturers/", views.assign_lecturers, name="assign_lecturers"),
     path("dean/manage-courses/", views.manage_courses, name="manage_courses"),
     path("dean/assessments/", views.assessments, name="assessments"),
+    path("dean/rankings/", views.class_rankings, name="class_rankings"),
+    path("ajax/gpa-whatif/", views.ajax_gpa_whatif, name="ajax_gpa_whatif"),
     path('dean/program-courses/', views.dean_program_courses_list, name='dean_program_courses_list'),
     path("dean/program-course/<int:pc_id>/json/", views.ajax_get_program_course, name="ajax_get_program_course"),
     path("dean/program-course/update/", views.ajax_update_program_course, name="ajax_update_program_course"),
@@ -67,11 +72,13 @@ urlpatterns = [
     path("admin/transcripts/", views.admin_transcript_requests, name="admin_transcript_requests"),
     # path("admin/announcements/", views.announcements_list, name="announcements_list"),
     path("admin/transcripts/generate/<int:req_id>/", views.admin_generate_transcript, name="admin_generate_transcript"),
+    path("admin/transcripts/pdf/<int:req_id>/", views.admin_transcript_pdf, name="admin_transcript_pdf"),
     path("admin/transcripts/approve/<int:req_id>/", views.admin_approve_transcript, name="admin_approve_transcript"),
     path("admin/transcripts/reject/<int:req_id>/", views.admin_reject_transcript, name="admin_reject_transcript"),
     path("admin/transcripts/revoke/<int:req_id>/", views.admin_revoke_transcript, name="admin_revoke_transcript"),
     path("admin/transcripts/toggle/", views.admin_toggle_transcript_lock, name="admin_toggle_transcript_lock"),
     path("admin/transcripts/generate-for-student/", views.admin_generate_transcript_for_student, name="admin_generate_transcript_for_student"),
+    path("admin/transcripts/generate-cohort/", views.admin_generate_cohort_transcripts, name="admin_generate_cohort_transcripts"),
     path(
     "transcripts/requests/delete/<int:req_id>/",
     views.admin_delete_transcript_request,
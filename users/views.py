@@ -5,16 +5,14 @@ from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q, Count
 from .models import CustomUser as User, Payment, RegistrationProgress, StudentRegistration
-from academics.models import Program, Course, AcademicYear, Semester, Assessment, Grade, ProgramLevel, Enrollment
+from academics.models import Program, Course, AcademicYear, Semester, Grade, ProgramLevel, Enrollment
 from academics.models import Department, Resource, TranscriptSettings, TranscriptRequest, ProgramCourse, AssessmentCategory, AssessmentType, AssessmentTask, AssessmentTaskScore
 from portal.models import SystemLog
 from school.models import School
 from django.core.paginator import Paginator
-from reportlab.lib.utils import ImageReader
-from django.conf import settings
-import os
 import csv, io
 import pandas as pd
+import numpy as np
 from django.http import HttpResponse,JsonResponse
 import random
 import datetime
@@ -29,25 +27,41 @@ from decimal import Decimal
 from academics.forms import ResourceForm
 import json
 from portal.utils import log_event
-from portal.utils import generate_transcript_json  
+from portal.utils import generate_transcript_json, regenerate_transcript_json
+from portal.pdf import draw_school_header
+from portal.utils import bytes_response
 from django.db import  IntegrityError
-from portal.models import SystemLock, Announcement
+from portal.models import Announcement
+from portal.config import get_config, system_is_locked
 from django.db.models import Sum, F, DecimalField, ExpressionWrapper
 from academics.services.assessment_tasks import create_task_with_scores
-from academics.services.assessment_aggregation import recalculate_student_assessment
+from academics.services.assessment_scores import (
+    save_task_scores,
+    parse_marks,
+    import_task_scores_csv,
+    store_error_report,
+    get_error_report,
+)
+from academics.services.gradebook import build_gradebook, apply_gradebook_edits
+from academics.services.assessment_statistics import attach_task_statistics
+from academics.services.grading_policy import get_grading_policy
+from academics.services.transcript_generation import generate_cohort_transcripts
+from academics.services.transcript_cache import get_cached_transcript, transcript_cache_stats
+from academics.services.transcript_pdf import get_transcript_pdf
+from academics.services.student_results import load_student_results
+from academics.services.gpa_simulation import GPASimulator
+from academics.services.class_rankings import rank_semester, DEANS_LIST_MIN_GPA, DEANS_LIST_MIN_CREDITS
+from academics.services.risk_detection import at_risk_flags, AT_RISK_DASHBOARD_LIMIT
+from academics.services.academic_calendar import get_academic_calendar
 from decimal import ROUND_HALF_UP
 from finance.models import ProgramFee
-from academics.models import CourseAnnouncement
+from academics.models import CourseAnnouncement, CourseStatistics
+from academics.models import StudentAcademicSummary, StudentSemesterSummary, StudentRanking, StudentRiskFlag
 
 
 # Example assumes your User model has a 'role' field with values:
 # "student", "lecturer", "dean", or "admin"
 
-def system_is_locked():
-    lock = SystemLock.objects.first()
-    return lock.is_locked if lock else False
-
-
 def generate_student_id():
     # Example: STU + year + random digits
     from datetime import datetime
@@ -248,8 +262,9 @@ def student_profile(request):
         messages.error(request, "Access denied.")
         return redirect("home")
 
-    active_year = AcademicYear.objects.filter(is_active=True).first()
-    active_semester = Semester.objects.filter(is_active=True, level=user.level).first()
+    calendar = get_academic_calendar(request)
+    active_year = calendar.year
+    active_semester = calendar.semester_for(user.level_id)
 
     return render(request, "users/dashboard/contents/student/student_profile.html", {
         "user": user,
@@ -269,7 +284,8 @@ def student_main(request):
     # ---------------------------
     # Active academic year
     # ---------------------------
-    active_year = AcademicYear.objects.filter(is_active=True).first()
+    calendar = get_academic_calendar(request)
+    active_year = calendar.year
 
     # ---------------------------
     # Student's current level
@@ -279,13 +295,7 @@ def student_main(request):
     # ---------------------------
     # Active semester for this level
     # ---------------------------
-    active_semester = None
-    if active_year and current_level:
-        active_semester = Semester.objects.filter(
-            academic_year=active_year,
-            level=current_level,
-            is_active=True
-        ).first()
+    active_semester = calendar.semester_for(current_level)
 
     # ---------------------------
     # ENROLLMENT CHECK (single source of truth)
@@ -321,30 +331,11 @@ def student_main(request):
     # ---------------------------
     # GPA + TOTAL CREDITS (ALL-TIME)
     # ---------------------------
-    grade_point_map = {
-        "A": 4.0, "A-": 3.7,
-        "B+": 3.5, "B": 3.0, "B-": 2.7,
-        "C+": 2.5, "C": 2.0,
-        "D+": 1.5, "D": 1.0,
-        "F": 0.0
-    }
-
-    assessments = (
-        Assessment.objects
-        .filter(student=user)
-        .select_related("course")
-    )
-
-    total_points = 0
-    total_credits = 0
+    # Maintained on every assessment write (academics.services.academic_summaries)
+    summary = StudentAcademicSummary.objects.filter(student=user).first()
 
-    for a in assessments:
-        points = grade_point_map.get(a.grade, 0)
-        credits = getattr(a.course, "credit_hours", 3)
-        total_points += points * credits
-        total_credits += credits
-
-    current_gpa = round(total_points / total_credits, 2) if total_credits else None
+    current_gpa = round(float(summary.cgpa), 2) if summary and summary.cgpa is not None else None
+    total_credits = summary.total_credits if summary else 0
 
     # ---------------------------
     # FEE BALANCE (ACTIVE SEMESTER)
@@ -364,39 +355,34 @@ def student_main(request):
     fee_balance = fee_aggregation["total_balance"] or 0
 
     # ---------------------------
-    # GRAPH DATA (UNCHANGED)
+    # GRAPH DATA
     # ---------------------------
-    graph_semesters = (
-        Semester.objects.filter(
-            id__in=Assessment.objects.filter(student=user)
-            .values_list("semester_id", flat=True)
-        )
-        .select_related("academic_year")
-        .order_by("start_date")
+    # One row per graded semester, with the per-course grade points
+    semester_summaries = list(
+        StudentSemesterSummary.objects
+        .filter(student=user)
+        .select_related("semester", "semester__academic_year")
+        .order_by("semester__start_date", "semester_id")
     )
+    graph_semesters = [row.semester for row in semester_summaries]
 
-    selected_sem_id = request.GET.get("semester")
-    if selected_sem_id:
-        selected_graph_semester = graph_semesters.filter(id=selected_sem_id).first()
+    requested_sem_id = request.GET.get("semester")
+    if requested_sem_id:
+        selected_summary = next(
+            (row for row in semester_summaries if str(row.semester_id) == requested_sem_id),
+            None,
+        )
     else:
-        selected_graph_semester = graph_semesters.last() if graph_semesters else None
-        selected_sem_id = selected_graph_semester.id if selected_graph_semester else None
+        selected_summary = semester_summaries[-1] if semester_summaries else None
+    selected_sem_id = selected_summary.semester_id if selected_summary else None
 
     course_labels = []
     grade_points = []
 
-    if selected_graph_semester:
-        sem_assessments = (
-            Assessment.objects
-            .filter(student=user, semester=selected_graph_semester)
-            .select_related("course")
-            .order_by("course__course_code")
-        )
-
-        for a in sem_assessments:
-            code = getattr(a.course, "course_code", "") or getattr(a.course, "code", "")
-            course_labels.append(code)
-            grade_points.append(grade_point_map.get(a.grade, 0))
+    if selected_summary:
+        for code, points in selected_summary.course_points:
+            course_labels.append(code or "")
+            grade_points.append(points)
 
     # ---------------------------
     # FINAL CONTEXT
@@ -580,7 +566,25 @@ def resource_delete(request, resource_id):
 
 @login_required
 def lecturer_grades(request):
-    return render(request, "users/dashboard/contents/lecturer/lecturer_grades.html")
+    user = request.user
+
+    if getattr(user, "role", None) != "lecturer":
+        messages.error(request, "Access denied.")
+        return redirect("home")
+
+    # Precomputed on every grade recalculation; nothing heavy here
+    course_stats = attach_task_statistics(
+        CourseStatistics.objects
+        .filter(course__assigned_lecturers=user)
+        .select_related("course", "semester", "semester__academic_year")
+        .order_by("-semester__start_date", "course__course_code")
+    )
+
+    return render(
+        request,
+        "users/dashboard/contents/lecturer/lecturer_grades.html",
+        {"course_stats": course_stats},
+    )
 
 
 # admin
@@ -1269,63 +1273,9 @@ def generate_payment_pdf(request, payment_id):
     # ---------------------------------------------
     # HEADER (SCHOOL BRANDING)
     # ---------------------------------------------
-    school = School.objects.first()
+    school = get_config("school")
 
-    header_top = height - 50
-
-    # LOGO (LEFT)
-    if school and school.logo:
-        logo_path = os.path.join(settings.MEDIA_ROOT, school.logo.name)
-        if os.path.exists(logo_path):
-            p.drawImage(
-                ImageReader(logo_path),
-                50,
-                header_top - 50,
-                width=60,
-                height=60,
-                preserveAspectRatio=True,
-                mask="auto"
-            )
-
-    # SCHOOL NAME
-    p.setFont("Helvetica-Bold", 16)
-    p.setFillColor(colors.HexColor("#1f2937"))  # slate-800
-    p.drawCentredString(
-        width / 2,
-        header_top,
-        school.name.upper() if school else "OFFICIAL"
-    )
-
-    # SCHOOL DETAILS
-    p.setFont("Helvetica", 9)
-    p.setFillColor(colors.HexColor("#6b7280"))  # gray-500
-
-    details = []
-    if school:
-        if school.address:
-            details.append(school.address)
-        if school.phone:
-            details.append(f"Tel: {school.phone}")
-        if school.email:
-            details.append(school.email)
-
-    if details:
-        p.drawCentredString(
-            width / 2,
-            header_top - 18,
-            " | ".join(details)
-        )
-
-    # DIVIDER LINE (unchanged position)
-    p.setStrokeColor(colors.HexColor("#e5e7eb"))
-    p.setLineWidth(0.6)
-    p.line(50, header_top - 35, width - 50, header_top - 35)
-
-    # DOCUMENT TITLE — centered with breathing room
-    p.setFont("Helvetica-Bold", 14)
-    p.setFillColor(colors.HexColor("#111827"))
-    title_y = header_top - 80   # controls TOP space
-    p.drawCentredString(width / 2, title_y, "STUDENT PAYMENT RECORD")
+    title_y = draw_school_header(p, school, width, height, "STUDENT PAYMENT RECORD")
 
     # 🔑 THIS LINE CREATES THE BOTTOM SPACE
     y = title_y - 40 
@@ -1423,7 +1373,26 @@ def toggle_program_fee_allowed(request, fee_id):
 # DEAN SECTION ------------------------------
 @login_required
 def dean_main(request):
-    return render(request, "users/dashboard/contents/dean/dean_main.html")
+    user = request.user
+
+    # Read from the nightly risk detection table (detect_at_risk_students)
+    flags = at_risk_flags()
+
+    # Dean sees only programs in his/her department
+    if getattr(user, "role", None) == "dean":
+        flags = flags.filter(student__program__department__dean=user)
+    elif getattr(user, "role", None) != "admin":
+        flags = flags.none()
+
+    return render(
+        request,
+        "users/dashboard/contents/dean/dean_main.html",
+        {
+            "risk_flags": flags[:AT_RISK_DASHBOARD_LIMIT],
+            "high_risk_count": flags.filter(risk_level=StudentRiskFlag.HIGH).count(),
+            "medium_risk_count": flags.filter(risk_level=StudentRiskFlag.MEDIUM).count(),
+        },
+    )
 
 @login_required
 def assign_lecturers(request):
@@ -1431,8 +1400,220 @@ def assign_lecturers(request):
 
 @login_required
 def assessments(request):
-    return render(request, "users/dashboard/contents/dean/assessments.html")
+    user = request.user
+
+    if getattr(user, "role", None) not in ["dean", "admin"]:
+        messages.error(request, "Access denied.")
+        return redirect("home")
+
+    course_stats = (
+        CourseStatistics.objects
+        .select_related(
+            "course",
+            "course__program",
+            "semester",
+            "semester__academic_year",
+        )
+        .order_by("-semester__start_date", "course__program__name", "course__course_code")
+    )
+
+    # Dean sees only programs in his/her department
+    if user.role == "dean":
+        course_stats = course_stats.filter(course__program__department__dean=user)
+
+    return render(
+        request,
+        "users/dashboard/contents/dean/assessments.html",
+        {"course_stats": course_stats},
+    )
+
+
+
+@login_required
+def class_rankings(request):
+    user = request.user
+
+    if getattr(user, "role", None) not in ["dean", "admin"]:
+        messages.error(request, "Access denied.")
+        return redirect("home")
+
+    # Dean sees only programs in his/her department
+    programs = Program.objects.order_by("name")
+    if user.role == "dean":
+        programs = programs.filter(department__dean=user)
+
+    semesters = (
+        Semester.objects
+        .filter(student_summaries__isnull=False)
+        .distinct()
+        .select_related("academic_year", "level")
+        .order_by("-start_date", "-id")
+    )
+
+    # Defaults: first program / latest semester. Unknown or malformed ids
+    # select nothing, so a bad POST is refused instead of ranking another cohort.
+    params = request.POST if request.method == "POST" else request.GET
+    program_id = params.get("program", "").strip()
+    semester_id = params.get("semester", "").strip()
 
+    if not program_id:
+        program = programs.first()
+    else:
+        program = programs.filter(id=program_id).first() if program_id.isdigit() else None
+
+    if not semester_id:
+        semester = semesters.first()
+    else:
+        semester = semesters.filter(id=semester_id).first() if semester_id.isdigit() else None
+
+    if request.method == "POST":
+        if not program or not semester:
+            messages.error(request, "Select a program and semester to rank.")
+            return redirect("class_rankings")
+
+        ranked = rank_semester(semester, programs=[program])
+        log_event(user, "assessment", f"Ranked {ranked} students of {program.name} ({semester.name})")
+        messages.success(request, f"Ranked {ranked} student(s).")
+        return redirect(f"{reverse('class_rankings')}?program={program.id}&semester={semester.id}")
+
+    rankings = StudentRanking.objects.none()
+    if program and semester:
+        rankings = (
+            StudentRanking.objects
+            .filter(program=program, semester=semester)
+            .select_related("student")
+            .order_by("gpa_rank", "student__last_name")
+        )
+        if request.GET.get("deans_list"):
+            rankings = rankings.filter(on_deans_list=True)
+
+    return render(
+        request,
+        "users/dashboard/contents/dean/class_rankings.html",
+        {
+            "programs": programs,
+            "semesters": semesters,
+            "program": program,
+            "semester": semester,
+            "rankings": rankings,
+            "deans_list_only": bool(request.GET.get("deans_list")),
+            "deans_list_min_gpa": DEANS_LIST_MIN_GPA,
+            "deans_list_min_credits": DEANS_LIST_MIN_CREDITS,
+        },
+    )
+
+
+@login_required
+def ajax_gpa_whatif(request):
+    """
+    What-if GPA projections (JSON). POST body:
+
+        {"scenarios": [60, 70, 80] | [[70, 55, ...], ...],
+         "target": 3.5, "semester": id,
+         "student": id | "program": id}
+
+    Students get their own projection; deans (their department's
+    programs) and admins can pass a student or a whole program cohort.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request"}, status=400)
+
+    user = request.user
+    if user.role not in ["student", "dean", "admin"]:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    try:
+        target = float(payload["target"]) if payload.get("target") is not None else None
+        program_id = int(payload["program"]) if payload.get("program") else None
+        student_id = int(payload["student"]) if payload.get("student") else None
+        semester_id = int(payload["semester"]) if payload.get("semester") else None
+    except (ValueError, TypeError):
+        return JsonResponse({"error": "Invalid target, student, program or semester"}, status=400)
+
+    scenarios = payload.get("scenarios") or []
+    if not isinstance(scenarios, list):
+        return JsonResponse({"error": "Scenarios must be a list of scores"}, status=400)
+
+    # ---------------------------
+    # Who is simulated
+    # ---------------------------
+    students = User.objects.filter(role="student")
+    if user.role == "dean":
+        students = students.filter(program__department__dean=user)
+
+    if user.role == "student":
+        students = [user]
+    elif program_id:
+        students = list(students.filter(program_id=program_id).only("id"))
+    elif student_id:
+        students = list(students.filter(id=student_id).only("id"))
+    else:
+        return JsonResponse({"error": "Select a student or program"}, status=400)
+
+    if not students:
+        return JsonResponse({"error": "No students found"}, status=404)
+
+    # ---------------------------
+    # Semester (default: the student's latest registration)
+    # ---------------------------
+    if semester_id:
+        semester = Semester.objects.filter(id=semester_id).first()
+    else:
+        latest_reg = (
+            StudentRegistration.objects
+            .filter(student=students[0])
+            .select_related("semester")
+            .order_by("-semester__start_date", "-id")
+            .first()
+        )
+        semester = latest_reg.semester if latest_reg else None
+
+    if semester is None:
+        return JsonResponse({"error": "No semester to simulate"}, status=404)
+
+    simulator = GPASimulator.load(students, semester)
+
+    try:
+        projection = simulator.simulate(scenarios)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except TypeError:
+        return JsonResponse({"error": "Scenarios must be a list of scores"}, status=400)
+
+    def as_list(values):
+        return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+    data = {
+        "semester": {"id": semester.id, "name": semester.name},
+        "pending_courses": simulator.courses,
+    }
+
+    if len(students) == 1:
+        data["gpa"] = as_list(projection["gpa"][:, 0])
+        data["cgpa"] = as_list(projection["cgpa"][:, 0])
+        if target is not None:
+            data["required"] = simulator.required_for(target)[0]
+    else:
+        # Cohort: per-scenario distribution of the projections
+        with np.errstate(invalid="ignore"):
+            data["students"] = len(students)
+            data["mean_gpa"] = as_list(np.nanmean(projection["gpa"], axis=1))
+            data["mean_cgpa"] = as_list(np.nanmean(projection["cgpa"], axis=1))
+            data["deans_list"] = (
+                ((projection["gpa"] >= float(DEANS_LIST_MIN_GPA)).sum(axis=1)).tolist()
+            )
+            if target is not None:
+                data["target_reached"] = (projection["cgpa"] >= target).sum(axis=1).tolist()
+                data["target_reachable"] = sum(r["reachable"] for r in simulator.required_for(target))
+
+    return JsonResponse(data)
 
 
 # -------------------------------------------------- DEAN MANAGE COURSES -----------------------------------------------------
@@ -2564,7 +2745,7 @@ def registration_complete(request):
     # ---------------------------------------------
     # Active academic year
     # ---------------------------------------------
-    active_year = AcademicYear.objects.filter(is_active=True).first()
+    active_year = get_academic_calendar(request).year
     if not active_year:
         return registration_error(request, "No active academic year found.")
 
@@ -2656,22 +2837,8 @@ def registration_complete(request):
 # -----------------------------
 # Grade helpers
 # -----------------------------
-def resolve_letter_grade(percent, grade_rules):
-    for rule in grade_rules:
-        if rule.min_score <= percent <= rule.max_score:
-            return rule.letter
-    return "N/A"
-
-
 def resolve_grade_points(letter):
-    mapping = {
-        "A": 4.0, "A-": 3.7,
-        "B+": 3.5, "B": 3.0, "B-": 2.7,
-        "C+": 2.5, "C": 2.0,
-        "D+": 1.5, "D": 1.0,
-        "F": 0.0,
-    }
-    return Decimal(str(mapping.get(letter.upper(), 0.0)))
+    return get_grading_policy().points_for(letter)
 
 
 
@@ -2697,58 +2864,32 @@ def student_academics(request):
     selected_year = (
         all_years.filter(id=year_id).first()
         if year_id
-        else AcademicYear.objects.filter(is_active=True).first()
+        else get_academic_calendar(request).year
     )
 
     selected_year_id = str(selected_year.id) if selected_year else None
 
     # -----------------------------------------
-    # Grade rules
+    # Grade rules + category weights
     # -----------------------------------------
-    grade_rules = Grade.objects.order_by("-min_score")
+    policy = get_grading_policy()
+    grade_boundaries = policy.boundaries
 
-    # -----------------------------------------
-    # Fetch assessment category weights
-    # -----------------------------------------
-    categories = {
-        c.system_role: c
-        for c in AssessmentCategory.objects.all()
-    }
-
-    internal_weight = Decimal(str(categories["INTERNAL"].weight_percentage))
-    external_weight = Decimal(str(categories["EXTERNAL"].weight_percentage))
+    internal_weight = policy.internal_weight
+    external_weight = policy.external_weight
 
     # -----------------------------------------
-    # Fetch task scores
+    # Totals per (semester, course, category) + task list, aggregated
+    # by the database (academics.services.student_results)
     # -----------------------------------------
-    scores = (
-        AssessmentTaskScore.objects
-        .filter(
-            student=user,
-            task__semester__academic_year=selected_year,
-            marks_obtained__isnull=False
-        )
-        .select_related(
-            "task",
-            "task__course",
-            "task__semester",
-            "task__assessment_category",
-            "task__assessment_type",
-        )
-    )
+    results = load_student_results(user, selected_year) if selected_year else {
+        "totals": [], "tasks": [], "semesters": {}, "courses": {},
+    }
 
     semesters = {}
-
-    # -----------------------------------------
-    # Group tasks
-    # -----------------------------------------
-    for s in scores:
-        semester = s.task.semester
-        course = s.task.course
-        category = s.task.assessment_category.system_role
-
-        sem_block = semesters.setdefault(semester.id, {
-            "semester": semester,
+    for row in results["totals"]:
+        sem_block = semesters.setdefault(row["semester_id"], {
+            "semester": results["semesters"][row["semester_id"]],
             "courses": {},
 
             # RAW totals
@@ -2767,41 +2908,39 @@ def student_academics(request):
             "gpa": None,
         })
 
-        course_block = sem_block["courses"].setdefault(course.id, {
-            "course": course,
+        course_block = sem_block["courses"].setdefault(row["course_id"], {
+            "course": results["courses"][row["course_id"]],
             "tasks": [],
             "course_total": Decimal("0"),
         })
 
-        task_score = Decimal(str(s.marks_obtained))
-        task_total = (
-            Decimal(str(s.task.total_marks))
-            .quantize(Decimal("0"), rounding=ROUND_HALF_UP)
-        )
+        prefix = "internal" if row["category"] == AssessmentCategory.INTERNAL else "external"
+        sem_block[f"{prefix}_raw"] += row["raw"]
+        sem_block[f"{prefix}_max"] += row["max"]
+
+        # Course aggregation (for GPA)
+        course_block["course_total"] += row["raw"]
 
-        percent = (task_score / task_total) * Decimal("100")
-        task_grade = resolve_letter_grade(percent, grade_rules)
+    # -----------------------------------------
+    # Task rows (graded in one vectorized lookup)
+    # -----------------------------------------
+    task_grades = grade_boundaries.resolve_many([t["percent"] for t in results["tasks"]])
+
+    for t, task_grade in zip(results["tasks"], task_grades):
+        sem_block = semesters.get(t["task__semester_id"])
+        course_block = sem_block["courses"].get(t["task__course_id"]) if sem_block else None
+        if course_block is None:
+            continue
 
         course_block["tasks"].append({
-            "title": s.task.title,
-            "category": category,
-            "type": s.task.assessment_type.name,
-            "marks": task_score,
-            "total": task_total,
+            "title": t["task__title"],
+            "category": t["task__assessment_category__system_role"],
+            "type": t["task__assessment_type__name"],
+            "marks": t["marks_obtained"],
+            "total": t["task__total_marks"].quantize(Decimal("0"), rounding=ROUND_HALF_UP),
             "grade": task_grade,
         })
 
-        # Accumulate RAW totals for semester
-        if category == "INTERNAL":
-            sem_block["internal_raw"] += task_score
-            sem_block["internal_max"] += task_total
-        else:
-            sem_block["external_raw"] += task_score
-            sem_block["external_max"] += task_total
-
-        # Course aggregation (for GPA)
-        course_block["course_total"] += task_score
-
     # -----------------------------------------
     # GPA, credits, weighted totals, overall grade
     # -----------------------------------------
@@ -2815,7 +2954,7 @@ def student_academics(request):
             credits = Decimal(str(course.credit_hours or 3))
 
             percent = course_data["course_total"]  # assumed out of 100
-            letter = resolve_letter_grade(percent, grade_rules)
+            letter = grade_boundaries.resolve(percent)
             points = resolve_grade_points(letter)
 
             total_points += points * credits
@@ -2857,9 +2996,8 @@ def student_academics(request):
             Decimal("100")
         ).quantize(Decimal("0"), rounding=ROUND_HALF_UP)
 
-        sem_data["overall_grade"] = resolve_letter_grade(
-            sem_data["overall_score"],
-            grade_rules
+        sem_data["overall_grade"] = grade_boundaries.resolve(
+            sem_data["overall_score"]
         )
 
     # -----------------------------------------
@@ -2889,7 +3027,19 @@ def student_academics(request):
 
 @login_required
 def lecturer_main(request):
-    return render(request, "users/dashboard/contents/lecturer/lecturer_main.html")
+    user = request.user
+
+    # At-risk students registered this semester in the lecturer's courses
+    flags = at_risk_flags().filter(
+        student__registrations__semester__is_active=True,
+        student__registrations__courses__assigned_lecturers=user,
+    ).distinct()
+
+    return render(
+        request,
+        "users/dashboard/contents/lecturer/lecturer_main.html",
+        {"risk_flags": flags[:AT_RISK_DASHBOARD_LIMIT]},
+    )
 
 
 @login_required
@@ -3028,9 +3178,7 @@ def lecturer_courses(request):
 
 
 def get_letter_grade(score):
-    from .models import Grade
-    grade_obj = Grade.objects.filter(min_score__lte=score, max_score__gte=score).first()
-    return grade_obj.letter if grade_obj else "N/A"
+    return get_grading_policy().letter_for(score)
 
 @login_required
 def lecturer_assessments(request):
@@ -3054,11 +3202,7 @@ def lecturer_assessments(request):
     # -----------------------------
     # LOAD SEMESTERS
     # -----------------------------
-    semesters = (
-        Semester.objects.filter(is_active=True)
-        .select_related("academic_year")
-        .order_by("-start_date")
-    )
+    semesters = get_academic_calendar(request).semesters
 
     # -----------------------------
     # FILTERS
@@ -3071,7 +3215,7 @@ def lecturer_assessments(request):
         selected_semester = Semester.objects.filter(id=semester_id).first()
     else:
         # auto-select latest active semester
-        selected_semester = semesters.first()
+        selected_semester = semesters[0] if semesters else None
 
     # -----------------------------
     # BASE QUERYSET (ONLY OWN TASKS)
@@ -3259,43 +3403,35 @@ def lecturer_assessment_detail(request, task_id):
     # ---------------------------------
     if request.method == "POST":
         errors = False
-        affected_students = set()
+        submitted = {}
 
-        for score_obj in scores_qs:
-            raw = request.POST.get(f"score_{score_obj.student.id}", "").strip()
+        stored_scores = list(
+            AssessmentTaskScore.objects
+            .filter(task=task)
+            .only("id", "task_id", "student_id", "marks_obtained")
+        )
 
-            if raw == "":
-                score_obj.marks_obtained = None
-                score_obj.recorded_by = user
-                score_obj.save()
-                affected_students.add(score_obj.student)
+        for score_obj in stored_scores:
+            field = f"score_{score_obj.student_id}"
+            if field not in request.POST:
                 continue
 
             try:
-                value = Decimal(raw)
-            except Exception:
-                errors = True
-                continue
-
-            if value < 0 or value > Decimal(str(task.total_marks)):
+                submitted[score_obj.student_id] = parse_marks(
+                    request.POST.get(field), task.total_marks
+                )
+            except ValueError:
                 errors = True
-                continue
-
-            score_obj.marks_obtained = value
-            score_obj.recorded_by = user
-            score_obj.save()
-            affected_students.add(score_obj.student)
 
         # ---------------------------------
-        # RECALCULATE FINAL ASSESSMENTS
+        # WRITE CHANGED ROWS + RECALCULATE THEIR FINAL ASSESSMENTS
         # ---------------------------------
-        for student in affected_students:
-            recalculate_student_assessment(
-                student=student,
-                course=task.course,
-                semester=task.semester,
-                recorded_by=user
-            )
+        save_task_scores(
+            task=task,
+            submitted=submitted,
+            recorded_by=user,
+            scores=stored_scores,
+        )
 
         # ---------------------------------
         # FEEDBACK + REDIRECT (ONCE)
@@ -3319,6 +3455,7 @@ def lecturer_assessment_detail(request, task_id):
         {
             "task": task,
             "scores": scores_qs,
+            "has_error_report": get_error_report(task, user) is not None,
         }
     )
 
@@ -3360,14 +3497,6 @@ def download_task_scores_csv(request, task_id):
 def upload_task_scores_csv(request, task_id):
     user = request.user
 
-    if request.method == "POST":
-        if system_is_locked():
-            messages.error(
-                request,
-                "Assessment entry is locked. Please contact administration."
-            )
-            return redirect("lecturer_assessment_detail", task_id=task.id)
-
     task = get_object_or_404(
         AssessmentTask,
         id=task_id,
@@ -3377,51 +3506,112 @@ def upload_task_scores_csv(request, task_id):
     if request.method != "POST":
         return redirect("lecturer_assessment_detail", task_id=task.id)
 
+    if system_is_locked():
+        messages.error(
+            request,
+            "Assessment entry is locked. Please contact administration."
+        )
+        return redirect("lecturer_assessment_detail", task_id=task.id)
+
     file = request.FILES.get("file")
     if not file:
         messages.error(request, "No file uploaded.")
         return redirect("lecturer_assessment_detail", task_id=task.id)
 
-    decoded = file.read().decode("utf-8").splitlines()
-    reader = csv.DictReader(decoded)
+    try:
+        result = import_task_scores_csv(
+            task=task,
+            upload=file,
+            recorded_by=user,
+        )
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect("lecturer_assessment_detail", task_id=task.id)
 
-    score_map = {
-        s.student_id: s
-        for s in AssessmentTaskScore.objects.filter(task=task)
-    }
+    store_error_report(task, user, result)
 
-    errors = []
+    if result.errors:
+        messages.warning(
+            request,
+            f"{len(result.errors)} of {result.rows} rows failed validation "
+            f"({result.updated} scores updated). Download the error report for details."
+        )
+    else:
+        messages.success(
+            request,
+            f"Scores uploaded successfully ({result.updated} scores updated)."
+        )
 
-    for row in reader:
-        try:
-            student_id = int(row["student_id"])
-            raw_score = row["marks_obtained"].strip()
+    return redirect("lecturer_assessment_detail", task_id=task.id)
 
-            if raw_score == "":
-                continue
 
-            score = float(raw_score)
+@login_required
+def download_task_scores_errors(request, task_id):
+    user = request.user
 
-            if score < 0 or score > float(task.total_marks):
-                raise ValueError("Score out of range")
+    task = get_object_or_404(
+        AssessmentTask,
+        id=task_id,
+        created_by=user
+    )
 
-            score_obj = score_map.get(student_id)
-            if not score_obj:
-                raise ValueError("Student not part of task")
+    report = get_error_report(task, user)
+    if report is None:
+        messages.info(request, "No error report is available for this task.")
+        return redirect("lecturer_assessment_detail", task_id=task.id)
 
-            score_obj.marks_obtained = score
-            score_obj.recorded_by = user
-            score_obj.save()
+    response = HttpResponse(report, content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{task.title}_errors.csv"'
+    return response
 
-        except Exception as e:
-            errors.append(str(e))
 
-    if errors:
-        messages.warning(request, "Some rows failed validation.")
-    else:
-        messages.success(request, "Scores uploaded successfully.")
+@login_required
+def lecturer_gradebook(request, course_id, semester_id):
+    """
+    GET:  students x tasks matrix of a course/semester (columnar JSON)
+    POST: {"edits": [{"student": id, "task": id, "marks": value}, ...]}
+          applied in one request; returns the refreshed matrix
+    """
+    user = request.user
 
-    return redirect("lecturer_assessment_detail", task_id=task.id)
+    if getattr(user, "role", None) != "lecturer":
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    course = get_object_or_404(ProgramCourse, id=course_id, assigned_lecturers=user)
+    semester = get_object_or_404(Semester, id=semester_id)
+
+    if request.method == "POST":
+        if system_is_locked():
+            return JsonResponse(
+                {"error": "Assessment entry is locked. Please contact administration."},
+                status=423,
+            )
+
+        try:
+            edits = json.loads(request.body.decode("utf-8")).get("edits")
+        except (ValueError, AttributeError):
+            edits = None
+
+        if not isinstance(edits, list):
+            return JsonResponse({"error": "Expected a JSON body with an 'edits' list"}, status=400)
+
+        updated, errors = apply_gradebook_edits(
+            course=course,
+            semester=semester,
+            edits=edits,
+            recorded_by=user,
+        )
+
+        if errors:
+            return JsonResponse({"success": False, "errors": errors}, status=400)
+
+        return JsonResponse({
+            "success": True,
+            "updated": updated,
+            "gradebook": build_gradebook(course=course, semester=semester, editor=user),
+        })
+
+    return JsonResponse(build_gradebook(course=course, semester=semester, editor=user))
 
 
 # -------------------end lecturer -------------------------------------------------------------------------------------------------------------------
@@ -3707,7 +3897,7 @@ def student_request_transcript(request):
         messages.error(request, "Access denied.")
         return redirect("home")
 
-    settings_obj = TranscriptSettings.objects.first()
+    settings_obj = get_config("transcript_settings")
     if not settings_obj or not settings_obj.allow_requests:
         return registration_error(request, "Transcript request system is locked by admin.")
 
@@ -3753,10 +3943,10 @@ def student_view_transcript(request):
     if user.role != "student":
         return registration_error(request, "Access denied.")
 
-    settings_obj = TranscriptSettings.objects.first()
+    settings_obj = get_config("transcript_settings")
     latest = TranscriptRequest.objects.filter(student=user).order_by("-created_at").first()
 
-    school = School.objects.first()
+    school = get_config("school")
 
     program = user.program
     department = user.department
@@ -3802,8 +3992,9 @@ def student_view_transcript(request):
     if latest.status == "approved":
         context["state"] = "approved"
 
-        # ⭐️ Ignore stored JSON — generate fresh transcript every visit
-        context["transcript"] = generate_transcript_json(user)
+        # ⭐️ Ignore stored JSON — live transcript, rebuilt only when the
+        # student's data changed since the last visit
+        context["transcript"] = get_cached_transcript(user)
 
         return render(request, "users/dashboard/contents/student/student_transcript.html", context)
     
@@ -3817,13 +4008,35 @@ def student_view_transcript(request):
     return render(request, "users/dashboard/contents/student/student_transcript.html", context)
 
 
+@login_required
+def student_transcript_pdf(request):
+    user = request.user
+
+    if user.role != "student":
+        return registration_error(request, "Access denied.")
+
+    settings_obj = get_config("transcript_settings")
+    latest = TranscriptRequest.objects.filter(student=user).order_by("-created_at").first()
+
+    # Same gate as the transcript page: unlocked and approved
+    if not settings_obj or not settings_obj.allow_requests or not latest or latest.status != "approved":
+        messages.error(request, "Your transcript is not available for download.")
+        return redirect("student_view_transcript")
+
+    pdf, etag = get_transcript_pdf(user)
+    return bytes_response(
+        request, pdf, etag, "application/pdf",
+        f"transcript_{user.student_id or user.id}.pdf",
+    )
+
+
 @login_required
 def admin_transcript_requests(request):
     if request.user.role != "admin":
         messages.error(request, "Access denied.")
         return redirect("home")
 
-    settings_obj = TranscriptSettings.objects.first()
+    settings_obj = get_config("transcript_settings")
 
     students = (
         User.objects.filter(role="student")
@@ -3848,6 +4061,10 @@ def admin_transcript_requests(request):
             "requests": requests_qs,
             "settings": settings_obj,
             "students": students,
+            "programs": Program.objects.order_by("name"),
+            "levels": ProgramLevel.objects.select_related("program").order_by("program__name", "order"),
+            "academic_years": AcademicYear.objects.order_by("-name"),
+            "cache_stats": transcript_cache_stats(),
         }
     )
 
@@ -3925,7 +4142,8 @@ def admin_generate_transcript(request, req_id):
 
     req = get_object_or_404(TranscriptRequest, id=req_id)
 
-    transcript_json = generate_transcript_json(req.student)
+    # Only the semesters that changed since the last generation are rebuilt
+    transcript_json = regenerate_transcript_json(req.student, req.transcript_json)
 
     req.transcript_json = transcript_json
     req.generated_at = timezone.now()
@@ -3940,6 +4158,20 @@ def admin_generate_transcript(request, req_id):
     messages.success(request, "Transcript generated successfully.")
     return redirect("admin_transcript_requests")
 
+@login_required
+def admin_transcript_pdf(request, req_id):
+    if request.user.role != "admin":
+        messages.error(request, "Access denied.")
+        return redirect("home")
+
+    req = get_object_or_404(TranscriptRequest.objects.select_related("student"), id=req_id)
+
+    pdf, etag = get_transcript_pdf(req.student)
+    return bytes_response(
+        request, pdf, etag, "application/pdf",
+        f"transcript_{req.student.student_id or req.student.id}.pdf",
+    )
+
 @login_required
 def admin_toggle_transcript_lock(request):
     if request.user.role != "admin":
@@ -3974,8 +4206,9 @@ def admin_generate_transcript_for_student(request):
             messages.error(request, "Invalid student selected.")
             return redirect("admin_transcript_requests")
 
-    # Generate transcript JSON
-    transcript_json = generate_transcript_json(student)
+    # Generate transcript JSON (delta update of an existing one)
+    existing = TranscriptRequest.objects.filter(student=student).order_by("-created_at").first()
+    transcript_json = regenerate_transcript_json(student, existing.transcript_json if existing else None)
 
     # Create or update the request
     req, _ = TranscriptRequest.objects.update_or_create(
@@ -4000,6 +4233,55 @@ def admin_generate_transcript_for_student(request):
         }
     )
 
+@login_required
+def admin_generate_cohort_transcripts(request):
+    if request.user.role != "admin":
+        messages.error(request, "Access denied.")
+        return redirect("home")
+
+    if request.method != "POST":
+        return redirect("admin_transcript_requests")
+
+    program_id = request.POST.get("program", "").strip()
+    level_id = request.POST.get("level", "").strip()
+    academic_year_id = request.POST.get("academic_year", "").strip()
+
+    if not all(value.isdigit() for value in (program_id, level_id, academic_year_id) if value):
+        messages.error(request, "Invalid program, level or academic year.")
+        return redirect("admin_transcript_requests")
+
+    program = Program.objects.filter(id=program_id).first() if program_id else None
+    level = ProgramLevel.objects.filter(id=level_id).first() if level_id else None
+    academic_year = AcademicYear.objects.filter(id=academic_year_id).first() if academic_year_id else None
+
+    if not (program or level or academic_year):
+        messages.error(request, "Select a program, level or academic year.")
+        return redirect("admin_transcript_requests")
+
+    # Inline: a web worker must not fork (threads, open connections).
+    # Parallel generation is for the generate_cohort_transcripts command.
+    result = generate_cohort_transcripts(
+        program=program,
+        level=level,
+        academic_year=academic_year,
+        create_missing=request.POST.get("create_missing") == "on",
+        workers=1,
+    )
+
+    cohort = ", ".join(str(part) for part in (program, level, academic_year) if part)
+    log_event(
+        request.user,
+        "transcript",
+        f"Generated transcripts for cohort {cohort} ({result['students']} students)"
+    )
+
+    messages.success(
+        request,
+        f"Generated {result['students']} transcript(s) "
+        f"({result['updated']} updated, {result['created']} new)."
+    )
+    return redirect("admin_transcript_requests")
+
 @login_required
 def admin_delete_transcript_request(request, req_id):
     if request.user.role != "admin":